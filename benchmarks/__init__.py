@@ -0,0 +1 @@
+"""Benchmark suite for sphinx-rustdoc-postprocess; run with ``python -m benchmarks``."""
@@ -0,0 +1,7 @@
+"""Entry point of ``python -m benchmarks``, see :mod:`benchmarks.suite`."""
+
+import sys
+
+from .suite import main
+
+sys.exit(main())
@@ -0,0 +1,151 @@
+"""Generate synthetic sphinxcontrib-rust output trees for benchmarking.
+
+The generated files mimic what sphinxcontrib-rust writes for a crate: one
+``.rst`` file per module, each holding ``.. rust:*::`` directives whose
+bodies are rustdoc markdown with headings, inline code, intra-doc and
+external links, fenced examples and pipe tables.  Output is fully determined
+by the seed.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+_WORDS = (
+    "the value of a buffer returns an error if input is empty and the caller "
+    "must hold the lock before reading each element from this slice iterator"
+).split()
+
+_KINDS = ("struct", "enum", "trait", "function", "type", "constant")
+
+
+@dataclass
+class TreeSpec:
+    """Shape of a generated tree.
+
+    Attributes
+    ----------
+    files : int
+        Number of module files.
+    items : int
+        Directives (structs, functions, ...) per file.
+    tables : int
+        Pipe tables per file.
+    fences : int
+        Fenced code blocks per file.
+    links : int
+        Intra-doc and external links per item.
+    headings : int
+        ATX headings per item.
+    plain : float
+        Fraction of files holding no markdown at all.
+    root_items : int
+        Directives in one extra crate-root page, ``bench/lib.rst``, standing
+        in for the multi-megabyte pages large crates produce (0 = none).
+    seed : int
+        Seed of the random generator.
+    """
+
+    files: int = 200
+    items: int = 12
+    tables: int = 2
+    fences: int = 3
+    links: int = 3
+    headings: int = 1
+    plain: float = 0.3
+    root_items: int = 2000
+    seed: int = 0
+
+
+def _sentence(rnd: random.Random, words: int = 12) -> str:
+    return " ".join(rnd.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _prose(rnd: random.Random, spec: TreeSpec, markdown: bool) -> list[str]:
+    lines = []
+    for _ in range(rnd.randint(1, 3)):
+        parts = [_sentence(rnd)]
+        if markdown:
+            for _ in range(spec.links):
+                name = rnd.choice(("Buffer", "Error", "Iter", "Lock", "Slice"))
+                parts.append(
+                    rnd.choice(
+                        (
+                            f"See [`{name}`] for details.",
+                            f"Returns `Option<{name}>` when set.",
+                            f"Read [the guide](https://example.com/{name.lower()}).",
+                        )
+                    )
+                )
+        lines.append("   " + " ".join(parts))
+        lines.append("")
+    return lines
+
+
+def _table(rnd: random.Random, rows: int) -> list[str]:
+    lines = ["   | Name | Type | Description |", "   |------|------|-------------|"]
+    for _ in range(rows):
+        name = rnd.choice(_WORDS)
+        lines.append(
+            f"   | `{name}` | `u{rnd.choice((8, 16, 32, 64))}` | {_sentence(rnd, 6)} |"
+        )
+    return [*lines, ""]
+
+
+def _fence(rnd: random.Random) -> list[str]:
+    body = [f"   let {rnd.choice(_WORDS)} = {rnd.randint(0, 99)};" for _ in range(4)]
+    return ["   ```rust", *body, "   ```", ""]
+
+
+def render_file(rnd: random.Random, spec: TreeSpec, module: str) -> str:
+    """Return the content of one generated module file."""
+    markdown = rnd.random() >= spec.plain
+    lines = [f".. rust:module:: {module}", "   :index: 0", ""]
+    lines += _prose(rnd, spec, markdown)
+    tables = spec.tables if markdown else 0
+    fences = spec.fences if markdown else 0
+    for index in range(spec.items):
+        kind = rnd.choice(_KINDS)
+        lines += [f".. rust:{kind}:: {module}::Item{index}", "   :index: 1", ""]
+        if markdown:
+            for _ in range(spec.headings):
+                lines += [f"   ## {_sentence(rnd, 3)}", ""]
+        lines += _prose(rnd, spec, markdown)
+        if tables and rnd.random() < spec.tables / spec.items:
+            lines += _table(rnd, rnd.randint(2, 8))
+            tables -= 1
+        if fences and rnd.random() < spec.fences / spec.items:
+            lines += _fence(rnd)
+            fences -= 1
+    return "\n".join(lines) + "\n"
+
+
+def generate_tree(root: Path, spec: TreeSpec) -> list[Path]:
+    """Write a tree described by *spec* under *root*.
+
+    Returns the paths of the generated files.
+    """
+    rnd = random.Random(spec.seed)
+    paths = []
+    for index in range(spec.files):
+        module = f"bench::m{index // 20}::sub{index}"
+        path = root / "bench" / f"m{index // 20}" / f"sub{index}.rst"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(render_file(rnd, spec, module), encoding="utf-8")
+        paths.append(path)
+    if spec.root_items:
+        scale = spec.root_items / spec.items
+        page = replace(
+            spec,
+            items=spec.root_items,
+            tables=round(spec.tables * scale),
+            fences=round(spec.fences * scale),
+            plain=0,
+        )
+        path = root / "bench" / "lib.rst"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(render_file(rnd, page, "bench"), encoding="utf-8")
+        paths.append(path)
+    return paths
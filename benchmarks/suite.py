@@ -0,0 +1,290 @@
+"""Throughput benchmarks for sphinx-rustdoc-postprocess.
+
+Generates a synthetic sphinxcontrib-rust tree (see :mod:`benchmarks.generate`)
+and measures each ``_convert_*`` pass, the fused engine and the whole
+``postprocess_rst_files`` pipeline in MB/s and files/s, with the native table
+engine, with every file streamed and, when pandoc is on ``PATH``, with
+pandoc.  Each pipeline variant runs in a fresh process whose peak RSS is
+reported too.
+
+Usage::
+
+    python -m benchmarks                 # run and print the results
+    python -m benchmarks --save          # also store them as the baseline
+    python -m benchmarks --check         # fail if slower than the baseline
+
+Baselines are only meaningful on the machine that produced them.  The
+committed ``benchmarks/baseline.json`` is recorded without pandoc and checked
+in CI with a wide margin, so only large regressions fail the job; re-record it
+with ``--save`` when a change is expected to move the numbers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields
+from pathlib import Path
+from types import SimpleNamespace
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import _cache
+from sphinx_rustdoc_postprocess._tables import render_table
+
+from .generate import TreeSpec, generate_tree
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+# Metrics where a larger value is the regression.
+_LOWER_IS_BETTER = frozenset({"peak_rss_mb"})
+
+
+def _app(srcdir: Path, **config: object) -> SimpleNamespace:
+    """Return a stand-in Sphinx app with the extension's default config."""
+    defaults: dict[str, object] = {}
+
+    class _Registry:
+        def add_config_value(self, name, default, rebuild, types=()):
+            defaults[name] = default
+
+        def connect(self, *args, **kwargs):
+            pass
+
+    mod.setup(_Registry())
+    defaults.update(
+        rustdoc_postprocess_rst_dir=".",
+        rustdoc_postprocess_jobs=1,
+        rustdoc_postprocess_incremental=False,
+        rustdoc_postprocess_cache_size=0,
+    )
+    defaults.update(config)
+    return SimpleNamespace(
+        srcdir=str(srcdir),
+        doctreedir=str(srcdir.parent / "doctrees"),
+        config=SimpleNamespace(**defaults),
+    )
+
+
+def _best(run: Callable[[], None], repeat: int) -> float:
+    """Return the fastest of *repeat* timings of *run*."""
+    times = []
+    for _ in range(repeat):
+        _cache._MEMO.clear()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _rates(seconds: float, size: int, files: int) -> dict[str, float]:
+    return {"mb_per_s": size / seconds / 1e6, "files_per_s": files / seconds}
+
+
+def _peak_rss_mb() -> float | None:
+    """Return the peak resident set size of this process in MiB."""
+    # On Linux ru_maxrss survives exec, so a freshly spawned process would
+    # report its parent's peak; VmHWM belongs to the current image only.
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak / (1 << 20 if sys.platform == "darwin" else 1 << 10)
+
+
+def bench_converters(texts: list[str], repeat: int) -> dict[str, dict[str, float]]:
+    """Time each conversion pass, and the fused engine, over *texts*."""
+
+    def _tables(content: str) -> str:
+        return mod._convert_tables(
+            content, render=lambda md: render_table(md, strict=False) or md
+        )
+
+    passes = {
+        "fences": mod._convert_fences,
+        "links": mod._convert_links,
+        "tables[native]": _tables,
+        "headings": mod._convert_headings,
+        "inline_code": mod._convert_inline_code,
+        "fused[native]": lambda content: mod._convert_fused(
+            content, render=lambda md: render_table(md, strict=False) or md
+        ),
+    }
+    size = sum(len(text.encode("utf-8")) for text in texts)
+    results = {}
+    for name, convert in passes.items():
+        seconds = _best(lambda: [convert(text) for text in texts], repeat)
+        results[name] = _rates(seconds, size, len(texts))
+    return results
+
+
+def bench_pipeline(
+    pristine: Path, work: Path, repeat: int, **config: object
+) -> dict[str, float]:
+    """Time ``postprocess_rst_files`` on fresh copies of *pristine*.
+
+    Also reports the peak RSS of the calling process, so run it in a process
+    of its own to measure one configuration.
+    """
+    files = sorted(pristine.rglob("*.rst"))
+    size = sum(path.stat().st_size for path in files)
+    times = []
+    for _ in range(repeat):
+        shutil.rmtree(work, ignore_errors=True)
+        shutil.copytree(pristine, work)
+        app = _app(work, **config)
+        _cache._MEMO.clear()
+        start = time.perf_counter()
+        mod.postprocess_rst_files(app)
+        times.append(time.perf_counter() - start)
+    results = _rates(min(times), size, len(files))
+    peak = _peak_rss_mb()
+    if peak is not None:
+        results["peak_rss_mb"] = peak
+    return results
+
+
+def run(spec: TreeSpec, repeat: int, pandoc: bool) -> dict[str, dict[str, float]]:
+    """Run every benchmark on a tree generated from *spec*."""
+    with tempfile.TemporaryDirectory() as tmp:
+        pristine = Path(tmp) / "pristine"
+        paths = generate_tree(pristine, spec)
+        texts = [path.read_text(encoding="utf-8") for path in paths]
+        results = bench_converters(texts, repeat)
+        work = Path(tmp) / "src"
+        variants = {
+            "pipeline[native]": {
+                "rustdoc_postprocess_table_engine": "native",
+                "rustdoc_postprocess_stream_size": 0,
+            },
+            "pipeline[native,stream]": {
+                "rustdoc_postprocess_table_engine": "native",
+                "rustdoc_postprocess_stream_size": 1,
+            },
+        }
+        jobs = os.cpu_count() or 1
+        if jobs > 1:
+            variants[f"pipeline[native,jobs={jobs}]"] = {
+                "rustdoc_postprocess_table_engine": "native",
+                "rustdoc_postprocess_jobs": jobs,
+            }
+        if pandoc and shutil.which("pandoc"):
+            variants["pipeline[pandoc]"] = {
+                "rustdoc_postprocess_table_engine": "pandoc"
+            }
+        context = multiprocessing.get_context("spawn")
+        for name, config in variants.items():
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                future = pool.submit(bench_pipeline, pristine, work, repeat, **config)
+                results[name] = future.result()
+    return results
+
+
+def regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    margin: float,
+) -> list[str]:
+    """List the metrics more than *margin* (a fraction) worse than the baseline."""
+    found = []
+    for name, metrics in baseline.items():
+        for metric, expected in metrics.items():
+            actual = results.get(name, {}).get(metric)
+            if actual is None:
+                continue
+            if metric in _LOWER_IS_BETTER:
+                if actual > expected * (1 + margin):
+                    found.append(
+                        f"{name} {metric}: {actual:.2f} > {expected:.2f} "
+                        f"(+{100 * (actual / expected - 1):.0f}%)"
+                    )
+            elif actual < expected * (1 - margin):
+                found.append(
+                    f"{name} {metric}: {actual:.2f} < {expected:.2f} "
+                    f"(-{100 * (1 - actual / expected):.0f}%)"
+                )
+    return found
+
+
+def _print(results: dict[str, dict[str, float]]) -> None:
+    width = max(len(name) for name in results)
+    print(f"{'benchmark':<{width}}  {'MB/s':>9}  {'files/s':>9}  {'peak RSS':>9}")
+    for name, metrics in results.items():
+        rss = metrics.get("peak_rss_mb")
+        print(
+            f"{name:<{width}}  {metrics['mb_per_s']:>9.2f}  "
+            f"{metrics['files_per_s']:>9.1f}  "
+            + (f"{rss:>6.1f} MB" if rss is not None else f"{'-':>9}")
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    for field in fields(TreeSpec):
+        parser.add_argument(
+            f"--{field.name}", type=type(field.default), default=field.default
+        )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-pandoc", dest="pandoc", action="store_false")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="store as baseline")
+    parser.add_argument(
+        "--check", action="store_true", help="fail on regressions against baseline"
+    )
+    parser.add_argument(
+        "--margin",
+        type=float,
+        default=0.25,
+        help="tolerated slowdown as a fraction (default: 0.25)",
+    )
+    args = parser.parse_args(argv)
+    spec = TreeSpec(
+        **{field.name: getattr(args, field.name) for field in fields(TreeSpec)}
+    )
+
+    if args.check:
+        try:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            print(
+                f"no baseline at {args.baseline}; record one with --save",
+                file=sys.stderr,
+            )
+            return 2
+        if baseline["spec"] != asdict(spec):
+            print(
+                f"{args.baseline} was recorded with another tree spec", file=sys.stderr
+            )
+            return 2
+
+    results = run(spec, args.repeat, args.pandoc)
+    _print(results)
+    status = 0
+    if args.check:
+        found = regressions(results, baseline["results"], args.margin)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        status = 1 if found else 0
+    if args.save:
+        data = {"spec": asdict(spec), "results": results}
+        args.baseline.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
+    return status
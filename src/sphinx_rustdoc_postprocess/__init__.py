@@ -9,21 +9,74 @@ proper RST through ``pandoc -f markdown -t rst``.
 
 from __future__ import annotations
 
+import atexit
+import contextlib
+import functools
+import hashlib
+import itertools
+import json
+import os
 import re
+import shutil
 import subprocess
+import tempfile
 import textwrap
-from pathlib import Path
-
-from sphinx.application import Sphinx
-from sphinx.util import logging
-
+from collections import Counter
+from collections.abc import Callable, Container, Coroutine, Iterable, Iterator
+from pathlib import Path, PurePosixPath
+from time import perf_counter
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, NamedTuple, TextIO, TypeVar
+
+from sphinx_rustdoc_postprocess import (
+    _chunks,
+    _dedup,
+    _docstrings,
+    _prescan,
+    _regions,
+    _registry,
+    _shard,
+)
+from sphinx_rustdoc_postprocess import _logging as logging
+from sphinx_rustdoc_postprocess._breaker import CircuitBreaker
+from sphinx_rustdoc_postprocess._cache import ConversionCache
+from sphinx_rustdoc_postprocess._manifest import Manifest, content_hash, file_hash
+from sphinx_rustdoc_postprocess._prescan import Converters
+from sphinx_rustdoc_postprocess._regions import MARKUP, PROSE, PROTECTED, RegionTracker
+from sphinx_rustdoc_postprocess._registry import Converter
+from sphinx_rustdoc_postprocess._server import PandocServer, PandocServerError
+from sphinx_rustdoc_postprocess._stats import ConverterStats, Stats, utf8_size
+from sphinx_rustdoc_postprocess._symbols import SymbolIndex, declared
+from sphinx_rustdoc_postprocess._tables import render_table
 from sphinx_rustdoc_postprocess._version import (  # noqa: F401
     __version__,
     __version_tuple__,
 )
+from sphinx_rustdoc_postprocess._watch import FileWatcher
+
+# Sphinx, asyncio and the process pools are imported where they are used, so
+# that the command line interface (see _cli) starts quickly.
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from sphinx.application import Sphinx
+
+__all__ = [
+    "Converter",
+    "__version__",
+    "inject_rust_toctree",
+    "postprocess_rst_files",
+    "setup",
+    "stage_generated_files",
+    "start_pandoc_server",
+    "stop_pandoc_server",
+    "write_generated_files",
+]
 
 _log = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 # Matches an indented markdown fenced code block:
 #   <indent>```lang
 #   ...code...
@@ -49,12 +102,28 @@ _HEADING_RE = re.compile(
     re.MULTILINE,
 )
 
+# Single-line forms of the opening line of ``_FENCE_RE`` and of the rows of
+# ``_TABLE_RE``, for the fused engine which walks the content line by line.
+_FENCE_OPEN_RE = re.compile(r"(?P<indent>[ ]+)```(?P<lang>\w*)\s*")
+_TABLE_ROW_RE = re.compile(r"(?P<indent>[ ]+)\|.+\|[ ]*")
+_TABLE_SEPARATOR_RE = re.compile(r"(?P<indent>[ ]+)\|[-| :]+\|[ ]*")
+
+# Plain-int forms of the Converters flags, for the fused engine's hot paths.
+_FENCES, _LINKS, _TABLES, _HEADINGS, _INLINE_CODE = (int(flag) for flag in Converters)
+
 # Matches markdown inline code (`code`) that is NOT already double-backtick RST.
 # Handles the common case where `code`<letter> breaks RST inline markup rules.
-# Excludes <> so RST links (`text <url>`_) are not mangled.
+# RST roles (:rust:struct:`Name <path>`, :func:`f`) and links (`text <url>`_),
+# such as those _convert_links emits, match whole as "markup" and are kept, so
+# no code span starts at their closing backtick.  A backtick right after
+# "name:" is taken to open a role.  _INLINE_CODE_SUB doubles the backticks of
+# code and, the other groups being empty then, writes markup back as it was.
 _INLINE_CODE_RE = re.compile(
-    r"(?<!`)(`)((?!`)(?:[^`\n<>])+)\1(?!`)",
+    r"(?P<open>`)(?:"
+    r"(?P<markup>(?<=[\w.+-]:`)[^`\n]+`|[^`\n<>]*<[^`\n]*>`)"
+    r"|(?<!``)(?P<code>(?!`)[^`\n<>]+)(?P<tick>`)(?!`))",
 )
+_INLINE_CODE_SUB = r"\g<open>\g<tick>\g<markup>\g<code>\g<tick>\g<tick>"
 
 # Matches markdown hyperlinks: [text](url)
 _MD_LINK_RE = re.compile(
@@ -67,6 +136,85 @@ _INTRADOC_LINK_RE = re.compile(
 )
 
 
+_PANDOC_ARGS = ("-f", "markdown-smart", "-t", "rst", "--wrap=none")
+# A pandoc run may take _PANDOC_TIMEOUT seconds plus one second for every
+# _PANDOC_CHARS_PER_SECOND characters of input, up to _BATCH_TIMEOUT.
+_PANDOC_TIMEOUT = 5
+_PANDOC_CHARS_PER_SECOND = 10_000
+# _PANDOC_ARGS as request options of a pandoc server.
+_PANDOC_SERVER_OPTIONS = {"from": "markdown-smart", "to": "rst", "wrap": "none"}
+
+# Upper bounds for a single batched pandoc run (see _pandoc_batch).
+_BATCH_MAX_CHARS = 1 << 20
+_BATCH_MAX_FRAGMENTS = 500
+_BATCH_TIMEOUT = 120
+
+# Characters read, or buffered for writing, at a time by _stream_file.
+_STREAM_BLOCK = 1 << 16
+
+# Config values that change the converted output, and so invalidate the
+# incremental manifest.
+_OUTPUT_CONFIG = (
+    "rustdoc_postprocess_table_engine",
+    "rustdoc_postprocess_converters",
+    "rustdoc_postprocess_resolve_links",
+    "rustdoc_postprocess_dedup",
+)
+
+# The resident pandoc server of the current build, if one is configured.
+_server: PandocServer | None = None
+
+# Consecutive pandoc failures after which pandoc is no longer called.
+_BREAKER_THRESHOLD = 5
+
+# Guards the pandoc calls of the running build, whose app keeps it (see
+# _build_state), and those made outside a build.
+_breaker = CircuitBreaker(_BREAKER_THRESHOLD)
+
+# Counters of the running postprocess_rst_files call, which pandoc calls
+# report their latency to.
+_run_stats: Stats | None = None
+
+# The items intra-doc links of the running conversion resolve to, if
+# rustdoc_postprocess_resolve_links is on (see _load_symbols and
+# _build_state).
+_symbol_index: SymbolIndex | None = None
+
+# The intra-doc links resolved while converting the current file, with their
+# targets, which its manifest entry records (see _recording_links).
+_links: dict[str, str | None] | None = None
+
+# The pandoc conversion caches of the current build, by directory, size and
+# namespace (see _table_cache and _prune_caches).
+_caches: dict[tuple[Path | None, int, str], ConversionCache] = {}
+
+
+def _record_pandoc(start: float) -> None:
+    """Report the latency of a pandoc call started at *start* to ``_run_stats``."""
+    if _run_stats is not None:
+        _run_stats.pandoc.append(perf_counter() - start)
+
+
+def _pandoc_timeout(markdown: str) -> float:
+    """Return the time a pandoc run converting *markdown* may take."""
+    return min(
+        _BATCH_TIMEOUT, _PANDOC_TIMEOUT + len(markdown) / _PANDOC_CHARS_PER_SECOND
+    )
+
+
+def _pandoc_failed(exc: OSError | TimeoutError | subprocess.TimeoutExpired) -> None:
+    """Report a pandoc run that raised *exc* to ``_breaker``.
+
+    A pandoc that cannot be started at all will not start for the next call
+    either, so that opens the breaker straight away.
+    """
+    # TimeoutError is itself an OSError.
+    if isinstance(exc, (TimeoutError, subprocess.TimeoutExpired)):
+        _breaker.failure("timeout")
+    else:
+        _breaker.trip(f"pandoc could not be run: {exc}")
+
+
 def _pandoc(markdown: str) -> str:
     """Convert a markdown fragment to RST via pandoc.
 
@@ -78,24 +226,382 @@ def _pandoc(markdown: str) -> str:
     Returns
     -------
     str
-        The converted RST text, or the original markdown if pandoc fails.
-    """
-    result = subprocess.run(
-        ["pandoc", "-f", "markdown-smart", "-t", "rst", "--wrap=none"],
-        input=markdown,
-        capture_output=True,
-        text=True,
-        timeout=10,
-    )
+        The converted RST text, or the original markdown if pandoc fails or
+        ``_breaker`` is open.
+    """
+    rst = _try_pandoc(markdown)
+    return markdown if rst is None else rst
+
+
+def _try_pandoc(markdown: str) -> str | None:
+    """Like :func:`_pandoc`, but return None if pandoc fails or is not run."""
+    if _server is not None:
+        start = perf_counter()
+        try:
+            return _server.convert(markdown)
+        except PandocServerError as exc:
+            _log.warning("[rustdoc_postprocess] pandoc server failed: %s", exc)
+        finally:
+            _record_pandoc(start)
+    if not _breaker.allow():
+        return None
+    start = perf_counter()
+    try:
+        result = subprocess.run(
+            ["pandoc", *_PANDOC_ARGS],
+            input=markdown,
+            capture_output=True,
+            text=True,
+            timeout=_pandoc_timeout(markdown),
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        _log.warning("[rustdoc_postprocess] pandoc failed: %s", exc)
+        _pandoc_failed(exc)
+        return None
+    finally:
+        _record_pandoc(start)
     if result.returncode != 0:
         _log.warning("[rustdoc_postprocess] pandoc failed: %s", result.stderr)
-        return markdown
+        _breaker.failure(f"exit status {result.returncode}")
+        return None
+    _breaker.success()
     return result.stdout
 
 
+@functools.cache
+def _pandoc_version() -> str:
+    """Return pandoc's version banner, or an empty string if unavailable."""
+    try:
+        result = subprocess.run(
+            ["pandoc", "--version"],
+            capture_output=True,
+            text=True,
+            timeout=_PANDOC_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    return result.stdout.split("\n", 1)[0]
+
+
+def _pandoc_chunk(fragments: list[str]) -> list[str | None] | None:
+    """Convert several fragments in one pandoc run, or return None on failure.
+
+    Fragments :func:`sphinx_rustdoc_postprocess._chunks.split` cannot hand
+    their images back to get None, for converting them alone.
+    """
+    if not _breaker.allow():
+        return None
+    markdown, separator = _chunks.join(fragments)
+    start = perf_counter()
+    try:
+        result = subprocess.run(
+            ["pandoc", *_PANDOC_ARGS],
+            input=markdown,
+            capture_output=True,
+            text=True,
+            timeout=_pandoc_timeout(markdown),
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        _pandoc_failed(exc)
+        return None
+    finally:
+        _record_pandoc(start)
+    if result.returncode != 0:
+        _breaker.failure(f"exit status {result.returncode}")
+        return None
+    _breaker.success()
+    return _chunks.split(result.stdout, separator, len(fragments))
+
+
+def _batch_plan(fragments: list[str]) -> list[list[int]]:
+    """Group fragment indices into bounded chunks for :func:`_pandoc_chunk`."""
+    chunks: list[list[int]] = []
+    chunk: list[int] = []
+    size = 0
+    for i, fragment in enumerate(fragments):
+        if chunk and (
+            size + len(fragment) > _BATCH_MAX_CHARS
+            or len(chunk) >= _BATCH_MAX_FRAGMENTS
+        ):
+            chunks.append(chunk)
+            chunk, size = [], 0
+        chunk.append(i)
+        size += len(fragment)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _pandoc_batch(fragments: list[str], concurrency: int = 1) -> list[str]:
+    """Convert many markdown fragments to RST with as few pandoc runs as possible.
+
+    Fragments are joined with unique separator paragraphs and converted in
+    bounded-size chunks (see :mod:`sphinx_rustdoc_postprocess._chunks`).  A
+    chunk that fails, or whose output cannot be split back cleanly, is
+    retried one fragment at a time, so the results are always identical to
+    converting each fragment alone.  With a pandoc server running, each
+    fragment is converted separately in the server's batch requests instead.
+
+    Parameters
+    ----------
+    fragments : list of str
+        The markdown fragments to convert.
+    concurrency : int, optional
+        Number of pandoc processes to keep running at once.  Above one, the
+        runs are driven by :func:`_pandoc_batch_async`.
+
+    Returns
+    -------
+    list of str
+        The converted RST for each fragment, in input order, or the fragment
+        itself where pandoc failed.
+    """
+    results = _try_pandoc_batch(fragments, concurrency)
+    return [md if rst is None else rst for md, rst in zip(fragments, results)]
+
+
+def _try_pandoc_batch(fragments: list[str], concurrency: int = 1) -> list[str | None]:
+    """Like :func:`_pandoc_batch`, but give None for the fragments pandoc failed on.
+
+    Doc comments are often valid RST already, so unlike tables a failure
+    cannot be told from a conversion that left the text as it was.
+    """
+    if _server is not None:
+        try:
+            return [
+                rst
+                for first in range(0, len(fragments), _BATCH_MAX_FRAGMENTS)
+                for rst in _server_convert_many(
+                    fragments[first : first + _BATCH_MAX_FRAGMENTS]
+                )
+            ]
+        except PandocServerError as exc:
+            _log.warning("[rustdoc_postprocess] pandoc server failed: %s", exc)
+    if concurrency > 1 and fragments:
+        return _run_coroutine(_pandoc_batch_async(fragments, concurrency))
+
+    results: list[str | None] = [None] * len(fragments)
+    for chunk in _batch_plan(fragments):
+        batch = [fragments[i] for i in chunk]
+        converted = _pandoc_chunk(batch) if len(batch) > 1 else None
+        if converted is None:
+            converted = [None] * len(batch)
+        for i, rst in zip(chunk, converted):
+            results[i] = _try_pandoc(fragments[i]) if rst is None else rst
+    return results
+
+
+def _server_convert_many(fragments: list[str]) -> list[str]:
+    """Convert *fragments* in one request to the pandoc server."""
+    start = perf_counter()
+    try:
+        return _server.convert_many(fragments)
+    finally:
+        _record_pandoc(start)
+
+
+async def _run_pandoc_async(markdown: str, timeout: float) -> tuple[int, str, str]:
+    """Run pandoc on *markdown* as an asyncio subprocess.
+
+    Returns the exit status and the decoded output and error streams.  Raises
+    OSError if pandoc cannot be started and TimeoutError if it overruns.
+    """
+    import asyncio
+
+    start = perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        "pandoc",
+        *_PANDOC_ARGS,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(markdown.encode("utf-8")), timeout
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise TimeoutError(f"pandoc timed out after {timeout}s") from None
+    finally:
+        _record_pandoc(start)
+
+    def _text(data: bytes) -> str:
+        # Universal newlines, as subprocess.run(text=True) gives _pandoc.
+        return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+    return process.returncode, _text(stdout), _text(stderr)
+
+
+async def _pandoc_batch_async(
+    fragments: list[str], concurrency: int
+) -> list[str | None]:
+    """Asyncio variant of :func:`_try_pandoc_batch`.
+
+    Every chunk, and every fragment converted alone, is its own pandoc
+    process; at most *concurrency* of them run at any time, each under its own
+    timeout.  Results are stored by fragment index, so they come back in input
+    order whatever order the processes finish in.
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results: list[str | None] = [None] * len(fragments)
+
+    async def _one(i: int) -> None:
+        async with semaphore:
+            if not _breaker.allow():
+                return
+            try:
+                returncode, stdout, stderr = await _run_pandoc_async(
+                    fragments[i], _pandoc_timeout(fragments[i])
+                )
+            except (OSError, TimeoutError) as exc:
+                _pandoc_failed(exc)
+                returncode, stderr = None, str(exc)
+        if returncode != 0:
+            _log.warning("[rustdoc_postprocess] pandoc failed: %s", stderr)
+            if returncode is not None:
+                _breaker.failure(f"exit status {returncode}")
+        else:
+            _breaker.success()
+            results[i] = stdout
+
+    async def _chunk(chunk: list[int]) -> None:
+        markdown, separator = _chunks.join([fragments[i] for i in chunk])
+        converted = None
+        async with semaphore:
+            returncode = None
+            if _breaker.allow():
+                try:
+                    returncode, stdout, _ = await _run_pandoc_async(
+                        markdown, _pandoc_timeout(markdown)
+                    )
+                except (OSError, TimeoutError) as exc:
+                    _pandoc_failed(exc)
+        if returncode == 0:
+            _breaker.success()
+            converted = _chunks.split(stdout, separator, len(chunk))
+        elif returncode is not None:
+            _breaker.failure(f"exit status {returncode}")
+        if converted is None:
+            converted = [None] * len(chunk)
+        for i, rst in zip(chunk, converted):
+            results[i] = rst
+        await asyncio.gather(
+            *(_one(i) for i, rst in zip(chunk, converted) if rst is None)
+        )
+
+    await asyncio.gather(
+        *(
+            _chunk(chunk) if len(chunk) > 1 else _one(chunk[0])
+            for chunk in _batch_plan(fragments)
+        )
+    )
+    return results
+
+
+def _run_coroutine(coroutine: Coroutine[object, object, _T]) -> _T:
+    """Run *coroutine* to completion, even if an event loop is already running."""
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
+
+
+def _is_directive_line(line: str) -> bool:
+    """Return True for directive (``..``) and field (``:``) lines."""
+    stripped = line.lstrip()
+    return stripped.startswith("..") or stripped.startswith(":")
+
+
+def _link_subn(line: str) -> tuple[str, int]:
+    """Apply :func:`_convert_links` to a prose line, counting the links."""
+    if "[" not in line:
+        return line, 0
+    line, links = _MD_LINK_RE.subn(r"`\g<text> <\g<url>>`_", line)
+    line, intradoc = _INTRADOC_LINK_RE.subn(_intradoc_replace, line)
+    return line, links + intradoc
+
+
+def _intradoc_replace(m: re.Match) -> str:
+    """Turn an intra-doc link into a cross-reference, or a literal if unknown."""
+    name = m.group("name")
+    if _symbol_index is not None:
+        target = _symbol_index.resolve(name)
+        if _links is not None:
+            _links[name] = None if target is None else " ".join(target)
+        text = name.rpartition("@")[2]
+        if target is not None and "<" not in text:
+            type_, path = target
+            return f":rust:{type_}:`{text} <{path}>`"
+    return f"``{name}``"
+
+
+def _inline_code_subn(line: str) -> tuple[str, int]:
+    """Apply :func:`_convert_inline_code` to a prose line, counting the spans."""
+    if "`" not in line:
+        return line, 0
+    converted = _INLINE_CODE_RE.sub(_INLINE_CODE_SUB, line)
+    # Each converted span gained two backticks; markup was kept as it is.
+    return converted, (len(converted) - len(line)) // 2
+
+
+def _prose_lines(content: str, convert: Callable[[str], tuple[str, int]]) -> str:
+    """Apply the line converter *convert* to the prose lines of *content*.
+
+    See :mod:`sphinx_rustdoc_postprocess._regions` for what is prose.
+    """
+    tracker = RegionTracker()
+    return "\n".join(
+        convert(line)[0] if tracker.classify(line) == PROSE else line
+        for line in content.split("\n")
+    )
+
+
+def _prose_runs(content: str, convert: Callable[[str], str]) -> str:
+    """Apply *convert* to each run of lines of *content* outside literal bodies."""
+    return "".join(
+        text if protected else convert(text)
+        for protected, text in _regions.runs(content)
+    )
+
+
+def _heading_replace(m: re.Match) -> str:
+    indent = m.group("indent")
+    text = m.group("text").strip()
+    return f"{indent}**{text}**"
+
+
+def _fence_body(lines: Iterable[str], indent: str) -> str:
+    """Re-indent the body lines of a fence opened at *indent*."""
+    body_indent = indent + "   "
+    out = []
+    for line in lines:
+        stripped = line.rstrip()
+        if stripped:
+            if stripped.startswith(indent):
+                stripped = stripped[len(indent) :]
+            out.append(body_indent + stripped)
+        else:
+            out.append("")
+    while out and not out[-1].strip():
+        out.pop()
+    return "\n".join(out)
+
+
 def _convert_fences(content: str) -> str:
     """Convert markdown code fences to RST code-block directives.
 
+    Fences inside a literal body (see :mod:`sphinx_rustdoc_postprocess._regions`)
+    are left alone, as are fences running into one.
+
     Parameters
     ----------
     content : str
@@ -110,34 +616,45 @@ def _convert_fences(content: str) -> str:
     def _replace(m: re.Match) -> str:
         indent = m.group("indent")
         lang = m.group("lang") or "none"
-        body = m.group("body")
-
-        body_indent = indent + "   "
-        lines = []
-        for line in body.split("\n"):
-            stripped = line.rstrip()
-            if stripped:
-                if stripped.startswith(indent):
-                    stripped = stripped[len(indent) :]
-                lines.append(body_indent + stripped)
-            else:
-                lines.append("")
-        while lines and not lines[-1].strip():
-            lines.pop()
-
-        body_text = "\n".join(lines)
+        body_text = _fence_body(m.group("body").split("\n"), indent)
         return f"{indent}.. code-block:: {lang}\n\n{body_text}\n"
 
-    return _FENCE_RE.sub(_replace, content)
+    return _prose_runs(content, lambda text: _FENCE_RE.sub(_replace, text))
+
+
+def _collect_tables(content: str) -> list[str]:
+    """Return the dedented markdown of every table ``_convert_tables`` would convert.
 
+    Parameters
+    ----------
+    content : str
+        RST file content potentially containing indented markdown tables.
 
-def _convert_tables(content: str) -> str:
+    Returns
+    -------
+    list of str
+        The dedented markdown of each table, in match order.
+    """
+    return [
+        textwrap.dedent(m.group(0))
+        for protected, text in _regions.runs(content)
+        if not protected
+        for m in _TABLE_RE.finditer(text)
+    ]
+
+
+def _convert_tables(content: str, render: Callable[[str], str] | None = None) -> str:
     """Convert markdown tables to RST tables via pandoc.
 
+    Tables inside literal bodies are left alone.
+
     Parameters
     ----------
     content : str
         RST file content potentially containing indented markdown tables.
+    render : callable, optional
+        Converts a dedented markdown table to RST.  Defaults to one
+        :func:`_pandoc` call per table.
 
     Returns
     -------
@@ -148,16 +665,19 @@ def _convert_tables(content: str) -> str:
     def _replace(m: re.Match) -> str:
         indent = m.group("indent")
         table_md = textwrap.dedent(m.group(0))
-        rst = _pandoc(table_md).rstrip("\n")
+        rst = (render or _pandoc)(table_md).rstrip("\n")
         lines = [indent + line if line.strip() else "" for line in rst.split("\n")]
         return "\n".join(lines) + "\n"
 
-    return _TABLE_RE.sub(_replace, content)
+    return _prose_runs(content, lambda text: _TABLE_RE.sub(_replace, text))
 
 
 def _convert_links(content: str) -> str:
     """Convert markdown links to RST.
 
+    Only prose lines are converted, not directive and field lines or the
+    lines of literal bodies.
+
     Parameters
     ----------
     content : str
@@ -167,23 +687,20 @@ def _convert_links(content: str) -> str:
     -------
     str
         Content with ``[text](url)`` converted to ```text <url>`_`` and
-        rustdoc intra-doc links ``[`name`]`` converted to ````name````.
+        rustdoc intra-doc links ``[`name`]`` converted to a sphinxcontrib-rust
+        cross-reference such as ``:rust:struct:`name <crate::name>```` when
+        the running conversion's symbol index knows the item, and to
+        ````name```` otherwise.
     """
 
-    def _process_line(line: str) -> str:
-        stripped = line.lstrip()
-        if stripped.startswith("..") or stripped.startswith(":"):
-            return line
-        line = _MD_LINK_RE.sub(r"`\g<text> <\g<url>>`_", line)
-        line = _INTRADOC_LINK_RE.sub(r"``\g<name>``", line)
-        return line
-
-    return "\n".join(_process_line(line) for line in content.split("\n"))
+    return _prose_lines(content, _link_subn)
 
 
 def _convert_inline_code(content: str) -> str:
     """Convert markdown inline code to RST double-backtick literals.
 
+    Like :func:`_convert_links`, only prose lines are converted.
+
     Parameters
     ----------
     content : str
@@ -195,20 +712,15 @@ def _convert_inline_code(content: str) -> str:
         Content with single-backtick code converted to double-backtick literals.
     """
 
-    def _process_line(line: str) -> str:
-        stripped = line.lstrip()
-        if stripped.startswith("..") or stripped.startswith(":"):
-            return line
-        return _INLINE_CODE_RE.sub(r"``\2``", line)
-
-    return "\n".join(_process_line(line) for line in content.split("\n"))
+    return _prose_lines(content, _inline_code_subn)
 
 
 def _convert_headings(content: str) -> str:
     """Convert markdown ATX headings to bold labels.
 
     RST section headings cannot appear inside directive bodies, so we
-    convert ``## Heading`` to ``**Heading**`` which renders as bold.
+    convert ``## Heading`` to ``**Heading**`` which renders as bold.  The
+    ``# comment`` lines of literal bodies are left alone.
 
     Parameters
     ----------
@@ -221,12 +733,1302 @@ def _convert_headings(content: str) -> str:
         Content with headings replaced by bold text.
     """
 
-    def _replace(m: re.Match) -> str:
-        indent = m.group("indent")
-        text = m.group("text").strip()
-        return f"{indent}**{text}**"
+    return _prose_runs(content, lambda text: _HEADING_RE.sub(_heading_replace, text))
+
+
+def _link_target(name: str) -> str | None:
+    """Return the target of an intra-doc link to *name*, as manifests record it."""
+    if _symbol_index is None:
+        return None
+    target = _symbol_index.resolve(name)
+    return None if target is None else " ".join(target)
+
+
+@contextlib.contextmanager
+def _build_state(app: Sphinx) -> Iterator[None]:
+    """Make the state *app* keeps for its build current within the block.
+
+    That is the pandoc circuit breaker :func:`_reset_breaker` gave the build,
+    made here for apps that never emit ``builder-inited`` such as the command
+    line's, and in ``"source-read"`` mode the symbol index built by
+    :func:`_index_sources`.  The module globals hold them only while the
+    build converts, so builds in one process never see each other's.
+    """
+    global _breaker, _symbol_index
+    outer = _breaker, _symbol_index
+    breaker = getattr(app, "rustdoc_postprocess_breaker", None)
+    if breaker is None:
+        breaker = app.rustdoc_postprocess_breaker = CircuitBreaker(_BREAKER_THRESHOLD)
+    _breaker = breaker
+    _symbol_index = getattr(app, "rustdoc_postprocess_symbols", None)
+    try:
+        yield
+    finally:
+        _breaker, _symbol_index = outer
+
+
+@contextlib.contextmanager
+def _recording_links() -> Iterator[dict[str, str | None]]:
+    """Yield the intra-doc links resolved within the block, with their targets."""
+    global _links
+    outer = _links
+    links = _links = {}
+    try:
+        yield links
+    finally:
+        _links = outer
+
+
+@contextlib.contextmanager
+def _resolving(resolve: bool) -> Iterator[None]:
+    """Resolve intra-doc links within the block only if *resolve* is true.
+
+    The crates of a workspace can set ``rustdoc_postprocess_resolve_links``
+    each, so the symbol index, loaded if any of them resolves links, is
+    hidden while converting the others.
+    """
+    global _symbol_index
+    index = _symbol_index
+    if not resolve:
+        _symbol_index = None
+    try:
+        yield
+    finally:
+        _symbol_index = index
+
+
+def _intradoc_subn(line: str) -> tuple[str, int]:
+    """Resolve the intra-doc links pandoc leaves in a line as ``[``name``]``."""
+    if "[" not in line:
+        return line, 0
+    return _INTRADOC_LINK_RE.subn(_intradoc_replace, line)
+
+
+def _render_fallback(table_md: str) -> str:
+    """Render a table with the native renderer, as far as it understands it."""
+    return render_table(table_md, strict=False) or table_md
+
+
+def _convert_docstrings(
+    content: str, render: Callable[[list[str]], list[str | None]] | None = None
+) -> str:
+    """Convert whole doc comments to RST via pandoc.
+
+    Fences and headings are converted first, as :func:`_convert_fences` and
+    :func:`_convert_headings` do, since RST has no sections inside directive
+    bodies.  Every doc comment left (see
+    :func:`sphinx_rustdoc_postprocess._docstrings.extract`) is then converted
+    by pandoc and re-indented in place, with its footnotes auto-numbered and
+    its intra-doc links resolved like :func:`_convert_links` does.  A doc
+    comment pandoc fails on goes through :func:`_convert_links`,
+    :func:`_convert_tables` (with the native renderer) and
+    :func:`_convert_inline_code` instead.
+
+    Parameters
+    ----------
+    content : str
+        RST file content.
+    render : callable, optional
+        Converts a list of dedented markdown doc comments to RST, giving None
+        for those it fails on.  Defaults to :func:`_try_pandoc_batch`, which
+        converts them in as few pandoc runs as possible.
+
+    Returns
+    -------
+    str
+        The converted content.
+    """
+    content = _convert_headings(_convert_fences(content))
+    docstrings = _docstrings.extract(content)
+    if not docstrings:
+        return content
+    results = (render or _try_pandoc_batch)([doc.markdown for doc in docstrings])
+    texts = []
+    for doc, rst in zip(docstrings, results):
+        if rst is None:
+            # The converters need the newline that ends a table.
+            text = _docstrings.indent(doc.markdown, doc.indent) + "\n"
+            text = _convert_tables(_convert_links(text), _render_fallback)
+            text = _convert_inline_code(text)[:-1]
+        else:
+            rst = _docstrings.number_notes(rst)
+            text = _prose_lines(_docstrings.indent(rst, doc.indent), _intradoc_subn)
+        texts.append(text)
+    return _docstrings.splice(content, docstrings, texts)
+
+
+class _Table(NamedTuple):
+    """A markdown table found by :meth:`_FusedConverter.scan`, awaiting rendering."""
+
+    indent: str
+    markdown: str
+
+
+class _Staging(NamedTuple):
+    """Where :func:`stage_generated_files` redirected sphinxcontrib-rust."""
+
+    root: Path
+    doc_dir: str | dict[str, str]
+    # (staging directory, rust_doc_dir it stands in for) pairs.
+    targets: list[tuple[Path, Path]]
+
+
+class _Crate(NamedTuple):
+    """A directory of ``rustdoc_postprocess_rst_dir`` (see :func:`_crates`)."""
+
+    # The directory as configured, relative to srcdir.
+    name: str
+    rst_dir: Path
+    # The app, or a stand-in whose config has the crate's own settings.
+    app: Sphinx
+
+
+class _CrateScan(NamedTuple):
+    """What :func:`_prescan_crate` found in a crate."""
+
+    crate: _Crate
+    # Every file of the crate's shard, and those that may need converting.
+    found: list[Path]
+    rst_files: list[Path]
+    # Manifest names of the files of other shards, whose items stay indexed.
+    others: list[str]
+    # Size in bytes of rst_files.
+    size: int
+
+
+class _Watch:
+    """What the command line's ``--watch`` keeps between the runs of a process.
+
+    Parameters
+    ----------
+    *roots : Path
+        The directories to watch.
+
+    Attributes
+    ----------
+    watcher : FileWatcher
+        Knows every file as the previous build left it.
+    pool : Executor or None
+        The worker pool, kept for the next build.
+    symbols : SymbolIndex or None
+        The symbol index, kept up to date with the files that change.
+    """
+
+    def __init__(self, *roots: Path):
+        self.watcher = FileWatcher(*roots)
+        self.pool: Executor | None = None
+        self.jobs = 0
+        self.symbols: SymbolIndex | None = None
+        self._pool_symbols = ""
+
+    def process_pool(self, jobs: int) -> Executor:
+        """Return the kept pool, first replacing it if it has too few workers.
+
+        It is also replaced when the symbol index changed, as the workers
+        resolve links with the copy they were started with.
+        """
+        symbols = _symbol_index.digest() if _symbol_index is not None else ""
+        if self.pool is None or self.jobs < jobs or self._pool_symbols != symbols:
+            self.close()
+            self.pool = _new_pool(jobs)
+            self.jobs = jobs
+            self._pool_symbols = symbols
+            atexit.register(self.close)
+        return self.pool
+
+    def close(self) -> None:
+        """Shut the pool down."""
+        if self.pool is not None:
+            atexit.unregister(self.close)
+            self.pool.shutdown()
+            self.pool = None
+
+
+class _FusedConverter:
+    """Single-walk equivalent of the five ``_convert_*`` passes.
+
+    :meth:`scan` applies every conversion except table rendering, leaving a
+    :class:`_Table` in place of each markdown table so tables from many files
+    can be rendered together, and :meth:`join` splices the rendered tables in.
+    Together they produce the same text as :func:`_convert_fences`,
+    :func:`_convert_links`, :func:`_convert_tables`, :func:`_convert_headings`
+    and :func:`_convert_inline_code` applied in turn.
+
+    Parameters
+    ----------
+    needs : Converters, optional
+        The converters to run, normally :func:`_prescan.needed` of the file.
+        Leaving out one that could match changes the result.
+    stats : Stats, optional
+        Receives the per-converter counters; a private one by default.
+
+    Attributes
+    ----------
+    touched : Converters
+        The converters that changed something so far.
+    stats : Stats
+        The counters this converter adds to.
+    """
+
+    def __init__(self, needs: Converters = _prescan.ALL, stats: Stats | None = None):
+        self.needs = needs
+        self.stats = stats if stats is not None else Stats()
+        # Flag arithmetic is slow, so the hot paths work on plain values.
+        self._fences = bool(needs & Converters.FENCES)
+        self._links = bool(needs & Converters.LINKS)
+        self._tables = bool(needs & Converters.TABLES)
+        self._headings = bool(needs & Converters.HEADINGS)
+        self._inline_code = bool(needs & Converters.INLINE_CODE)
+        self._touched = 0
+        counters = self.stats.converters
+        self._fence_stats = counters["fences"]
+        self._link_stats = counters["links"]
+        self._table_stats = counters["tables"]
+        self._heading_stats = counters["headings"]
+        self._inline_code_stats = counters["inline_code"]
+
+    @property
+    def touched(self) -> Converters:
+        return Converters(self._touched)
+
+    def _link(self, line: str) -> str:
+        if self._links and "[" in line:
+            start = perf_counter()
+            converted, matches = _link_subn(line)
+            self._link_stats.seconds += perf_counter() - start
+            if matches:
+                self._link_stats.record(line, converted, matches)
+                self._touched |= _LINKS
+                return converted
+        return line
+
+    def _prose(self, line: str) -> str:
+        if self._headings and "#" in line:
+            start = perf_counter()
+            converted, matches = _HEADING_RE.subn(_heading_replace, line)
+            self._heading_stats.seconds += perf_counter() - start
+            if matches:
+                self._heading_stats.record(line, converted, matches)
+                self._touched |= _HEADINGS
+                line = converted
+        if self._inline_code and "`" in line:
+            start = perf_counter()
+            converted, matches = _inline_code_subn(line)
+            self._inline_code_stats.seconds += perf_counter() - start
+            if matches:
+                self._inline_code_stats.record(line, converted, matches)
+                self._touched |= _INLINE_CODE
+                line = converted
+        return line
+
+    def _fenced(self, lines: Iterable[str]) -> Iterator[str]:
+        """Yield *lines* with fences converted.
+
+        Only the lines of a fence whose closing line is still being looked
+        for are held in memory.  Like :func:`_convert_fences`, fences in or
+        running into a literal body are left alone.
+        """
+        fences = self._fences
+        tracker = RegionTracker()
+        source = ((line, tracker.classify(line)) for line in lines)
+        while True:
+            for line, kind in source:
+                m = None
+                if fences and "```" in line and kind != PROTECTED:
+                    m = _FENCE_OPEN_RE.fullmatch(line)
+                if m is None:
+                    yield line
+                    continue
+                start_time = perf_counter()
+                indent = m.group("indent")
+                fence = indent + "```"
+                block = [(line, kind)]
+                closed = False
+                for line, kind in source:
+                    block.append((line, kind))
+                    if kind == PROTECTED:
+                        break
+                    if line.startswith(fence) and not line[len(fence) :].strip(" "):
+                        closed = True
+                        break
+                if not closed:
+                    # Unclosed: the opening line stays as it is and the lines
+                    # after it are walked again.
+                    self._fence_stats.seconds += perf_counter() - start_time
+                    yield block[0][0]
+                    source = itertools.chain(block[1:], source)
+                    break
+                # Like the \s*\n of _FENCE_RE, the body skips leading blank lines.
+                start = 1
+                while not block[start][0].strip():
+                    start += 1
+                head = f"{indent}.. code-block:: {m.group('lang') or 'none'}"
+                body = _fence_body((line for line, _ in block[start:-1]), indent)
+                raw = "\n".join(line for line, _ in block)
+                self._fence_stats.record(raw, f"{head}\n\n{body}\n")
+                self._fence_stats.seconds += perf_counter() - start_time
+                self._touched |= _FENCES
+                yield head
+                yield ""
+                yield from body.split("\n")
+                yield ""
+            else:
+                return
+
+    def _lines(self, lines: Iterable[str]) -> Iterator[tuple[str, int]]:
+        """Yield *lines* with fences and links converted, and their region kind.
+
+        The kind (see :mod:`sphinx_rustdoc_postprocess._regions`) is that of
+        the line once links are converted, as a link may become a
+        cross-reference role that starts a field-like line.
+        """
+        tracker = RegionTracker()
+        for line in self._fenced(lines):
+            kind = tracker.classify(line)
+            if kind == PROSE and "[" in line:
+                converted = self._link(line)
+                if converted is not line and _is_directive_line(converted):
+                    kind = MARKUP
+                line = converted
+            yield line, kind
+
+    def scan(self, content: str) -> list[str | _Table]:
+        """Apply every conversion except table rendering in a single walk.
+
+        Parameters
+        ----------
+        content : str
+            RST file content.
+
+        Returns
+        -------
+        list
+            The converted lines, with a :class:`_Table` in place of the lines
+            of each markdown table.
+        """
+        return list(self.scan_lines(content.split("\n")))
+
+    def scan_lines(self, lines: Iterable[str]) -> Iterator[str | _Table]:
+        """Streaming form of :meth:`scan`.
+
+        Parameters
+        ----------
+        lines : iterable of str
+            The content split on ``"\\n"`` (see :func:`_split_lines`).
+
+        Yields
+        ------
+        str or _Table
+            The items of :meth:`scan`, each as soon as it is settled.
+        """
+        out: list[str | _Table] = []
+        block: list[str] = []  # header, separator and rows of a candidate table
+        indent = ""
+        tables = self._tables
+
+        def _end_block() -> None:
+            if len(block) >= 3:
+                text = "\n".join(block) + "\n"
+                out.append(_Table(indent, textwrap.dedent(text)))
+                self._table_stats.matches += 1
+                self._table_stats.bytes_in += utf8_size(text)
+                self._touched |= _TABLES
+                block.clear()
+                return
+            # Not a table after all; _TABLE_RE would retry from the next line.
+            rest = block[1:]
+            out.append(self._prose(block[0]))
+            block.clear()
+            for line in rest:
+                _feed(line, PROSE, False)
+
+        def _feed(line: str, kind: int, last: bool) -> None:
+            # Every table row, including the last, ends with a newline.  Only
+            # prose lines can be rows, or converted by _prose.
+            nonlocal indent
+            prose = kind == PROSE
+            if block:
+                pattern = _TABLE_SEPARATOR_RE if len(block) == 1 else _TABLE_ROW_RE
+                m = None
+                if prose and not last and "|" in line:
+                    m = pattern.fullmatch(line)
+                if m is not None and m.group("indent") == indent:
+                    block.append(line)
+                    return
+                _end_block()
+                _feed(line, kind, last)
+                return
+            m = None
+            if tables and prose and not last and "|" in line:
+                m = _TABLE_ROW_RE.fullmatch(line)
+            if m is not None:
+                indent = m.group("indent")
+                block.append(line)
+            elif prose and ("#" in line or "`" in line):
+                out.append(self._prose(line))
+            else:
+                out.append(line)
+
+        lines = self._lines(lines)
+        prev = next(lines)
+        for line in lines:
+            _feed(*prev, False)
+            prev = line
+            if out:
+                yield from out
+                out.clear()
+        _feed(*prev, True)
+        yield from out
+
+    def join(self, scanned: list[str | _Table], render: Callable[[str], str]) -> str:
+        """Render the tables of :meth:`scan` output and join it into text.
+
+        Parameters
+        ----------
+        scanned : list
+            The result of :meth:`scan`.
+        render : callable
+            Converts a dedented markdown table to RST.
+
+        Returns
+        -------
+        str
+            The fully converted content.
+        """
+        return "\n".join(self.join_lines(scanned, render))
+
+    def join_lines(
+        self, scanned: Iterable[str | _Table], render: Callable[[str], str]
+    ) -> Iterator[str]:
+        """Streaming form of :meth:`join`, yielding the output lines."""
+        for item in scanned:
+            if isinstance(item, str):
+                yield item
+                continue
+            start = perf_counter()
+            rst = render(item.markdown).rstrip("\n")
+            lines = [
+                item.indent + line if line.strip() else "" for line in rst.split("\n")
+            ]
+            self._table_stats.seconds += perf_counter() - start
+            self._table_stats.bytes_out += utf8_size("\n".join(lines)) + 1
+            for line in lines:
+                yield self._prose(line)
+
+
+def _convert_fused(content: str, render: Callable[[str], str] | None = None) -> str:
+    """Apply all five conversions in one walk over the content.
+
+    Produces the same result as :func:`_convert_fences`, :func:`_convert_links`,
+    :func:`_convert_tables`, :func:`_convert_headings` and
+    :func:`_convert_inline_code` applied in turn, which remain the reference
+    implementation, without building an intermediate copy per pass.
+
+    Parameters
+    ----------
+    content : str
+        RST file content.
+    render : callable, optional
+        Converts a dedented markdown table to RST.  Defaults to one
+        :func:`_pandoc` call per table.
+
+    Returns
+    -------
+    str
+        The converted content.
+    """
+    converter = _FusedConverter()
+    return converter.join(converter.scan(content), render or _pandoc)
+
+
+# The built-in converters, in the order of the reference passes.  Their
+# ``may_match`` predicates test for the marker of the matching pre-scan flag.
+_BUILTIN_CONVERTERS = {
+    converter.name: converter
+    for converter in (
+        Converter("fences", _convert_fences, lambda c: "```" in c, Converters.FENCES),
+        Converter("links", _convert_links, lambda c: "[" in c, Converters.LINKS),
+        Converter("tables", _convert_tables, lambda c: "|" in c, Converters.TABLES),
+        Converter(
+            "headings", _convert_headings, lambda c: "#" in c, Converters.HEADINGS
+        ),
+        Converter(
+            "inline_code",
+            _convert_inline_code,
+            lambda c: "`" in c,
+            Converters.INLINE_CODE,
+        ),
+        # Opt-in, and run on its own (see _convert_sequence): doc comments
+        # are in directive bodies, so always on indented lines.
+        Converter("docstrings", _convert_docstrings, lambda c: "\n " in c),
+    )
+}
+
+# Default of ``rustdoc_postprocess_converters``: every built-in converter
+# but ``docstrings``.
+_DEFAULT_CONVERTERS = tuple(
+    name for name, converter in _BUILTIN_CONVERTERS.items() if converter.flag
+)
+
+
+@functools.cache
+def _resolve_converters(names: tuple[str, ...]) -> tuple[Converter, ...]:
+    """Look up *names* among the built-in and plug-in converters.
+
+    Built-in names take precedence over plug-ins.  Unknown names are reported
+    once and dropped, as are repeated ones.
+    """
+    available = {**_registry.plugins(), **_BUILTIN_CONVERTERS}
+    converters: dict[str, Converter] = {}
+    for name in names:
+        if name not in available:
+            _log.warning("[rustdoc_postprocess] Unknown converter %r", name)
+        elif name not in converters:
+            converters[name] = available[name]
+    return tuple(converters.values())
+
+
+def _converters(app: Sphinx) -> tuple[Converter, ...]:
+    """Return the converters listed in ``rustdoc_postprocess_converters``."""
+    return _resolve_converters(tuple(app.config.rustdoc_postprocess_converters))
+
+
+def _fused_mask(converters: Iterable[Converter]) -> Converters | None:
+    """Return the pre-scan flags of *converters* if the fused engine can run them.
+
+    That is the case when they are all built-in and listed in the default
+    order, leaving some out or not.  Otherwise None is returned, and they have
+    to run one after the other through :func:`_convert_sequence`.
+    """
+    mask, last = Converters(0), 0
+    for converter in converters:
+        if converter.flag is None or converter.flag <= last:
+            return None
+        mask |= converter.flag
+        last = converter.flag
+    return mask
+
+
+def _convert_sequence(
+    app: Sphinx,
+    content: str,
+    converters: Iterable[Converter],
+    stats: Stats | None = None,
+) -> tuple[str, Converters]:
+    """Run *converters* over *content* one after the other.
+
+    Each converter only runs when its ``may_match`` predicate accepts the
+    content as left by the previous ones.  The tables converter renders the
+    tables of this file with :func:`_render_tables`, and the docstrings
+    converter its doc comments with :func:`_render_docstrings`, in at most
+    one pandoc run for the file.  Returns the converted
+    content and the built-in converters that changed it; *stats* counts each
+    converter once for every file it changed.
+    """
+    touched = Converters(0)
+    for converter in converters:
+        if not converter.may_match(content):
+            continue
+        start = perf_counter()
+        if converter.flag is Converters.TABLES:
+            tables = _collect_tables(content)
+            rendered = _render_tables(app, [tables]) if tables else {}
+            converted = _convert_tables(content, rendered.__getitem__)
+        elif converter is _BUILTIN_CONVERTERS["docstrings"]:
+            converted = _convert_docstrings(
+                content, functools.partial(_render_docstrings, app)
+            )
+        else:
+            converted = converter.convert(content)
+        if stats is not None:
+            counters = stats.converters.setdefault(converter.name, ConverterStats())
+            counters.seconds += perf_counter() - start
+            if converted != content:
+                counters.record(content, converted)
+        if converted != content and converter.flag is not None:
+            touched |= converter.flag
+        content = converted
+    return content, touched
+
+
+def _state_dir(app: Sphinx) -> Path:
+    """Return the directory under the doctree dir that holds build state."""
+    return Path(app.doctreedir) / "rustdoc_postprocess"
+
+
+def _manifest_dir(app: Sphinx) -> Path:
+    """Return the directory of the incremental manifest.
+
+    Each crate of a workspace (see :func:`_crates`) has its own.
+    """
+    crate = getattr(app, "crate", None)
+    if crate is None:
+        return _state_dir(app) / "manifest"
+    return _state_dir(app) / "crates" / crate / "manifest"
+
+
+def _crates(app: Sphinx, report: bool = True) -> list[_Crate]:
+    """Return the directories ``rustdoc_postprocess_rst_dir`` names.
+
+    A single directory is converted with *app* itself.  A list of directories,
+    or a mapping of directories to settings, is a workspace: each directory
+    is a crate converted with a stand-in for *app* whose config has the
+    crate's settings, such as ``{"table_engine": "native"}`` for
+    ``rustdoc_postprocess_table_engine``, and which keeps a manifest of its
+    own.  Only the config values in ``_OUTPUT_CONFIG`` can be set per crate;
+    other settings are ignored, and reported if *report* is true.
+    """
+    value = app.config.rustdoc_postprocess_rst_dir
+    srcdir = Path(app.srcdir)
+    if isinstance(value, str):
+        return [_Crate(value, srcdir / value, app)]
+    if not isinstance(value, dict):
+        value = dict.fromkeys(value)
+    base = {name: getattr(app.config, name) for name, *_ in _CONFIG_VALUES}
+    crates = []
+    for name, settings in value.items():
+        config = dict(base)
+        for key, setting in (settings or {}).items():
+            if f"rustdoc_postprocess_{key}" not in _OUTPUT_CONFIG:
+                if report:
+                    _log.warning(
+                        "[rustdoc_postprocess] Ignoring setting %r of crate %s",
+                        key,
+                        name,
+                    )
+                continue
+            config[f"rustdoc_postprocess_{key}"] = setting
+        crate_app = SimpleNamespace(
+            srcdir=app.srcdir,
+            doctreedir=app.doctreedir,
+            parallel=getattr(app, "parallel", 0),
+            crate=Path(name).as_posix().replace("/", "-"),
+            config=SimpleNamespace(**config),
+        )
+        crates.append(_Crate(name, srcdir / name, crate_app))
+    return crates
+
+
+def _table_cache(app: Sphinx) -> ConversionCache:
+    """Return the cache of pandoc conversions described by the app config.
+
+    The cache is built on first use and shared by the rest of the build,
+    until :func:`_prune_caches` ends it.
+
+    Parameters
+    ----------
+    app : Sphinx
+        The Sphinx application instance.
+
+    Returns
+    -------
+    ConversionCache
+        A cache namespaced by the pandoc version and arguments.  The disk
+        tier lives under ``rustdoc_postprocess_cache_dir`` (relative to
+        ``app.srcdir``) or the doctree directory, and is disabled when
+        ``rustdoc_postprocess_cache_size`` is zero.
+    """
+    max_bytes = app.config.rustdoc_postprocess_cache_size
+    directory = None
+    if max_bytes > 0:
+        cache_dir = app.config.rustdoc_postprocess_cache_dir
+        if cache_dir:
+            directory = Path(app.srcdir) / cache_dir
+        else:
+            directory = _state_dir(app) / "pandoc"
+    namespace = "\0".join([_pandoc_version(), *_PANDOC_ARGS])
+    key = (directory, max_bytes, namespace)
+    if key not in _caches:
+        _caches[key] = ConversionCache(directory, max_bytes, namespace)
+    return _caches[key]
+
+
+def _prune_caches(
+    app: Sphinx | None = None, exception: Exception | None = None
+) -> None:
+    """Log the hit rate of the caches of this build, then prune and drop them.
+
+    Called at the end of :func:`postprocess_rst_files` and
+    :func:`write_generated_files`, and as a ``build-finished`` callback for
+    the documents converted by :func:`_on_source_read`, so each disk store is
+    pruned once per build rather than once per file.
+
+    Parameters
+    ----------
+    app : Sphinx, optional
+        The Sphinx application instance.
+    exception : Exception or None
+        The exception that ended the build, as passed by ``build-finished``.
+    """
+    for cache in _caches.values():
+        if cache.lookups:
+            _log.info("[rustdoc_postprocess] Table cache: %s", cache.summary())
+        cache.prune()
+    _caches.clear()
+
+
+def _render_docstrings(app: Sphinx, fragments: list[str]) -> list[str | None]:
+    """Convert the doc comments *fragments* of one file with pandoc.
+
+    Conversions are looked up in, and stored to, the cache built by
+    :func:`_table_cache`; the misses are converted together by
+    :func:`_try_pandoc_batch`, which gives None for those pandoc fails on.
+    """
+    cache = _table_cache(app)
+    results = [cache.get(markdown) for markdown in fragments]
+    pending = list(
+        dict.fromkeys(md for md, rst in zip(fragments, results) if rst is None)
+    )
+    if not pending:
+        return results
+    concurrency = app.config.rustdoc_postprocess_pandoc_concurrency
+    converted = dict(
+        zip(pending, _try_pandoc_batch(pending, concurrency or os.cpu_count() or 1))
+    )
+    for markdown, rst in converted.items():
+        if rst is not None:
+            cache.put(markdown, rst)
+    return [
+        converted[md] if rst is None else rst for md, rst in zip(fragments, results)
+    ]
+
+
+def _load_manifest(app: Sphinx) -> Manifest | None:
+    """Load the incremental manifest, or return None if it is disabled.
+
+    The manifest's fingerprint covers the extension version, the pandoc
+    version and arguments and the config values in ``_OUTPUT_CONFIG``, so
+    changing any of them invalidates every entry.  An entry whose intra-doc
+    links resolve differently with the running symbol index (see
+    :func:`_link_target`) is invalid too.
+    """
+    if not app.config.rustdoc_postprocess_incremental:
+        return None
+    state = {
+        "version": __version__,
+        "pandoc": _pandoc_version(),
+        "args": _PANDOC_ARGS,
+        **{name: getattr(app.config, name) for name in _OUTPUT_CONFIG},
+    }
+    fingerprint = content_hash(json.dumps(state, sort_keys=True))
+    return Manifest.load(_manifest_dir(app), fingerprint, _link_target)
+
+
+def _save_manifest(app: Sphinx, manifest: Manifest) -> None:
+    """Save *manifest* for the next build, restoring unchanged files' mtimes.
+
+    With ``rustdoc_postprocess_preserve_mtime`` on, files whose converted
+    output is the same as after the previous build get that build's
+    modification time back, so Sphinx does not consider them outdated.
+    Nothing is saved when the pandoc circuit breaker opened, as outputs
+    converted without pandoc must not be reused.
+    """
+    if _breaker.open:
+        return
+    if app.config.rustdoc_postprocess_preserve_mtime:
+        restored = manifest.preserve_mtimes(Path(app.srcdir))
+        if restored:
+            _log.info(
+                "[rustdoc_postprocess] Kept the timestamps of %d unchanged files",
+                restored,
+            )
+    manifest.save()
+
+
+def _load_symbols(app: Sphinx, watch: _Watch | None = None) -> SymbolIndex | None:
+    """Return the symbol index to resolve links with, or None if that is off.
+
+    The index is used if any crate (see :func:`_crates`) resolves links.
+    Watch mode keeps it between builds; otherwise, with
+    ``rustdoc_postprocess_incremental`` on, it is loaded from the state the
+    previous build saved, and else it starts empty.
+    """
+    crates = _crates(app, report=False)
+    if not any(crate.app.config.rustdoc_postprocess_resolve_links for crate in crates):
+        return None
+    if watch is not None and watch.symbols is not None:
+        return watch.symbols
+    if app.config.rustdoc_postprocess_incremental:
+        index = SymbolIndex.load(_state_dir(app) / "symbols.json")
+    else:
+        index = SymbolIndex()
+    if watch is not None:
+        watch.symbols = index
+    return index
+
+
+def _shard_of(app: Sphinx) -> tuple[int, int] | None:
+    """Return the shard ``rustdoc_postprocess_shard`` selects, or None.
+
+    An invalid value is reported and every file is converted.
+    """
+    value = app.config.rustdoc_postprocess_shard
+    if not value:
+        return None
+    try:
+        return _shard.parse(value)
+    except ValueError as exc:
+        _log.warning(
+            "[rustdoc_postprocess] Ignoring rustdoc_postprocess_shard: %s", exc
+        )
+        return None
+
+
+def _split_shard(
+    rst_dir: Path, rst_files: list[Path], shard: tuple[int, int]
+) -> tuple[list[Path], list[Path]]:
+    """Split *rst_files* into those of *shard* and the others.
+
+    See :func:`sphinx_rustdoc_postprocess._shard.assign`; the files are named
+    relative to *rst_dir*, so every machine splits a tree the same way.
+    """
+    index, count = shard
+    names = {}
+    sizes = {}
+    for path in rst_files:
+        name = names[path] = path.relative_to(rst_dir).as_posix()
+        try:
+            sizes[name] = path.stat().st_size
+        except OSError:
+            sizes[name] = 0
+    shards = _shard.assign(sizes, count)
+    mine = [path for path in rst_files if shards[names[path]] == index]
+    others = [path for path in rst_files if shards[names[path]] != index]
+    return mine, others
+
+
+def _manifest_name(app: Sphinx, path: Path) -> str:
+    """Return the manifest key of *path*: its POSIX path relative to srcdir."""
+    return path.relative_to(app.srcdir).as_posix()
+
+
+def _reuse_manifest(
+    app: Sphinx,
+    manifest: Manifest,
+    rst_files: list[Path],
+    streamed: Container[Path] = (),
+) -> list[Path]:
+    """Settle the files whose conversion the manifest already knows.
+
+    Files that still hold their converted content are left alone, and files
+    regenerated with a known input get the stored output written back.
+    Files in *streamed* are hashed and restored without reading them whole.
+
+    Returns
+    -------
+    list of Path
+        The files that still need converting.
+    """
+    remaining = []
+    for rst_file in rst_files:
+        if rst_file in streamed:
+            try:
+                if manifest.lookup_file(_manifest_name(app, rst_file), rst_file):
+                    continue
+            except (OSError, UnicodeDecodeError):
+                pass
+            remaining.append(rst_file)
+            continue
+        try:
+            original = rst_file.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            # Leave the failure to the conversion pass, which reports it.
+            remaining.append(rst_file)
+            continue
+        known = manifest.lookup(_manifest_name(app, rst_file), original)
+        if known is None:
+            remaining.append(rst_file)
+        elif known != original:
+            rst_file.write_text(known, encoding="utf-8")
+    return remaining
+
+
+def _render_tables(
+    app: Sphinx,
+    tables: Iterable[list[str]],
+    stats: Stats | None = None,
+) -> dict[str, str]:
+    """Render every table of a build with the configured table engine.
+
+    The ``rustdoc_postprocess_table_engine`` config value picks the renderer:
+    ``"pandoc"`` always shells out, ``"native"`` uses the in-process renderer
+    from :mod:`sphinx_rustdoc_postprocess._tables`, and ``"auto"`` uses the
+    native renderer for tables it reproduces exactly and pandoc for the rest
+    (or the native renderer throughout when pandoc is missing).  Tables left
+    for pandoc are looked up in, and stored to, the cache built by
+    :func:`_table_cache`, and the misses are converted together by
+    :func:`_try_pandoc_batch`.
+
+    Parameters
+    ----------
+    app : Sphinx
+        The Sphinx application instance.
+    tables : iterable of list of str
+        The dedented markdown tables of each file, in file order.
+    stats : Stats, optional
+        Receives the rendering time as time spent in the tables converter.
 
-    return _HEADING_RE.sub(_replace, content)
+    Returns
+    -------
+    dict
+        Maps each distinct markdown table to its RST rendering.
+    """
+    start = perf_counter()
+    engine = app.config.rustdoc_postprocess_table_engine
+    if engine == "auto" and (shutil.which("pandoc") is None or _breaker.open):
+        engine = "native"
+    cache = _table_cache(app)
+    rendered: dict[str, str | None] = {}
+    native: set[str] = set()
+    for file_tables in tables:
+        for table_md in file_tables:
+            if table_md in rendered:
+                if table_md not in native:
+                    # Repeated table within this build: shares one conversion.
+                    cache.memory_hits += 1
+                continue
+            rst = None
+            if engine != "pandoc":
+                rst = render_table(table_md, strict=engine == "auto")
+            if rst is not None:
+                rendered[table_md] = rst
+                native.add(table_md)
+            else:
+                rendered[table_md] = cache.get(table_md)
+
+    pending = [table_md for table_md, rst in rendered.items() if rst is None]
+    # Without pandoc, tables the native renderer cannot parse stay as-is.
+    if engine == "native":
+        results: list[str | None] = [None] * len(pending)
+    else:
+        concurrency = app.config.rustdoc_postprocess_pandoc_concurrency
+        results = _try_pandoc_batch(pending, concurrency or os.cpu_count() or 1)
+    for table_md, rst in zip(pending, results):
+        # Failed conversions are not persisted; once the breaker is open they
+        # fall back to the native renderer.
+        if rst is not None:
+            cache.put(table_md, rst)
+        elif _breaker.open:
+            rst = render_table(table_md, strict=False)
+        rendered[table_md] = rst or table_md
+    if stats is not None:
+        stats.converters["tables"].seconds += perf_counter() - start
+    return rendered
+
+
+def _prepare(
+    content: str, needs: Converters = _prescan.ALL, stats: Stats | None = None
+) -> tuple[_FusedConverter, list[str | _Table]]:
+    """Apply the conversions that do not need rendered tables."""
+    converter = _FusedConverter(needs, stats)
+    return converter, converter.scan(content)
+
+
+def _tables_of(prepared: tuple[_FusedConverter, list[str | _Table]]) -> list[str]:
+    """Return the markdown of the tables in :func:`_prepare` output."""
+    return [item.markdown for item in prepared[1] if isinstance(item, _Table)]
+
+
+def _finish(
+    prepared: tuple[_FusedConverter, list[str | _Table]],
+    render: Callable[[str], str],
+) -> tuple[str, Converters]:
+    """Splice rendered tables into prepared content.
+
+    Returns the converted content and the converters that changed it.
+    """
+    converter, scanned = prepared
+    return converter.join(scanned, render), converter.touched
+
+
+def _split_lines(
+    fh: TextIO, on_block: Callable[[str], None] | None = None
+) -> Iterator[str]:
+    """Yield the lines of text file *fh* like ``content.split("\\n")`` would.
+
+    The file is read in blocks of ``_STREAM_BLOCK`` characters, each of which
+    is passed to *on_block* if given.
+    """
+    tail = ""
+    for block in iter(functools.partial(fh.read, _STREAM_BLOCK), ""):
+        if on_block is not None:
+            on_block(block)
+        lines = (tail + block).split("\n")
+        tail = lines.pop()
+        yield from lines
+    yield tail
+
+
+def _streamed(app: Sphinx, path: Path) -> bool:
+    """Whether *path* is large enough to be converted by streaming."""
+    threshold = app.config.rustdoc_postprocess_stream_size
+    return 0 < threshold <= path.stat().st_size
+
+
+def _scan_file(
+    path: Path, needs: Converters, stream: bool = False, resolve: bool = True
+) -> list[str]:
+    """Worker: return the markdown tables of one file.
+
+    Intra-doc links are only resolved if *resolve* is true.
+    """
+    with _resolving(resolve):
+        if not stream:
+            return _tables_of(_prepare(path.read_text(encoding="utf-8"), needs))
+        with open(path, encoding="utf-8") as fh:
+            scanned = _FusedConverter(needs).scan_lines(_split_lines(fh))
+            return [item.markdown for item in scanned if isinstance(item, _Table)]
+
+
+def _stream_file(
+    path: Path, tables: dict[str, str], needs: Converters, stats: Stats
+) -> tuple[str, Path | None, Converters]:
+    """Convert one file in place without ever holding all of it in memory.
+
+    The output goes to a temporary file next to *path* that replaces it
+    atomically, so memory use is bounded by the largest fence or table
+    rather than by the file size.  Returns the hash of the original content,
+    *path* if it changed (or None) and the converters that changed it.
+    """
+    source = hashlib.sha256()
+    output = hashlib.sha256()
+
+    def _read(block: str) -> None:
+        data = block.encode("utf-8")
+        source.update(data)
+        stats.bytes_in += len(data)
+
+    def _write(dst: TextIO, text: str) -> None:
+        data = text.encode("utf-8")
+        output.update(data)
+        stats.bytes_out += len(data)
+        dst.write(text)
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with (
+            open(fd, "w", encoding="utf-8") as dst,
+            open(path, encoding="utf-8") as src,
+        ):
+            converter = _FusedConverter(needs, stats)
+            scanned = converter.scan_lines(_split_lines(src, _read))
+            pending: list[str] = []
+            size = 0
+            separator = ""
+            for line in converter.join_lines(scanned, tables.__getitem__):
+                pending.append(line)
+                size += len(line)
+                if size >= _STREAM_BLOCK:
+                    _write(dst, separator + "\n".join(pending))
+                    pending, size, separator = [], 0, "\n"
+            _write(dst, separator + "\n".join(pending))
+        if output.digest() == source.digest():
+            os.unlink(tmp)
+            return source.hexdigest(), None, converter.touched
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return source.hexdigest(), path, converter.touched
+
+
+def _convert_file(
+    path: Path,
+    tables: dict[str, str],
+    needs: Converters,
+    stream: bool = False,
+    resolve: bool = True,
+) -> tuple[str, str | Path | None, Converters, Stats, dict[str, str | None]]:
+    """Worker: convert one file in place.
+
+    Returns the hash of the original content, the converted content (or None
+    if the file did not change), the converters that changed it, the
+    counters of the conversion and the intra-doc links it resolved.  With
+    *stream*, the file is converted by :func:`_stream_file` and the converted
+    content is returned as its path.  Intra-doc links are only resolved if
+    *resolve* is true.
+    """
+    stats = Stats()
+    with _recording_links() as links, _resolving(resolve):
+        if stream:
+            return (*_stream_file(path, tables, needs, stats), stats, links)
+        original = path.read_text(encoding="utf-8")
+        prepared = _prepare(original, needs, stats)
+    converted, touched = _finish(prepared, tables.__getitem__)
+    stats.bytes_in += utf8_size(original)
+    stats.bytes_out += utf8_size(converted)
+    if converted == original:
+        return content_hash(original), None, touched, stats, links
+    path.write_text(converted, encoding="utf-8")
+    return content_hash(original), converted, touched, stats, links
+
+
+def _report_touched(touched: Iterable[Converters]) -> None:
+    """Log how many files each converter changed."""
+    counts = dict.fromkeys(Converters, 0)
+    for mask in touched:
+        for flag in counts:
+            if mask & flag:
+                counts[flag] += 1
+    if any(counts.values()):
+        _log.info(
+            "[rustdoc_postprocess] Files touched per converter: %s",
+            ", ".join(f"{flag.name.lower()} {n}" for flag, n in counts.items()),
+        )
+
+
+def _report_stats(app: Sphinx, stats: Stats) -> None:
+    """Log the summary of *stats* and write the JSON report if one is configured."""
+    for line in stats.summary():
+        _log.info("[rustdoc_postprocess] %s", line)
+    report = app.config.rustdoc_postprocess_stats_file
+    if report:
+        path = Path(app.srcdir) / report
+        try:
+            stats.write(path)
+        except OSError as exc:
+            _log.warning(
+                "[rustdoc_postprocess] Cannot write stats to %s: %s", path, exc
+            )
+
+
+def _postprocess_jobs(app: Sphinx) -> int:
+    """Return the worker count from ``rustdoc_postprocess_jobs``.
+
+    Defaults to Sphinx's own ``-j`` setting.  Values below two, or platforms
+    where Sphinx itself cannot run in parallel, mean serial processing.
+    """
+    jobs = app.config.rustdoc_postprocess_jobs
+    if jobs is None:
+        jobs = getattr(app, "parallel", 0)
+    if jobs < 2:
+        return 1
+    from sphinx.util.parallel import parallel_available
+
+    return jobs if parallel_available else 1
+
+
+def _map_files(
+    pool: Executor, fn: Callable, files: list[Path], *args: Callable[[Path], object]
+) -> dict[Path, object]:
+    """Run *fn* over *files* in *pool*, largest file first.
+
+    Each entry of *args* is called with the path to build the matching extra
+    argument.  The result maps every path to its return value, or to the
+    exception it raised so one bad file cannot sink the others.
+    """
+    results: dict[Path, object] = {}
+    sizes = {}
+    for path in files:
+        try:
+            sizes[path] = path.stat().st_size
+        except OSError as exc:
+            # E.g. deleted since the scan.
+            results[path] = exc
+    futures = {}
+    for path in sorted(sizes, key=sizes.__getitem__, reverse=True):
+        try:
+            futures[path] = pool.submit(fn, path, *(arg(path) for arg in args))
+        except Exception as exc:
+            results[path] = exc
+    for path, future in futures.items():
+        try:
+            results[path] = future.result()
+        except Exception as exc:
+            results[path] = exc
+    return results
+
+
+def _new_pool(jobs: int) -> Executor:
+    """Return a process pool of *jobs* workers forked from this process."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    context = multiprocessing.get_context("fork")
+    return ProcessPoolExecutor(max_workers=jobs, mp_context=context)
+
+
+@contextlib.contextmanager
+def _process_pool(jobs: int, watch: _Watch | None = None) -> Iterator[Executor]:
+    """Yield a pool of *jobs* workers, the one *watch* keeps if given."""
+    if watch is not None:
+        yield watch.process_pool(jobs)
+        return
+    with _new_pool(jobs) as pool:
+        yield pool
+
+
+def _postprocess_parallel(
+    app: Sphinx,
+    rst_files: list[Path],
+    needs: dict[Path, Converters],
+    pool: Executor,
+    manifest: Manifest | None,
+    stats: Stats,
+    streamed: Container[Path] = (),
+) -> list[Converters]:
+    """Process-pool variant of :func:`postprocess_rst_files`.
+
+    Files are scanned for tables in *pool*, the tables are rendered once in
+    this process, and each file is then converted in a worker whose counters
+    are merged into *stats*.  Log lines are emitted afterwards in path order,
+    so they do not depend on scheduling.  Files in *streamed* are converted by
+    :func:`_stream_file`.  Returns the converters that touched each
+    converted file.
+    """
+    # The workers keep the symbol index they were started with, which this
+    # crate may not resolve links with.
+    resolve = app.config.rustdoc_postprocess_resolve_links
+    with stats.phase("scan"):
+        scans = _map_files(
+            pool,
+            _scan_file,
+            rst_files,
+            needs.__getitem__,
+            streamed.__contains__,
+            lambda path: resolve,
+        )
+    ok = [path for path in rst_files if not isinstance(scans[path], Exception)]
+    with stats.phase("tables"):
+        rendered = _render_tables(app, (scans[path] for path in ok), stats=stats)
+    with stats.phase("write"):
+        results = _map_files(
+            pool,
+            _convert_file,
+            ok,
+            lambda path: {table_md: rendered[table_md] for table_md in scans[path]},
+            needs.__getitem__,
+            streamed.__contains__,
+            lambda path: resolve,
+        )
+
+    touched = []
+    for rst_file in rst_files:
+        result = results.get(rst_file, scans[rst_file])
+        if isinstance(result, Exception):
+            _log.warning(
+                "[rustdoc_postprocess] Failed to convert %s: %s",
+                rst_file.relative_to(app.srcdir),
+                result,
+            )
+            stats.files["failed"] += 1
+            continue
+        source, converted, file_touched, file_stats, links = result
+        touched.append(file_touched)
+        stats.merge(file_stats)
+        if manifest is not None:
+            manifest.record(_manifest_name(app, rst_file), source, converted, links)
+        if converted is None:
+            stats.files["unchanged"] += 1
+        else:
+            stats.files["rewritten"] += 1
+            _log.info(
+                "[rustdoc_postprocess] Converted markdown in %s",
+                rst_file.relative_to(app.srcdir),
+            )
+    return touched
 
 
 def postprocess_rst_files(app: Sphinx) -> None:
@@ -234,31 +2036,478 @@ def postprocess_rst_files(app: Sphinx) -> None:
 
     Scans the directory specified by the ``rustdoc_postprocess_rst_dir``
     config value (relative to ``app.srcdir``) for ``.rst`` files and applies
-    all markdown-to-RST conversions in sequence.
+    all markdown-to-RST conversions in a single walk per file (see
+    :func:`_convert_fused`).  Tables from every file are collected first and
+    rendered together by :func:`_render_tables`, so the whole tree costs a
+    handful of pandoc processes instead of one per table.  A byte-level
+    pre-scan (:mod:`sphinx_rustdoc_postprocess._prescan`) runs first, so files
+    without markdown are never decoded and converters whose markers a file
+    lacks are skipped.
+
+    With ``rustdoc_postprocess_jobs`` (default: Sphinx's ``-j``) above one,
+    files are converted in a process pool instead, where a file that fails is
+    reported and skipped rather than aborting the build.
+
+    When ``rustdoc_postprocess_incremental`` is on, files whose input or
+    output matches the manifest from the previous build (see
+    :mod:`sphinx_rustdoc_postprocess._manifest`) are settled without running
+    any converter, and files whose output is unchanged keep their previous
+    modification time (see :func:`_save_manifest`).
+
+    Files of at least ``rustdoc_postprocess_stream_size`` bytes are read and
+    written line by line (see :func:`_stream_file`) instead of whole.
+
+    When *app* carries the watch state of the command line's ``--watch`` as
+    ``rustdoc_postprocess_watch``, a later call in the same process only looks
+    at the files created or modified since the previous one (see
+    :mod:`sphinx_rustdoc_postprocess._watch`), and reuses its worker pool.
+
+    With ``rustdoc_postprocess_shard`` set to ``"i/n"``, only the *i*-th of
+    *n* shards of the files is converted (see
+    :mod:`sphinx_rustdoc_postprocess._shard`), and with
+    ``rustdoc_postprocess_incremental`` on the run's stats are saved next to
+    the manifest, for merging with the other shards'.  Watch mode ignores it.
+
+    With ``rustdoc_postprocess_dedup`` set, directive bodies repeated more
+    than that many times across the tree are then moved to shared snippets
+    (see :func:`_deduplicate`).  Shards leave that to the final run.
+
+    With ``rustdoc_postprocess_resolve_links`` on, the pre-scan also collects
+    the Rust items every file declares into a
+    :class:`~sphinx_rustdoc_postprocess._symbols.SymbolIndex`, which
+    :func:`_convert_links` resolves intra-doc links with.
+
+    ``rustdoc_postprocess_converters`` selects the converters and their
+    order.  Built-in converters left out are never run; when the rest keep
+    the default order they still share one walk, and otherwise, or when a
+    plug-in from :mod:`sphinx_rustdoc_postprocess._registry` is listed, the
+    converters run one after the other through :func:`_postprocess_sequence`.
+
+    When ``rustdoc_postprocess_rst_dir`` lists several directories, each is
+    a crate with its own settings and manifest (see :func:`_crates`).  Every
+    crate is pre-scanned first, so links resolve across crates, then the
+    crates are converted one after the other, largest first, sharing one
+    worker pool, and the time spent on each is reported.
+
+    Finally a summary of per-converter matches, bytes and time, pandoc call
+    latencies and file outcomes (see :mod:`sphinx_rustdoc_postprocess._stats`)
+    is logged, and written as JSON to ``rustdoc_postprocess_stats_file`` when
+    that is set.
 
     Parameters
     ----------
     app : Sphinx
         The Sphinx application instance.
     """
-    rst_dir = Path(app.srcdir) / app.config.rustdoc_postprocess_rst_dir
-    if not rst_dir.exists():
+    with _build_state(app):
+        _postprocess_rst_files(app)
+
+
+def _postprocess_rst_files(app: Sphinx) -> None:
+    """Do the work of :func:`postprocess_rst_files`."""
+    crates = [crate for crate in _crates(app) if crate.rst_dir.exists()]
+    if not crates:
         return
 
-    for rst_file in sorted(rst_dir.rglob("*.rst")):
-        original = rst_file.read_text(encoding="utf-8")
-        converted = original
-        converted = _convert_fences(converted)
-        converted = _convert_links(converted)
-        converted = _convert_tables(converted)
-        converted = _convert_headings(converted)
-        converted = _convert_inline_code(converted)
-        if converted != original:
+    watch: _Watch | None = getattr(app, "rustdoc_postprocess_watch", None)
+    index = _load_symbols(app, watch)
+    shard = _shard_of(app) if watch is None else None
+    global _run_stats, _symbol_index
+    stats = _run_stats = Stats()
+    needs: dict[Path, Converters] = {}
+    manifests: list[tuple[_Crate, Manifest]] = []
+    touched: list[Converters] = []
+    try:
+        with stats.phase("prescan"):
+            changed = None if watch is None else watch.watcher.changed()
+            scans = [
+                _prescan_crate(crate, changed, index, shard, needs) for crate in crates
+            ]
+            if index is not None and watch is None:
+                # Links resolve to items of every shard.
+                known = {name for scan in scans for name in scan.others}
+                index.retain(known | {_manifest_name(app, path) for path in needs})
+            _symbol_index = index
+        jobs = _postprocess_jobs(app)
+        with contextlib.ExitStack() as stack:
+            pool = None
+
+            def _pool() -> Executor:
+                # One pool for every crate, started once a crate needs it.
+                nonlocal pool
+                if pool is None:
+                    files = sum(len(scan.rst_files) for scan in scans)
+                    pool = stack.enter_context(_process_pool(min(jobs, files), watch))
+                return pool
+
+            # The largest crate first, so that it does not hold up the end.
+            for scan in sorted(scans, key=lambda scan: -scan.size):
+                crate = scan.crate
+                with contextlib.ExitStack() as timing:
+                    if crate.app is not app:
+                        timing.enter_context(stats.crate(crate.name))
+                    manifest, crate_touched = _postprocess_crate(
+                        scan, needs, stats, _pool if jobs > 1 else None
+                    )
+                touched.extend(crate_touched)
+                if manifest is not None:
+                    manifests.append((crate, manifest))
+    finally:
+        _run_stats = None
+        _symbol_index = None
+        _prune_caches()
+    deduplicated = []
+    if shard is None and any(c.app.config.rustdoc_postprocess_dedup for c in crates):
+        with stats.phase("dedup"):
+            deduplicated = _deduplicate(
+                app,
+                crates,
+                {crate.name: manifest for crate, manifest in manifests},
+                stats,
+            )
+    _report_touched(touched)
+    if index is not None:
+        index.save()
+    for crate, manifest in manifests:
+        if watch is not None:
+            # Files the watcher saw no change in were settled by earlier builds.
+            manifest.keep(
+                _manifest_name(app, path)
+                for path in watch.watcher.snapshot
+                if path.is_relative_to(crate.rst_dir)
+            )
+        _save_manifest(crate.app, manifest)
+    if manifests and shard is not None:
+        stats.write(_state_dir(app) / _shard.STATS_NAME, latencies=True)
+    if watch is not None:
+        watch.watcher.update([*needs, *deduplicated])
+    _report_stats(app, stats)
+
+
+def _prescan_crate(
+    crate: _Crate,
+    changed: list[Path] | None,
+    index: SymbolIndex | None,
+    shard: tuple[int, int] | None,
+    needs: dict[Path, Converters],
+) -> _CrateScan:
+    """Pre-scan the files of *crate* (see :func:`postprocess_rst_files`).
+
+    *changed* lists the files watch mode saw change, in every crate; when
+    None, every file of the crate is scanned.  The converters each file of
+    this shard needs are stored in *needs*, and the items it declares in
+    *index*.
+    """
+    app = crate.app
+    if changed is None:
+        rst_files = sorted(crate.rst_dir.rglob("*.rst"))
+    else:
+        rst_files = [path for path in changed if path.is_relative_to(crate.rst_dir)]
+    converters = _converters(app)
+    enabled = Converters(0)
+    for converter in converters:
+        enabled |= converter.flag or 0
+    # Plug-ins have no pre-scan flag, so no file can be ruled out for them.
+    plugins = any(converter.flag is None for converter in converters)
+    others: list[Path] = []
+    if shard is not None:
+        rst_files, others = _split_shard(crate.rst_dir, rst_files, shard)
+    for path in rst_files:
+        if index is None:
+            needs[path] = _prescan.needed_file(path) & enabled
+            continue
+        items: list[tuple[str, str]] = []
+        needs[path] = _prescan.needed_file(path, items) & enabled
+        index.update(_manifest_name(app, path), items)
+    names = []
+    if index is not None:
+        for path in others:
+            names.append(_manifest_name(app, path))
+            index.update(names[-1], declared(path.read_bytes()))
+    found = rst_files
+    rst_files = [path for path in found if plugins or needs[path]]
+    if shard is not None:
+        _log.info(
+            "[rustdoc_postprocess] Shard %d/%d: %d of %d files",
+            shard[0] + 1,
+            shard[1],
+            len(found),
+            len(found) + len(others),
+        )
+    size = 0
+    for path in rst_files:
+        with contextlib.suppress(OSError):
+            size += path.stat().st_size
+    return _CrateScan(crate, found, rst_files, names, size)
+
+
+def _deduplicate(
+    app: Sphinx,
+    crates: list[_Crate],
+    manifests: dict[str, Manifest],
+    stats: Stats,
+) -> list[Path]:
+    """Share the directive bodies repeated across the generated files.
+
+    Every file of the crates with ``rustdoc_postprocess_dedup`` set is read,
+    with the bodies it already shares expanded, and each body found more
+    than that many times in them is written once to a snippet in the
+    ``_shared`` directory next to the crates and included instead (see
+    :mod:`sphinx_rustdoc_postprocess._dedup`).  The manifests of *manifests*
+    record the rewritten outputs, snippets no file includes any more are
+    removed, and the bytes saved are counted into *stats*.  Files streamed
+    for their size are left alone.
+
+    Returns
+    -------
+    list of Path
+        The files rewritten.
+    """
+    crates = [crate for crate in crates if crate.app.config.rustdoc_postprocess_dedup]
+    root = Path(os.path.commonpath([crate.rst_dir for crate in crates]))
+    shared_dir = root / _dedup.SHARED_DIR
+    snippets: dict[str, str | None] = {}
+
+    def _snippet(name: str) -> str | None:
+        if name not in snippets:
+            try:
+                path = shared_dir / f"{name}{_dedup.SUFFIX}"
+                snippets[name] = path.read_text(encoding="utf-8")
+            except OSError:
+                snippets[name] = None
+        return snippets[name]
+
+    # (crate, path, include prefix, content, content with its bodies
+    # expanded, the bodies) per file.
+    files = []
+    counts: Counter[str] = Counter()
+    texts = {}
+    for crate in crates:
+        for path in sorted(crate.rst_dir.rglob("*.rst")):
+            if _streamed(crate.app, path):
+                continue
+            content = path.read_text(encoding="utf-8")
+            prefix = Path(os.path.relpath(shared_dir, path.parent)).as_posix()
+            expanded = _dedup.expand(content, _snippet, prefix)
+            found = _dedup.bodies(expanded)
+            for body in found:
+                name = _dedup.digest(body.text)
+                counts[name] += 1
+                texts[name] = body.text
+            files.append((crate, path, prefix, content, expanded, found))
+    shared = {
+        crate.name: {
+            name
+            for name, count in counts.items()
+            if count > crate.app.config.rustdoc_postprocess_dedup
+        }
+        for crate in crates
+    }
+    used: Counter[str] = Counter()
+    rewrites = []
+    for crate, path, prefix, content, expanded, found in files:
+        collapsed = _dedup.collapse(expanded, found, shared[crate.name], prefix)
+        for body in found:
+            name = _dedup.digest(body.text)
+            if name in shared[crate.name]:
+                used[name] += 1
+        stats.dedup["bytes_saved"] += utf8_size(expanded) - utf8_size(collapsed)
+        if collapsed != content:
+            rewrites.append((crate, path, collapsed))
+    # The snippets first, so that no file ever includes a missing one.
+    for name in used:
+        stats.dedup["bytes_saved"] -= utf8_size(texts[name])
+        if _snippet(name) != texts[name]:
+            shared_dir.mkdir(parents=True, exist_ok=True)
+            path = shared_dir / f"{name}{_dedup.SUFFIX}"
+            path.write_text(texts[name], encoding="utf-8")
+    stats.dedup["snippets"] += len(used)
+    stats.dedup["includes"] += sum(used.values())
+    for crate, path, collapsed in rewrites:
+        path.write_text(collapsed, encoding="utf-8")
+        stats.files["deduplicated"] += 1
+        manifest = manifests.get(crate.name)
+        if manifest is not None:
+            manifest.rewrite(_manifest_name(app, path), collapsed)
+    if shared_dir.is_dir():
+        for path in shared_dir.glob(f"*{_dedup.SUFFIX}"):
+            if path.stem not in used:
+                path.unlink(missing_ok=True)
+        if not any(shared_dir.iterdir()):
+            shared_dir.rmdir()
+    return [path for _, path, _ in rewrites]
+
+
+def _postprocess_crate(
+    scan: _CrateScan,
+    needs: dict[Path, Converters],
+    stats: Stats,
+    pool: Callable[[], Executor] | None = None,
+) -> tuple[Manifest | None, list[Converters]]:
+    """Convert the pre-scanned files of a crate with the crate's settings.
+
+    Files are converted in the worker pool *pool* returns, if given and
+    there are several.  Counts into *stats*, and returns the crate's
+    manifest, if incremental builds are on, and the converters that touched
+    each converted file.
+    """
+    app = scan.crate.app
+    rst_files = scan.rst_files
+    converters = _converters(app)
+    mask = _fused_mask(converters)
+    streamed = set()
+    if mask is not None:
+        streamed = {path for path in rst_files if _streamed(app, path)}
+    found = len(scan.found)
+    stats.files["found"] += found
+    stats.files["streamed"] += len(streamed)
+    stats.files["skipped"] += found - len(rst_files)
+    if len(rst_files) < found:
+        _log.info(
+            "[rustdoc_postprocess] Skipped %d files without markdown",
+            found - len(rst_files),
+        )
+    manifest = _load_manifest(app)
+    if manifest is not None:
+        with stats.phase("manifest"):
+            if app.config.rustdoc_postprocess_preserve_mtime:
+                # Recorded as converting to themselves, so that their
+                # timestamps are preserved too.
+                converting = set(rst_files)
+                for path in scan.found:
+                    if path not in converting:
+                        name = _manifest_name(app, path)
+                        manifest.record(name, file_hash(path), None)
+            rst_files = _reuse_manifest(app, manifest, rst_files, streamed)
+        stats.files["reused"] += manifest.reused
+        if manifest.reused:
+            _log.info(
+                "[rustdoc_postprocess] Reused %d unchanged files", manifest.reused
+            )
+
+    if pool is not None and mask is not None and len(rst_files) > 1:
+        touched = _postprocess_parallel(
+            app, rst_files, needs, pool(), manifest, stats, streamed
+        )
+        return manifest, touched
+    with _resolving(app.config.rustdoc_postprocess_resolve_links):
+        if mask is None:
+            touched = _postprocess_sequence(app, rst_files, converters, manifest, stats)
+        else:
+            touched = _postprocess_serial(
+                app, rst_files, needs, manifest, stats, streamed
+            )
+    return manifest, touched
+
+
+def _postprocess_serial(
+    app: Sphinx,
+    rst_files: list[Path],
+    needs: dict[Path, Converters],
+    manifest: Manifest | None,
+    stats: Stats,
+    streamed: Container[Path] = (),
+) -> list[Converters]:
+    """In-process variant of :func:`postprocess_rst_files`.
+
+    Files in *streamed* are never held in memory whole: only their tables
+    are kept between the scan and :func:`_stream_file`.  Counts into *stats*
+    and returns the converters that touched each file.
+    """
+    # (file, original or None if streamed, _prepare output or tables, links).
+    staged = []
+    with stats.phase("scan"):
+        for rst_file in rst_files:
+            needed = needs[rst_file]
+            if rst_file in streamed:
+                tables = _scan_file(rst_file, needed, True)
+                staged.append((rst_file, None, tables, {}))
+                continue
+            original = rst_file.read_text(encoding="utf-8")
+            with _recording_links() as links:
+                prepared = _prepare(original, needed, stats)
+            staged.append((rst_file, original, prepared, links))
+    with stats.phase("tables"):
+        rendered = _render_tables(
+            app,
+            (
+                pre if original is None else _tables_of(pre)
+                for _, original, pre, _ in staged
+            ),
+            stats=stats,
+        )
+
+    touched = []
+    with stats.phase("write"):
+        for rst_file, original, prepared, links in staged:
+            if original is None:
+                with _recording_links() as links:
+                    source, converted, file_touched = _stream_file(
+                        rst_file, rendered, needs[rst_file], stats
+                    )
+            else:
+                text, file_touched = _finish(prepared, rendered.__getitem__)
+                stats.bytes_in += utf8_size(original)
+                stats.bytes_out += utf8_size(text)
+                source = content_hash(original)
+                converted = text if text != original else None
+                if converted is not None:
+                    rst_file.write_text(converted, encoding="utf-8")
+            touched.append(file_touched)
+            if manifest is not None:
+                manifest.record(_manifest_name(app, rst_file), source, converted, links)
+            if converted is None:
+                stats.files["unchanged"] += 1
+                continue
+            stats.files["rewritten"] += 1
+            _log.info(
+                "[rustdoc_postprocess] Converted markdown in %s",
+                rst_file.relative_to(app.srcdir),
+            )
+    return touched
+
+
+def _postprocess_sequence(
+    app: Sphinx,
+    rst_files: list[Path],
+    converters: tuple[Converter, ...],
+    manifest: Manifest | None,
+    stats: Stats,
+) -> list[Converters]:
+    """Variant of :func:`postprocess_rst_files` for custom converter lists.
+
+    Each file is read whole and converted in this process by
+    :func:`_convert_sequence`, which renders the tables of one file at a time.
+    Counts into *stats* and returns the converters that touched each file.
+    """
+    touched = []
+    with stats.phase("convert"):
+        for rst_file in rst_files:
+            original = rst_file.read_text(encoding="utf-8")
+            with _recording_links() as links:
+                text, file_touched = _convert_sequence(app, original, converters, stats)
+            stats.bytes_in += utf8_size(original)
+            stats.bytes_out += utf8_size(text)
+            converted = text if text != original else None
+            if converted is not None:
+                rst_file.write_text(converted, encoding="utf-8")
+            touched.append(file_touched)
+            if manifest is not None:
+                manifest.record(
+                    _manifest_name(app, rst_file),
+                    content_hash(original),
+                    converted,
+                    links,
+                )
+            if converted is None:
+                stats.files["unchanged"] += 1
+                continue
+            stats.files["rewritten"] += 1
             _log.info(
                 "[rustdoc_postprocess] Converted markdown in %s",
                 rst_file.relative_to(app.srcdir),
             )
-            rst_file.write_text(converted, encoding="utf-8")
+    return touched
 
 
 def inject_rust_toctree(app: Sphinx) -> None:
@@ -290,12 +2539,437 @@ def inject_rust_toctree(app: Sphinx) -> None:
     _log.info("[rustdoc_postprocess] Injected toctree into %s", target)
 
 
+def _crate_of(crates: list[_Crate], docname: str) -> _Crate | None:
+    """Return the crate of *crates* whose directory holds *docname*, if any."""
+    for crate in crates:
+        rst_dir = PurePosixPath(Path(crate.name).as_posix())
+        if str(rst_dir) == "." or PurePosixPath(docname).is_relative_to(rst_dir):
+            return crate
+    return None
+
+
+def _index_sources(app: Sphinx) -> None:
+    """Index the generated files for the ``"source-read"`` mode.
+
+    The documents are converted one at a time as Sphinx reads them, so the
+    symbol index their links are resolved with is built beforehand, from the
+    files as sphinxcontrib-rust wrote them, and kept on *app* for
+    :func:`_build_state`.  Every file is read, so nothing is saved for the
+    next build.
+    """
+    app.rustdoc_postprocess_symbols = None
+    crates = _crates(app)
+    if not any(crate.app.config.rustdoc_postprocess_resolve_links for crate in crates):
+        return
+    index = SymbolIndex()
+    for crate in crates:
+        if crate.rst_dir.exists():
+            for path in crate.rst_dir.rglob("*.rst"):
+                index.update(_manifest_name(app, path), declared(path.read_bytes()))
+    app.rustdoc_postprocess_symbols = index
+
+
+def _on_source_read(app: Sphinx, docname: str, source: list[str]) -> None:
+    """Convert a generated document in memory as Sphinx reads it.
+
+    ``source-read`` callback used when ``rustdoc_postprocess_mode`` is
+    ``"source-read"``.  Documents under ``rustdoc_postprocess_rst_dir`` go
+    through the same conversions as :func:`postprocess_rst_files`, but the
+    files on disk are left as sphinxcontrib-rust wrote them, only documents
+    Sphinx actually reads are converted, and the work is spread over Sphinx's
+    parallel readers.
+
+    Parameters
+    ----------
+    app : Sphinx
+        The Sphinx application instance.
+    docname : str
+        The name of the document being read.
+    source : list of str
+        One-element list holding the document source, replaced in place.
+    """
+    if app.config.rustdoc_postprocess_mode != "source-read":
+        return
+    crate = _crate_of(_crates(app, report=False), docname)
+    if crate is None:
+        return
+    with _build_state(app):
+        _convert_source(crate.app, docname, source)
+
+
+def _convert_source(app: Sphinx, docname: str, source: list[str]) -> None:
+    """Do the work of :func:`_on_source_read` with the *app* of the crate."""
+    original = source[0]
+    converters = _converters(app)
+    mask = _fused_mask(converters)
+    if mask is None:
+        with _resolving(app.config.rustdoc_postprocess_resolve_links):
+            converted, _ = _convert_sequence(app, original, converters)
+    else:
+        needs = _prescan.needed(original.encode("utf-8")) & mask
+        if not needs:
+            return
+        with _resolving(app.config.rustdoc_postprocess_resolve_links):
+            prepared = _prepare(original, needs)
+        tables = _tables_of(prepared)
+        rendered = _render_tables(app, [tables]) if tables else {}
+        converted, _ = _finish(prepared, rendered.__getitem__)
+    if converted != original:
+        _log.verbose("[rustdoc_postprocess] Converted markdown in %s", docname)
+        source[0] = converted
+
+
+def stage_generated_files(app: Sphinx) -> None:
+    """Make sphinxcontrib-rust generate into a temporary directory.
+
+    ``builder-inited`` callback, run before sphinxcontrib-rust's own when
+    ``rustdoc_postprocess_mode`` is ``"writer"``.  It points ``rust_doc_dir``
+    at a fresh temporary directory, so the raw output never reaches the
+    documentation tree; :func:`write_generated_files` then writes each file
+    there once, converted.  Without sphinxcontrib-rust, or when it is not
+    going to generate anything, nothing is staged and the files are
+    post-processed in place as in ``"files"`` mode.  A staging directory
+    left by a build that failed before :func:`write_generated_files` ran is
+    removed first.
+
+    Parameters
+    ----------
+    app : Sphinx
+        The Sphinx application instance.
+    """
+    _discard_staging(app)
+    if app.config.rustdoc_postprocess_mode != "writer":
+        return
+    doc_dir = getattr(app.config, "rust_doc_dir", None)
+    if not doc_dir or getattr(app.config, "rust_generate_mode", "skip") == "skip":
+        return
+    root = Path(tempfile.mkdtemp(prefix="rustdoc_postprocess-"))
+    if isinstance(doc_dir, dict):
+        staged = {crate: root / str(i) for i, crate in enumerate(doc_dir)}
+        targets = [(staged[crate], Path(path)) for crate, path in doc_dir.items()]
+        app.config.rust_doc_dir = {crate: str(path) for crate, path in staged.items()}
+    else:
+        targets = [(root, Path(doc_dir))]
+        app.config.rust_doc_dir = str(root)
+    app.rustdoc_postprocess_staging = _Staging(root, doc_dir, targets)
+
+
+def _take_staging(app: Sphinx) -> _Staging | None:
+    """Return the staging of *app*'s build, if any, and forget it."""
+    staging = getattr(app, "rustdoc_postprocess_staging", None)
+    app.rustdoc_postprocess_staging = None
+    return staging
+
+
+def _discard_staging(app: Sphinx) -> None:
+    """Remove the staging directory if :func:`write_generated_files` did not.
+
+    ``rust_doc_dir`` is restored first.
+    """
+    staging = _take_staging(app)
+    if staging is None:
+        return
+    app.config.rust_doc_dir = staging.doc_dir
+    shutil.rmtree(staging.root, ignore_errors=True)
+
+
+def _index_staged(
+    app: Sphinx, index: SymbolIndex, staging: _Staging, rst_dirs: list[Path]
+) -> None:
+    """Update *index* with the staged files, before any of them is converted.
+
+    Only files landing in one of *rst_dirs* are indexed.  Files already in
+    place that are not staged again keep their items, and files that no
+    longer exist are dropped.
+    """
+    names = set()
+    for source_dir, target_dir in staging.targets:
+        target_dir = Path(os.path.abspath(target_dir))
+        for raw in source_dir.rglob("*.rst"):
+            target = target_dir / raw.relative_to(source_dir)
+            if any(target.is_relative_to(rst_dir) for rst_dir in rst_dirs):
+                name = _manifest_name(app, target)
+                index.update(name, declared(raw.read_bytes()))
+                names.add(name)
+    srcdir = Path(app.srcdir)
+    index.retain(names | {name for name in index.files if (srcdir / name).exists()})
+
+
+def write_generated_files(app: Sphinx) -> None:
+    """Convert the files staged by :func:`stage_generated_files` into place.
+
+    RST files that land under ``rustdoc_postprocess_rst_dir`` go through the
+    same conversions as in :func:`postprocess_rst_files`, with the tables of
+    all files rendered together, and are written once; other files are
+    copied unchanged.  With ``rustdoc_postprocess_incremental`` on, files
+    whose generated input matches the manifest are not written at all.
+    With ``rustdoc_postprocess_resolve_links`` on, every staged file is
+    indexed first (see :func:`_index_staged`), so links resolve to items of
+    files converted after them.  In a workspace, each file is converted
+    with the settings of its crate and recorded in the crate's manifest.
+    Finally ``rust_doc_dir`` is restored and the staging directory removed.
+
+    Parameters
+    ----------
+    app : Sphinx
+        The Sphinx application instance.
+    """
+    with _build_state(app):
+        _write_generated_files(app)
+
+
+def _write_generated_files(app: Sphinx) -> None:
+    """Do the work of :func:`write_generated_files`."""
+    global _run_stats, _symbol_index
+    staging = _take_staging(app)
+    if staging is None:
+        return
+    app.config.rust_doc_dir = staging.doc_dir
+    stats = _run_stats = Stats()
+    manifests: dict[str, Manifest | None] = {}
+    touched: list[Converters] = []
+    try:
+        crates = [
+            crate._replace(rst_dir=Path(os.path.abspath(crate.rst_dir)))
+            for crate in _crates(app)
+        ]
+        converters = {crate.name: _converters(crate.app) for crate in crates}
+        index = _symbol_index = _load_symbols(app)
+        if index is not None:
+            with stats.phase("prescan"):
+                _index_staged(app, index, staging, [c.rst_dir for c in crates])
+        manifests = {crate.name: _load_manifest(crate.app) for crate in crates}
+        # (crate, target, original, source hash, converted text or _prepare
+        # output, touched converters or None while tables are pending, links)
+        # per file.
+        staged = []
+        with stats.phase("scan"):
+            for source_dir, target_dir in staging.targets:
+                target_dir = Path(os.path.abspath(target_dir))
+                for raw in sorted(source_dir.rglob("*")):
+                    if raw.is_dir():
+                        continue
+                    target = target_dir / raw.relative_to(source_dir)
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    crate = None
+                    if raw.suffix == ".rst":
+                        crate = next(
+                            (c for c in crates if target.is_relative_to(c.rst_dir)),
+                            None,
+                        )
+                    if crate is None:
+                        shutil.copyfile(raw, target)
+                        continue
+                    stats.files["found"] += 1
+                    original = raw.read_text(encoding="utf-8")
+                    source = content_hash(original)
+                    name = _manifest_name(app, target)
+                    manifest = manifests[crate.name]
+                    if (
+                        manifest is not None
+                        and target.exists()
+                        and manifest.written(name, source)
+                    ):
+                        continue
+                    mask = _fused_mask(converters[crate.name])
+                    resolve = crate.app.config.rustdoc_postprocess_resolve_links
+                    if mask is None:
+                        with _recording_links() as links, _resolving(resolve):
+                            text, file_touched = _convert_sequence(
+                                crate.app, original, converters[crate.name], stats
+                            )
+                        staged.append(
+                            (
+                                crate,
+                                target,
+                                original,
+                                source,
+                                text,
+                                file_touched,
+                                links,
+                            )
+                        )
+                        continue
+                    needs = _prescan.needed(original.encode("utf-8")) & mask
+                    if not needs:
+                        shutil.copyfile(raw, target)
+                        if manifest is not None:
+                            manifest.record(name, source, None)
+                        stats.files["skipped"] += 1
+                        continue
+                    with _recording_links() as links, _resolving(resolve):
+                        prepared = _prepare(original, needs, stats)
+                    staged.append(
+                        (crate, target, original, source, prepared, None, links)
+                    )
+        stats.files["reused"] = sum(
+            manifest.reused for manifest in manifests.values() if manifest is not None
+        )
+        # The tables of each crate, rendered with its table engine.
+        tables: dict[str, list[list[str]]] = {}
+        for item in staged:
+            if item[5] is None:
+                tables.setdefault(item[0].name, []).append(_tables_of(item[4]))
+        rendered = {}
+        with stats.phase("tables"):
+            for crate in crates:
+                if crate.name in tables:
+                    rendered[crate.name] = _render_tables(
+                        crate.app, tables[crate.name], stats=stats
+                    )
+        with stats.phase("write"):
+            for (
+                crate,
+                target,
+                original,
+                source,
+                text,
+                file_touched,
+                links,
+            ) in staged:
+                manifest = manifests[crate.name]
+                if file_touched is None:
+                    text, file_touched = _finish(text, rendered[crate.name].__getitem__)
+                touched.append(file_touched)
+                stats.bytes_in += utf8_size(original)
+                stats.bytes_out += utf8_size(text)
+                target.write_text(text, encoding="utf-8")
+                converted = text if text != original else None
+                if manifest is not None:
+                    manifest.record(
+                        _manifest_name(app, target), source, converted, links
+                    )
+                if converted is None:
+                    stats.files["unchanged"] += 1
+                    continue
+                stats.files["rewritten"] += 1
+                _log.info(
+                    "[rustdoc_postprocess] Converted markdown in %s",
+                    target.relative_to(app.srcdir),
+                )
+    finally:
+        _run_stats = None
+        _symbol_index = None
+        _prune_caches()
+        shutil.rmtree(staging.root, ignore_errors=True)
+    _report_touched(touched)
+    if index is not None:
+        index.save()
+    for crate in crates:
+        if manifests[crate.name] is not None:
+            _save_manifest(crate.app, manifests[crate.name])
+    _report_stats(app, stats)
+
+
+def start_pandoc_server(app: Sphinx) -> None:
+    """Start the pandoc server named by ``rustdoc_postprocess_pandoc_server``.
+
+    While it runs, :func:`_pandoc` and :func:`_pandoc_batch` send their
+    conversions to it instead of starting a pandoc process each.  When it
+    cannot be started, a warning is logged and pandoc keeps being run as a
+    subprocess.
+
+    Parameters
+    ----------
+    app : Sphinx
+        The Sphinx application instance.
+    """
+    global _server
+    command = app.config.rustdoc_postprocess_pandoc_server
+    if not command or _server is not None:
+        return
+    server = PandocServer(command, _PANDOC_SERVER_OPTIONS, timeout=_BATCH_TIMEOUT)
+    try:
+        server.start()
+    except PandocServerError as exc:
+        _log.warning(
+            "[rustdoc_postprocess] pandoc server unavailable, using pandoc "
+            "subprocesses: %s",
+            exc,
+        )
+        return
+    _server = server
+
+
+def stop_pandoc_server(app: Sphinx, exception: Exception | None = None) -> None:
+    """Stop the server started by :func:`start_pandoc_server`, if any.
+
+    Parameters
+    ----------
+    app : Sphinx
+        The Sphinx application instance.
+    exception : Exception or None
+        The exception that ended the build, as passed by ``build-finished``.
+    """
+    global _server
+    if _server is not None:
+        _server.stop()
+        _server = None
+
+
+def _reset_breaker(app: Sphinx) -> None:
+    """Give the build of *app* a fresh breaker, opened if pandoc does not run.
+
+    The breaker is kept on *app* (see :func:`_build_state`).  pandoc is probed
+    with ``pandoc --version`` when the table engine or the docstrings
+    converter may need it, so a missing or broken pandoc costs one short
+    timeout per build rather than one per table.  The version is forgotten
+    first, so a build in a long-lived process sees a pandoc that was
+    installed, upgraded or removed since the previous one.
+    """
+    breaker = app.rustdoc_postprocess_breaker = CircuitBreaker(_BREAKER_THRESHOLD)
+    _pandoc_version.cache_clear()
+    engine = app.config.rustdoc_postprocess_table_engine
+    docstrings = "docstrings" in app.config.rustdoc_postprocess_converters
+    if not docstrings and (
+        engine == "native" or (engine == "auto" and shutil.which("pandoc") is None)
+    ):
+        return
+    if not _pandoc_version():
+        breaker.trip("pandoc --version failed")
+
+
 def _on_builder_inited(app: Sphinx) -> None:
     """builder-inited callback: postprocess then inject toctree."""
-    postprocess_rst_files(app)
+    try:
+        _reset_breaker(app)
+        start_pandoc_server(app)
+        mode = app.config.rustdoc_postprocess_mode
+        if mode == "writer" and getattr(app, "rustdoc_postprocess_staging", None):
+            write_generated_files(app)
+        elif mode in ("files", "writer"):
+            postprocess_rst_files(app)
+        else:
+            _index_sources(app)
+    finally:
+        _discard_staging(app)
     inject_rust_toctree(app)
 
 
+# The config values registered by setup(), as (name, default, rebuild, types).
+# Types given as strings are the choices of an ENUM.
+_CONFIG_VALUES = (
+    ("rustdoc_postprocess_rst_dir", "crates", "env", (str, list, tuple, dict)),
+    ("rustdoc_postprocess_toctree_target", "", "env", ()),
+    ("rustdoc_postprocess_toctree_rst", "", "env", ()),
+    ("rustdoc_postprocess_table_engine", "pandoc", "env", ("pandoc", "native", "auto")),
+    ("rustdoc_postprocess_mode", "files", "env", ("files", "source-read", "writer")),
+    ("rustdoc_postprocess_jobs", None, "", (int,)),
+    ("rustdoc_postprocess_incremental", True, "", ()),
+    ("rustdoc_postprocess_resolve_links", False, "env", ()),
+    ("rustdoc_postprocess_shard", "", "", ()),
+    ("rustdoc_postprocess_preserve_mtime", False, "", ()),
+    ("rustdoc_postprocess_pandoc_server", None, "", (list, tuple)),
+    ("rustdoc_postprocess_pandoc_concurrency", None, "", (int,)),
+    ("rustdoc_postprocess_cache_dir", "", "", ()),
+    ("rustdoc_postprocess_cache_size", 64 * 1024 * 1024, "", ()),
+    ("rustdoc_postprocess_stats_file", "", "", ()),
+    ("rustdoc_postprocess_stream_size", 16 * 1024 * 1024, "", ()),
+    ("rustdoc_postprocess_dedup", 0, "env", (int,)),
+    ("rustdoc_postprocess_converters", list(_DEFAULT_CONVERTERS), "env", (list, tuple)),
+)
+
+
 def setup(app: Sphinx) -> dict:
     """Register the extension with Sphinx.
 
@@ -309,10 +2983,17 @@ def setup(app: Sphinx) -> dict:
     dict
         Extension metadata with version and parallel safety flags.
     """
-    app.add_config_value("rustdoc_postprocess_rst_dir", "crates", "env")
-    app.add_config_value("rustdoc_postprocess_toctree_target", "", "env")
-    app.add_config_value("rustdoc_postprocess_toctree_rst", "", "env")
+    from sphinx.config import ENUM
+
+    for name, default, rebuild, types in _CONFIG_VALUES:
+        if types and isinstance(types[0], str):
+            types = ENUM(*types)
+        app.add_config_value(name, default, rebuild, types=types)
     app.connect("builder-inited", _on_builder_inited, priority=600)
+    app.connect("builder-inited", stage_generated_files, priority=400)
+    app.connect("source-read", _on_source_read)
+    app.connect("build-finished", stop_pandoc_server)
+    app.connect("build-finished", _prune_caches)
     return {
         "version": __version__,
         "parallel_read_safe": True,
@@ -0,0 +1,7 @@
+"""Entry point of ``python -m sphinx_rustdoc_postprocess``, see :mod:`._cli`."""
+
+import sys
+
+from sphinx_rustdoc_postprocess._cli import main
+
+sys.exit(main())
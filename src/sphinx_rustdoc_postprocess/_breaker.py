@@ -0,0 +1,66 @@
+"""Circuit breaker that stops calling a failing pandoc.
+
+A broken or hanging pandoc otherwise costs a full timeout for every table of
+the build.  :class:`CircuitBreaker` counts consecutive failures and, past a
+threshold, opens: callers then skip pandoc for the rest of the build and use
+their fallback, and a single warning summarises what went wrong.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+
+from sphinx_rustdoc_postprocess import _logging as logging
+
+_log = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Consecutive-failure counter guarding pandoc calls.
+
+    Parameters
+    ----------
+    threshold : int
+        Consecutive failures after which the breaker opens.
+
+    Attributes
+    ----------
+    open : bool
+        True once pandoc must no longer be called.
+    failures : Counter
+        Number of failures of each kind, e.g. ``"timeout"``.
+    """
+
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.open = False
+        self.consecutive = 0
+        self.failures: Counter[str] = Counter()
+
+    def allow(self) -> bool:
+        """Return whether pandoc may be called."""
+        return not self.open
+
+    def success(self) -> None:
+        """Record a successful call."""
+        self.consecutive = 0
+
+    def failure(self, kind: str) -> None:
+        """Record a failed call of *kind*, opening the breaker at the threshold."""
+        self.failures[kind] += 1
+        self.consecutive += 1
+        if self.consecutive >= self.threshold:
+            self.trip(f"{self.consecutive} consecutive failures")
+
+    def trip(self, reason: str) -> None:
+        """Open the breaker and report *reason* with the failures so far."""
+        if self.open:
+            return
+        self.open = True
+        details = ", ".join(f"{kind} {n}" for kind, n in self.failures.items())
+        _log.warning(
+            "[rustdoc_postprocess] Not calling pandoc for the rest of the build "
+            "after %s%s; tables fall back to the native renderer or stay markdown",
+            reason,
+            f" ({details})" if details else "",
+        )
@@ -0,0 +1,150 @@
+"""Content-addressed cache for markdown-to-RST conversions.
+
+Conversions are memoised in-process (up to :data:`MEMO_SIZE` of them) and,
+optionally, persisted to a directory of ``<sha256>.cache`` files so that later
+builds can skip pandoc entirely.  The on-disk store is bounded in size and
+evicts least recently used entries, using file modification times as the
+access clock.  The store may live under ``srcdir``, so its entries do not end
+in ``.rst``, which Sphinx would read as documents.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+
+#: Suffix of an entry of the on-disk store.
+SUFFIX = ".cache"
+
+#: Number of conversions the in-process memo keeps before evicting the least
+#: recently used one.
+MEMO_SIZE = 4096
+
+# Shared by every cache instance so repeated builds in one process (for
+# example under sphinx-autobuild) start warm.
+_MEMO: OrderedDict[str, str] = OrderedDict()
+
+
+def _remember(key: str, value: str) -> None:
+    _MEMO[key] = value
+    _MEMO.move_to_end(key)
+    while len(_MEMO) > MEMO_SIZE:
+        _MEMO.popitem(last=False)
+
+
+class ConversionCache:
+    """Two-tier (memory + disk) cache keyed by a hash of the input.
+
+    Parameters
+    ----------
+    directory : Path or None
+        Directory of the on-disk store, or None to only use the memo.
+    max_bytes : int
+        Size limit of the on-disk store enforced by :meth:`prune`.
+    namespace : str
+        Mixed into every key, e.g. the converter arguments and version, so
+        entries become unreachable when either changes.
+    """
+
+    def __init__(self, directory: Path | None, max_bytes: int, namespace: str):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        """Return the content address of *text* within this namespace."""
+        digest = hashlib.sha256(self.namespace.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{SUFFIX}"
+
+    def get(self, text: str) -> str | None:
+        """Return the cached conversion of *text*, or None on a miss."""
+        key = self.key(text)
+        if key in _MEMO:
+            self.memory_hits += 1
+            _MEMO.move_to_end(key)
+            return _MEMO[key]
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                value = path.read_text(encoding="utf-8")
+                os.utime(path)
+            except OSError:
+                pass
+            else:
+                _remember(key, value)
+                self.disk_hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, text: str, value: str) -> None:
+        """Store the conversion *value* of *text* in both tiers."""
+        key = self.key(text)
+        _remember(key, value)
+        if self.directory is None:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(value)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def prune(self) -> int:
+        """Evict least recently used disk entries until under ``max_bytes``.
+
+        Returns
+        -------
+        int
+            The number of entries removed.
+        """
+        if self.directory is None or not self.directory.exists():
+            return 0
+        entries = []
+        total = 0
+        for path in self.directory.glob(f"*/*{SUFFIX}"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+            total += st.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    @property
+    def lookups(self) -> int:
+        """Total number of :meth:`get` calls."""
+        return self.memory_hits + self.disk_hits + self.misses
+
+    def summary(self) -> str:
+        """Return a one-line hit-rate summary for the build log."""
+        hits = self.memory_hits + self.disk_hits
+        rate = 100.0 * hits / self.lookups if self.lookups else 0.0
+        return (
+            f"{hits}/{self.lookups} hits ({rate:.0f}%; "
+            f"{self.memory_hits} memory, {self.disk_hits} disk)"
+        )
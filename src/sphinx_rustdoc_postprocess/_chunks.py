@@ -0,0 +1,129 @@
+"""Joining markdown fragments into one pandoc run and splitting its output.
+
+:func:`join` puts unique separator paragraphs between the fragments, and
+:func:`split` cuts pandoc's RST output at them.  pandoc writes the footnotes
+and image substitutions of the whole document at its end, so :func:`split`
+hands each fragment back the ones it references, numbered as if the fragment
+had been converted alone.  Footnote labels are made distinct per fragment
+first, as fragments commonly all use ``[^1]``.  A fragment whose images
+cannot be told apart from another's, such as two images with the same alt
+text, gets None and is converted on its own.
+"""
+
+from __future__ import annotations
+
+import re
+import uuid
+
+# A footnote label, as in [^1] or [^note]: and the "[^" of any text that
+# looks like one, which is restored after conversion.
+_LABEL_RE = re.compile(r"\[\^(?=[^\]\s])")
+# pandoc's output for footnotes: references, and the first line of each note.
+_NOTE_REF_RE = re.compile(r"\[(\d+)\]_")
+_NOTE_RE = re.compile(r"^\.\. \[(\d+)\]$")
+# The first line of an image substitution, and of one of its options.
+_IMAGE_RE = re.compile(r"^\.\. \|(.+?)\| image:: ")
+_OPTION_RE = re.compile(r"^   :\w+:")
+# The names pandoc gives images without alt text, or whose alt text another
+# image of the run already took: they depend on what came before.
+_GENERATED_RE = re.compile(r"image\d*")
+
+
+def _tag(i: int) -> str:
+    return f"rustdocpostprocess{i}-"
+
+
+def join(fragments: list[str]) -> tuple[str, str]:
+    """Return *fragments* as one markdown document and the separator used."""
+    separator = f"rustdocpostprocess{uuid.uuid4().hex}"
+    document = f"\n\n{separator}\n\n".join(
+        _LABEL_RE.sub(f"[^{_tag(i)}", fragment) if "[^" in fragment else fragment
+        for i, fragment in enumerate(fragments)
+    )
+    return document, separator
+
+
+def _trailer(text: str) -> tuple[str, list[tuple[int, str]], list[tuple[str, str]]]:
+    """Split the notes and image substitutions off the end of *text*.
+
+    Returns the text before them, the ``(number, text)`` pairs of the notes,
+    where the text follows the number, and the ``(name, definition)`` pairs
+    of the images.
+    """
+    lines = text.rstrip("\n").split("\n")
+    end = len(lines)
+    while end and (_IMAGE_RE.match(lines[end - 1]) or _OPTION_RE.match(lines[end - 1])):
+        end -= 1
+    while end < len(lines) and not _IMAGE_RE.match(lines[end]):
+        end += 1
+    images: list[tuple[str, str]] = []
+    for line in lines[end:]:
+        m = _IMAGE_RE.match(line)
+        if m is not None:
+            images.append((m.group(1), line))
+        else:
+            images[-1] = (images[-1][0], f"{images[-1][1]}\n{line}")
+    # Notes are numbered from 1 in the order they are referenced.
+    start = end
+    for i in range(end - 1, -1, -1):
+        line = lines[i]
+        if line and not line.startswith("   ") and not _NOTE_RE.match(line):
+            break
+        if line == ".. [1]":
+            start = i
+    notes: list[tuple[int, str]] = []
+    for line in lines[start:end]:
+        m = _NOTE_RE.match(line)
+        if m is not None:
+            notes.append((int(m.group(1)), ""))
+        else:
+            notes[-1] = (notes[-1][0], f"{notes[-1][1]}\n{line}")
+    notes = [(number, note.rstrip("\n")) for number, note in notes]
+    return "\n".join(lines[:start]), notes, images
+
+
+def split(output: str, separator: str, count: int) -> list[str | None] | None:
+    """Split the output of a run of :func:`join` into *count* conversions.
+
+    Returns None if the output does not split back cleanly, and None for a
+    fragment whose images cannot be attributed to it alone.
+    """
+    parts = re.split(rf"^{separator}\n", output, flags=re.MULTILINE)
+    if len(parts) != count:
+        return None
+    notes: list[tuple[int, str]] = []
+    images: list[tuple[str, str]] = []
+    if ".. [" in parts[-1] or ".. |" in parts[-1]:
+        parts[-1], notes, images = _trailer(parts[-1])
+    numbers = list(range(1, len(notes) + 1))
+    refs = [[int(n) for n in _NOTE_REF_RE.findall(part)] for part in parts]
+    if [n for found in refs for n in found] != numbers:
+        return None
+    if [number for number, _ in notes] != numbers:
+        return None
+    texts = []
+    for part, found in zip(parts, refs):
+        text = part.strip("\n")
+        if found:
+            offset = found[0] - 1
+            text = _NOTE_REF_RE.sub(lambda m: f"[{int(m.group(1)) - offset}]_", text)
+            text += "\n\n" + "\n\n".join(
+                f".. [{n - offset}]{notes[n - 1][1]}" for n in found
+            )
+        texts.append(text)
+    owners = {
+        name: [i for i, text in enumerate(texts) if f"|{name}|" in text]
+        for name, _ in images
+    }
+    results: list[str | None] = []
+    for i, text in enumerate(texts):
+        mine = [(name, image) for name, image in images if i in owners[name]]
+        if any(
+            owners[name] != [i] or _GENERATED_RE.fullmatch(name) for name, _ in mine
+        ):
+            results.append(None)
+            continue
+        if mine:
+            text += "\n\n" + "\n".join(image for _, image in mine)
+        results.append(text.replace(f"[^{_tag(i)}", "[^") + "\n")
+    return results
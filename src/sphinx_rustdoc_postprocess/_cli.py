@@ -0,0 +1,286 @@
+"""Command line interface: post-process a directory without running Sphinx.
+
+Runs the pipeline of :func:`sphinx_rustdoc_postprocess.postprocess_rst_files`
+over every ``.rst`` file below a directory, with the extension's default
+config, so the step can run (and be cached) on its own, e.g. in CI.
+
+Usage::
+
+    python -m sphinx_rustdoc_postprocess docs/crates
+    sphinx-rustdoc-postprocess -j auto --state-dir .cache/rustdoc docs/crates
+    sphinx-rustdoc-postprocess --check docs/crates   # exit 1 if out of date
+    sphinx-rustdoc-postprocess --watch docs/crates   # convert what changes
+    sphinx-rustdoc-postprocess --shard 2/4 --state-dir st2 docs/crates
+    sphinx-rustdoc-postprocess --merge st1 ... --merge st4 --state-dir st docs/crates
+
+With ``--check`` a copy of the ``.rst`` files is converted and compared with
+the originals, which are left untouched.  With ``--watch`` the command keeps
+running after the first pass and converts the files that are created or
+modified, once a burst of writes has settled (see
+:mod:`sphinx_rustdoc_postprocess._watch`).  With ``--shard i/n`` only the
+*i*-th of *n* shards of the files is converted, and ``--merge`` combines the
+state directories of the shard runs, so that the final run restores every
+file instead of converting it (see :mod:`sphinx_rustdoc_postprocess._shard`).
+Sphinx itself is never imported, except to ask whether it supports ``-j``
+when more than one job is requested.
+"""
+
+from __future__ import annotations
+
+import argparse
+import filecmp
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+from types import SimpleNamespace
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import _dedup
+from sphinx_rustdoc_postprocess._shard import merge as _merge
+from sphinx_rustdoc_postprocess._shard import parse as _parse_shard
+
+
+class _Formatter(logging.Formatter):
+    """Print messages bare, with Sphinx's ``WARNING:`` prefix on warnings."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        if record.levelno >= logging.WARNING:
+            return f"{record.levelname}: {message}"
+        return message
+
+
+def _jobs(value: str) -> int:
+    """Parse ``--jobs``: a positive number or ``auto`` for one per CPU."""
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f"not a positive number or auto: {value}")
+    return jobs
+
+
+def _shard(value: str) -> str:
+    """Check ``--shard``: ``i/n`` with ``1 <= i <= n``."""
+    try:
+        _parse_shard(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+    return value
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sphinx-rustdoc-postprocess",
+        description="Convert the markdown left in sphinxcontrib-rust output to RST.",
+    )
+    parser.add_argument(
+        "directory", type=Path, help="directory holding the generated .rst files"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_jobs,
+        default=1,
+        help="number of worker processes, or auto for one per CPU (default: 1)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--check",
+        action="store_true",
+        help="change nothing; exit with status 1 if any file would be converted",
+    )
+    mode.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and convert the files that change",
+    )
+    parser.add_argument(
+        "--debounce",
+        metavar="SECONDS",
+        type=float,
+        default=0.5,
+        help="with --watch, how long files must stay unchanged (default: 0.5)",
+    )
+    parser.add_argument(
+        "--stats",
+        metavar="FILE",
+        type=Path,
+        help="write the JSON stats report to FILE (with --merge, of the shard runs)",
+    )
+    parser.add_argument(
+        "--state-dir",
+        metavar="DIR",
+        type=Path,
+        help="keep the incremental manifest and table cache in DIR between runs",
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="I/N",
+        type=_shard,
+        help="only convert the I-th of N shards of the files, of about equal size",
+    )
+    parser.add_argument(
+        "--merge",
+        metavar="DIR",
+        type=Path,
+        action="append",
+        default=[],
+        help="first combine the --state-dir of a shard run into --state-dir, and "
+        "its stats into --stats; repeat for every shard",
+    )
+    parser.add_argument(
+        "--table-engine",
+        choices=("pandoc", "native", "auto"),
+        default="pandoc",
+        help="how markdown tables are rendered (default: pandoc)",
+    )
+    parser.add_argument(
+        "--dedup",
+        metavar="N",
+        type=int,
+        default=0,
+        help="share directive bodies repeated more than N times through includes "
+        "(default: 0, off)",
+    )
+    parser.add_argument(
+        "--resolve-links",
+        action="store_true",
+        help="turn intra-doc links naming a generated item into cross-references",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="only report warnings"
+    )
+    return parser
+
+
+def _app(args: argparse.Namespace, srcdir: Path) -> SimpleNamespace:
+    """Return a stand-in Sphinx app converting every file under *srcdir*."""
+    config = {name: default for name, default, _, _ in mod._CONFIG_VALUES}
+    config.update(
+        rustdoc_postprocess_rst_dir=".",
+        rustdoc_postprocess_table_engine=args.table_engine,
+        rustdoc_postprocess_jobs=args.jobs,
+        rustdoc_postprocess_incremental=args.state_dir is not None and not args.check,
+        rustdoc_postprocess_shard=args.shard or "",
+        rustdoc_postprocess_dedup=args.dedup,
+        rustdoc_postprocess_resolve_links=args.resolve_links,
+    )
+    if args.stats is not None and not args.merge:
+        config["rustdoc_postprocess_stats_file"] = os.path.abspath(args.stats)
+    if args.state_dir is None:
+        config["rustdoc_postprocess_cache_size"] = 0
+    return SimpleNamespace(
+        srcdir=str(srcdir),
+        # Only read for the state kept with --state-dir.
+        doctreedir=str(args.state_dir) if args.state_dir is not None else None,
+        config=SimpleNamespace(**config),
+        # Kept between the runs of --watch.
+        rustdoc_postprocess_watch=mod._Watch(srcdir) if args.watch else None,
+    )
+
+
+def _outdated(args: argparse.Namespace) -> list[str]:
+    """Convert a copy of the ``.rst`` files; return those that would change."""
+
+    def _ignore(directory: str, names: list[str]) -> list[str]:
+        # Shared snippets are kept, for the files including them.
+        return [
+            name
+            for name in names
+            if not name.endswith((".rst", _dedup.SUFFIX))
+            and not os.path.isdir(os.path.join(directory, name))
+        ]
+
+    with tempfile.TemporaryDirectory(prefix="rustdoc_postprocess-") as tmp:
+        copy = Path(tmp) / "src"
+        shutil.copytree(args.directory, copy, ignore=_ignore)
+        app = _app(args, copy)
+        mod._reset_breaker(app)
+        mod.postprocess_rst_files(app)
+        return [
+            path.relative_to(copy).as_posix()
+            for path in sorted(copy.rglob("*.rst"))
+            if not filecmp.cmp(
+                path, args.directory / path.relative_to(copy), shallow=False
+            )
+        ]
+
+
+def _watch(app: SimpleNamespace, debounce: float) -> None:
+    """Convert the files created or modified under *app*, until interrupted."""
+    watcher = app.rustdoc_postprocess_watch.watcher
+    mod._log.info("[rustdoc_postprocess] Watching %s for changes", app.srcdir)
+    try:
+        while True:
+            watcher.wait(debounce)
+            mod._reset_breaker(app)
+            mod.postprocess_rst_files(app)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the command line interface.
+
+    Parameters
+    ----------
+    argv : sequence of str, optional
+        The arguments, without the program name; defaults to ``sys.argv``.
+
+    Returns
+    -------
+    int
+        The exit status: 1 if ``--check`` found files that would change, and
+        0 otherwise.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if not args.directory.is_dir():
+        parser.error(f"not a directory: {args.directory}")
+    if args.shard and args.watch:
+        parser.error("--shard cannot be used with --watch")
+    if args.merge and (args.state_dir is None or args.check or args.shard):
+        parser.error("--merge needs --state-dir, and no --check or --shard")
+
+    logger = logging.getLogger("sphinx")
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(_Formatter())
+    level = logger.level
+    logger.setLevel(logging.WARNING if args.quiet or args.check else logging.INFO)
+    logger.addHandler(handler)
+    try:
+        if args.check:
+            outdated = _outdated(args)
+            for name in outdated:
+                print(f"would convert {name}")
+            return 1 if outdated else 0
+        app = _app(args, args.directory)
+        if args.merge:
+            try:
+                stats = _merge(
+                    (
+                        mod._state_dir(SimpleNamespace(doctreedir=directory))
+                        for directory in args.merge
+                    ),
+                    mod._state_dir(app),
+                )
+            except (OSError, ValueError) as exc:
+                parser.error(f"cannot merge: {exc}")
+            if args.stats is not None:
+                stats.write(args.stats)
+        mod._reset_breaker(app)
+        mod.postprocess_rst_files(app)
+        if args.watch:
+            _watch(app, args.debounce)
+        return 0
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
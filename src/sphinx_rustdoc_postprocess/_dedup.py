@@ -0,0 +1,164 @@
+"""Directive bodies repeated across the generated files, shared by includes.
+
+Re-exports and blanket impls make sphinxcontrib-rust emit the same doc
+comment, table or example in the body of many ``rust:`` directives.  Each
+copy is converted, written and parsed again by docutils.  A body repeated
+often enough is instead written once to a snippet file named by its hash and
+replaced, in every file, by an ``.. include::`` of it, which docutils parses
+exactly as the body it stands for.
+
+Only bodies without ``rust:`` directives of their own are shared, so that
+every item stays declared in its file, where the symbol index (see
+:mod:`sphinx_rustdoc_postprocess._symbols`) and Sphinx find it.  Snippets end
+in :data:`SUFFIX` rather than ``.rst``, so Sphinx does not read them as
+documents.  :func:`expand` undoes :func:`collapse`, so files already sharing
+bodies can be counted again when the repeated bodies change.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Container
+from typing import NamedTuple
+
+from sphinx_rustdoc_postprocess._manifest import content_hash
+from sphinx_rustdoc_postprocess._regions import MARKUP, RegionTracker, directive_name
+
+#: Name of the directory holding the snippets.
+SHARED_DIR = "_shared"
+#: Suffix of a snippet file.
+SUFFIX = ".inc"
+#: Smallest body worth sharing, in characters: below it the include line and
+#: the extra file read cost about as much as they save.
+MIN_SIZE = 512
+
+
+class Body(NamedTuple):
+    """The body of a ``rust:`` directive, found by :func:`bodies`."""
+
+    #: Index of its first line, and one past its last non-blank line.
+    start: int
+    end: int
+    #: The indentation of its first line, which no line of it is below.
+    indent: str
+    #: Its dedented lines, ending with a newline.
+    text: str
+
+
+def digest(text: str) -> str:
+    """Return the name, without :data:`SUFFIX`, of the snippet holding *text*."""
+    return content_hash(text)[:16]
+
+
+def bodies(content: str) -> list[Body]:
+    """Return the bodies of the ``rust:`` directives of *content* that can be shared.
+
+    A body starts after the directive's options and at least one blank line,
+    and ends at its last line before a line indented no deeper than the
+    directive.  It is only returned if it is at least :data:`MIN_SIZE` long,
+    declares no item itself, and its lines are indented with spaces at least
+    as deep as its first, blank lines being empty, so that :func:`expand`
+    restores it exactly.
+    """
+    if ".. rust:" not in content:
+        return []
+    lines = content.split("\n")
+    tracker = RegionTracker()
+    found = []
+    for i, line in enumerate(lines):
+        if tracker.classify(line) != MARKUP:
+            continue
+        text = line.lstrip(" ")
+        name = directive_name(text)
+        if name is None or not name.startswith("rust:"):
+            continue
+        body = _body(lines, i, len(line) - len(text))
+        if body is not None:
+            found.append(body)
+    return found
+
+
+def _body(lines: list[str], i: int, depth: int) -> Body | None:
+    """Return the shareable body of the directive on line *i*, if it has one."""
+    j = i + 1
+    while j < len(lines) and lines[j].lstrip(" ").startswith(":"):
+        j += 1
+    start = j
+    while start < len(lines) and not lines[start]:
+        start += 1
+    if start == j or start == len(lines):
+        return None
+    indent = len(lines[start]) - len(lines[start].lstrip(" "))
+    if indent <= depth:
+        return None
+    end = start
+    for k in range(start, len(lines)):
+        line = lines[k]
+        if not line:
+            continue
+        text = line.lstrip(" ")
+        level = len(line) - len(text)
+        if level <= depth:
+            break
+        if level < indent or not text.strip():
+            return None
+        if text.startswith(".. rust:"):
+            return None
+        end = k + 1
+    text = "\n".join(line[indent:] for line in lines[start:end]) + "\n"
+    if len(text) < MIN_SIZE:
+        return None
+    return Body(start, end, " " * indent, text)
+
+
+def include(body: Body, prefix: str) -> str:
+    """Return the line including the snippet of *body* from directory *prefix*."""
+    return f"{body.indent}.. include:: {prefix}/{digest(body.text)}{SUFFIX}"
+
+
+def collapse(
+    content: str, found: list[Body], shared: Container[str], prefix: str
+) -> str:
+    """Replace the bodies of *found* whose digest is in *shared* by includes.
+
+    *found* are the :func:`bodies` of *content*, and *prefix* the directory of
+    the snippets, as the include directive takes it.
+    """
+    lines = content.split("\n")
+    out: list[str] = []
+    pos = 0
+    for body in found:
+        if digest(body.text) in shared:
+            out.extend(lines[pos : body.start])
+            out.append(include(body, prefix))
+            pos = body.end
+    if not pos:
+        return content
+    out.extend(lines[pos:])
+    return "\n".join(out)
+
+
+def expand(content: str, snippet: Callable[[str], str | None], prefix: str) -> str:
+    """Replace the includes :func:`collapse` made by the bodies they stand for.
+
+    *snippet* returns the text of the snippet with the given digest, or None
+    if it is gone, in which case its include is left as it is.
+    """
+    if f".. include:: {prefix}/" not in content:
+        return content
+    pattern = re.compile(
+        rf"^(?P<indent>[ ]*)\.\. include:: {re.escape(prefix)}/"
+        rf"(?P<digest>[0-9a-f]{{16}}){re.escape(SUFFIX)}$",
+        re.MULTILINE,
+    )
+
+    def _expand(m: re.Match[str]) -> str:
+        text = snippet(m.group("digest"))
+        if text is None:
+            return m.group(0)
+        return "\n".join(
+            m.group("indent") + line if line else ""
+            for line in text.rstrip("\n").split("\n")
+        )
+
+    return pattern.sub(_expand, content)
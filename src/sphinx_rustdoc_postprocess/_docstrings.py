@@ -0,0 +1,115 @@
+"""The doc comments of a generated file, for converting them whole.
+
+sphinxcontrib-rust puts each doc comment in the body of the directive that
+declares its item (``.. rust:struct::`` and the like).  The regex converters
+only know a few markdown constructs; the ``docstrings`` converter instead has
+pandoc convert whole doc comments, so lists, emphasis, block quotes and
+footnotes come out right too.  :func:`extract` finds the doc comments: the
+runs of prose lines (see :mod:`sphinx_rustdoc_postprocess._regions`) in the
+body of a ``rust:`` directive, outside nested directives.  :func:`splice`
+puts their conversions back in place.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import NamedTuple
+
+from sphinx_rustdoc_postprocess._regions import (
+    MARKUP,
+    PROSE,
+    RegionTracker,
+    directive_name,
+)
+
+# pandoc's numbered footnotes.  Doc comments converted on their own would
+# all number theirs from 1, so they become auto-numbered ones, which docutils
+# numbers across the document in order.
+_NOTE_REF_RE = re.compile(r"\[\d+\]_")
+_NOTE_RE = re.compile(r"^(?P<indent>[ ]*)\.\. \[\d+\]", re.MULTILINE)
+
+
+class Docstring(NamedTuple):
+    """A doc comment found by :func:`extract`."""
+
+    #: Index of its first line, and one past its last line.
+    start: int
+    end: int
+    #: The indentation of its first line, which no line of it is below.
+    indent: str
+    #: Its dedented lines, ending with a newline.
+    markdown: str
+
+
+def extract(content: str) -> list[Docstring]:
+    """Return the doc comments of *content*, in order.
+
+    A doc comment starts at a prose line in the body of a ``rust:``
+    directive, and runs to the last such line before a directive or field
+    line, a literal body, or a line indented less than its first.  Blank
+    lines in between belong to it.
+    """
+    lines = content.split("\n")
+    tracker = RegionTracker()
+    # Indentation of each open directive, and whether it declares an item.
+    directives: list[tuple[int, bool]] = []
+    found = []
+    start = last = -1
+    indent = 0
+
+    def _close() -> None:
+        body = "\n".join(line[indent:] for line in lines[start : last + 1])
+        found.append(Docstring(start, last + 1, lines[start][:indent], body + "\n"))
+
+    for i, line in enumerate(lines):
+        kind = tracker.classify(line)
+        text = line.lstrip()
+        if not text:
+            continue
+        depth = len(line) - len(text)
+        while directives and directives[-1][0] >= depth:
+            directives.pop()
+        prose = kind == PROSE and bool(directives) and directives[-1][1]
+        if prose and start >= 0 and depth >= indent:
+            last = i
+            continue
+        if start >= 0:
+            _close()
+            start = -1
+        if prose:
+            start = last = i
+            indent = depth
+        elif kind == MARKUP:
+            name = directive_name(text)
+            if name is not None:
+                directives.append((depth, name.startswith("rust:")))
+    if start >= 0:
+        _close()
+    return found
+
+
+def number_notes(rst: str) -> str:
+    """Make the numbered footnotes of pandoc output *rst* auto-numbered."""
+    if ".. [" not in rst:
+        return rst
+    return _NOTE_RE.sub(r"\g<indent>.. [#]", _NOTE_REF_RE.sub("[#]_", rst))
+
+
+def indent(text: str, prefix: str) -> str:
+    """Indent the non-blank lines of *text* by *prefix*, without a final newline."""
+    return "\n".join(
+        prefix + line if line.strip() else "" for line in text.rstrip("\n").split("\n")
+    )
+
+
+def splice(content: str, docstrings: list[Docstring], texts: list[str]) -> str:
+    """Replace each of *docstrings* in *content* by the matching text of *texts*."""
+    lines = content.split("\n")
+    out: list[str] = []
+    pos = 0
+    for docstring, text in zip(docstrings, texts):
+        out.extend(lines[pos : docstring.start])
+        out.append(text)
+        pos = docstring.end
+    out.extend(lines[pos:])
+    return "\n".join(out)
@@ -0,0 +1,43 @@
+"""Loggers that do not import Sphinx.
+
+Importing :mod:`sphinx.util.logging` takes tens of milliseconds, which the
+command line interface (see :mod:`sphinx_rustdoc_postprocess._cli`) and the
+processes it starts would pay without ever running Sphinx.  The loggers of
+:func:`getLogger` use Sphinx's adapter when Sphinx has been imported, and a
+plain :mod:`logging` adapter of the same logger otherwise.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+
+# Sphinx's VERBOSE level, between DEBUG and INFO.
+VERBOSE = 15
+
+
+class _PlainAdapter(logging.LoggerAdapter):
+    """The parts of Sphinx's logger adapter this package uses."""
+
+    def verbose(self, msg: object, *args: object, **kwargs: object) -> None:
+        self.log(VERBOSE, msg, *args, **kwargs)
+
+
+class _Logger:
+    """Logger resolving to Sphinx's or a plain adapter on each call."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getattr__(self, attr: str) -> object:
+        sphinx_logging = sys.modules.get("sphinx.util.logging")
+        if sphinx_logging is not None:
+            adapter = sphinx_logging.getLogger(self.name)
+        else:
+            adapter = _PlainAdapter(logging.getLogger(f"sphinx.{self.name}"), {})
+        return getattr(adapter, attr)
+
+
+def getLogger(name: str) -> _Logger:
+    """Return the logger of module *name*, like Sphinx's ``getLogger``."""
+    return _Logger(name)
@@ -0,0 +1,343 @@
+"""Per-file manifest that lets unchanged inputs skip conversion.
+
+The manifest maps each generated file (relative to ``srcdir``) to the hash of
+the raw input sphinxcontrib-rust wrote and the hash of the converted output.
+Converted outputs are kept in a content-addressed object store next to the
+manifest, so a regenerated but otherwise identical file can be restored
+without running a single converter.  Each file's modification time is kept
+too, so a file whose output did not change can get it back (see
+:meth:`Manifest.preserve_mtimes`) and is not read again by Sphinx.  Stored
+outputs do not end in ``.rst``: the doctree directory may lie under ``srcdir``
+(``sphinx-build`` puts it in the output directory by default), and Sphinx
+would read them as documents.  The whole manifest is discarded when its
+fingerprint (extension version, pandoc version, conversion config) changes.
+An entry also lists the intra-doc links its conversion resolved, with their
+targets, and is only reused while they still resolve to the same items, so a
+changed item only invalidates the files linking to it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+_FORMAT = 1
+
+#: Suffix of a stored output in the object store.
+SUFFIX = ".out"
+
+
+def content_hash(text: str) -> str:
+    """Return the hex SHA-256 of *text* encoded as UTF-8."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    """Return :func:`content_hash` of a text file, reading it in chunks."""
+    digest = hashlib.sha256()
+    with open(path, encoding="utf-8") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), ""):
+            digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _atomic_copy(source: Path, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def atomic_write(path: Path, text: str) -> None:
+    """Write *text* to *path* so that readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    os.replace(tmp, path)
+
+
+class Manifest:
+    """Input/output hashes of the files converted by the previous build.
+
+    Parameters
+    ----------
+    directory : Path
+        Directory holding ``manifest.json`` and the ``objects`` store.
+    fingerprint : str
+        Identifies everything besides the input that affects the output.
+    resolve : callable, optional
+        Returns the current target of an intra-doc link, as recorded by
+        :meth:`record`, or None if it resolves to nothing.  Without it no
+        link resolves.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        fingerprint: str,
+        resolve: Callable[[str], str | None] | None = None,
+    ):
+        self.directory = directory
+        self.fingerprint = fingerprint
+        self.resolve = resolve
+        self.entries: dict[str, dict] = {}
+        self.previous: dict[str, dict] = {}
+        self.seen: set[str] = set()
+        self.reused = 0
+
+    @classmethod
+    def load(
+        cls,
+        directory: Path,
+        fingerprint: str | None = None,
+        resolve: Callable[[str], str | None] | None = None,
+    ) -> Manifest:
+        """Read the manifest in *directory*, dropping it if it is stale.
+
+        With *fingerprint* None the manifest is read whatever its
+        fingerprint, which it keeps.
+        """
+        manifest = cls(directory, fingerprint, resolve)
+        try:
+            data = json.loads((directory / "manifest.json").read_text("utf-8"))
+        except (OSError, ValueError):
+            return manifest
+        if fingerprint is None:
+            manifest.fingerprint = fingerprint = data.get("fingerprint")
+        if data.get("format") == _FORMAT and data.get("fingerprint") == fingerprint:
+            manifest.entries = data.get("files", {})
+            manifest.previous = dict(manifest.entries)
+        return manifest
+
+    def _object(self, digest: str) -> Path:
+        return self.directory / "objects" / digest[:2] / f"{digest}{SUFFIX}"
+
+    def _entry(self, name: str) -> dict | None:
+        """Return the entry of *name*, unless one of its links changed target."""
+        self.seen.add(name)
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        resolve = self.resolve or (lambda link: None)
+        for link, target in entry.get("links", {}).items():
+            if resolve(link) != target:
+                return None
+        return entry
+
+    def lookup(self, name: str, content: str) -> str | None:
+        """Return the converted form of *content* if it is already known.
+
+        Parameters
+        ----------
+        name : str
+            The file's path relative to ``srcdir``.
+        content : str
+            The file's current content.
+
+        Returns
+        -------
+        str or None
+            *content* itself when it is the recorded output, the stored output
+            when it is the recorded input, or None when it must be converted.
+        """
+        entry = self._entry(name)
+        if entry is None:
+            return None
+        digest = content_hash(content)
+        if digest == entry["output"]:
+            self.reused += 1
+            return content
+        if digest != entry["input"]:
+            return None
+        try:
+            converted = self._object(entry["output"]).read_text(encoding="utf-8")
+        except OSError:
+            return None
+        self.reused += 1
+        return converted
+
+    def lookup_file(self, name: str, path: Path) -> bool:
+        """Streaming variant of :meth:`lookup` for files too large to read whole.
+
+        Returns True if *path* holds, or has been restored to, its recorded
+        output, and False if it must be converted.
+        """
+        entry = self._entry(name)
+        if entry is None:
+            return False
+        digest = file_hash(path)
+        if digest == entry["output"]:
+            self.reused += 1
+            return True
+        if digest != entry["input"]:
+            return False
+        try:
+            _atomic_copy(self._object(entry["output"]), path)
+        except OSError:
+            return False
+        self.reused += 1
+        return True
+
+    def written(self, name: str, source: str) -> bool:
+        """Return True if *source* is the recorded input of *name*.
+
+        Used when the raw input never reaches the file itself: the file then
+        still holds the recorded output, unless it has gone missing, which the
+        caller checks.
+
+        Parameters
+        ----------
+        name : str
+            The file's path relative to ``srcdir``.
+        source : str
+            :func:`content_hash` of the raw content generated for the file.
+        """
+        entry = self._entry(name)
+        if entry is None or entry["input"] != source:
+            return False
+        self.reused += 1
+        return True
+
+    def record(
+        self,
+        name: str,
+        source: str,
+        converted: str | Path | None,
+        links: dict[str, str | None] | None = None,
+    ) -> None:
+        """Remember what a file converted to.
+
+        Parameters
+        ----------
+        name : str
+            The file's path relative to ``srcdir``.
+        source : str
+            :func:`content_hash` of the file's raw content.
+        converted : str, Path or None
+            The converted content, a file holding it (for streamed files), or
+            None if conversion left it unchanged.
+        links : dict, optional
+            The intra-doc links the conversion resolved, mapped to their
+            targets as the ``resolve`` callable gives them.
+        """
+        self.seen.add(name)
+        output = source
+        if isinstance(converted, Path):
+            output = file_hash(converted)
+            path = self._object(output)
+            if not path.exists():
+                _atomic_copy(converted, path)
+        elif converted is not None:
+            output = content_hash(converted)
+            path = self._object(output)
+            if not path.exists():
+                atomic_write(path, converted)
+        self.entries[name] = {"input": source, "output": output}
+        if links:
+            self.entries[name]["links"] = dict(sorted(links.items()))
+
+    def rewrite(self, name: str, converted: str) -> None:
+        """Record that the output of *name* was rewritten to *converted*.
+
+        Used when a file is changed again after it was converted or reused,
+        e.g. to share its directive bodies; files without an entry are left
+        out.
+        """
+        entry = self.entries.get(name)
+        if entry is not None:
+            self.record(name, entry["input"], converted, entry.get("links"))
+
+    def merge(self, other: Manifest) -> None:
+        """Add the entries of *other*, e.g. a shard's, with their stored outputs.
+
+        Raises
+        ------
+        ValueError
+            If *other* has a different fingerprint, i.e. its outputs were
+            converted differently.
+        """
+        if other.fingerprint != self.fingerprint:
+            raise ValueError(f"{other.directory} was converted with another config")
+        for name, entry in other.entries.items():
+            if entry["output"] != entry["input"]:
+                path = self._object(entry["output"])
+                if not path.exists():
+                    _atomic_copy(other._object(entry["output"]), path)
+            # The modification time belongs to another tree's copy of the file.
+            self.entries[name] = {
+                key: value for key, value in entry.items() if key != "mtime"
+            }
+            self.seen.add(name)
+
+    def keep(self, names: Iterable[str]) -> None:
+        """Keep the entries of *names* although this build did not look at them."""
+        self.seen.update(names)
+
+    def preserve_mtimes(self, root: Path) -> int:
+        """Give unchanged outputs back their modification time.
+
+        Every file seen in this build whose output is the one recorded by the
+        previous build gets that build's modification time back, however
+        often it has been rewritten since.  The resulting time of each file is
+        recorded for the next build.
+
+        Parameters
+        ----------
+        root : Path
+            The directory the file names are relative to, i.e. ``srcdir``.
+
+        Returns
+        -------
+        int
+            The number of files whose modification time was restored.
+        """
+        restored = 0
+        for name in self.seen:
+            entry = self.entries.get(name)
+            if entry is None:
+                continue
+            path = root / name
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            mtime = stat.st_mtime_ns
+            previous = self.previous.get(name, {})
+            if previous.get("output") == entry["output"] and "mtime" in previous:
+                if mtime != previous["mtime"]:
+                    mtime = previous["mtime"]
+                    try:
+                        os.utime(path, ns=(stat.st_atime_ns, mtime))
+                    except OSError:
+                        mtime = stat.st_mtime_ns
+                    else:
+                        restored += 1
+            entry["mtime"] = mtime
+        return restored
+
+    def save(self) -> None:
+        """Write the manifest for the files seen and drop unused objects."""
+        self.entries = {
+            name: entry for name, entry in self.entries.items() if name in self.seen
+        }
+        data = {
+            "format": _FORMAT,
+            "fingerprint": self.fingerprint,
+            "files": self.entries,
+        }
+        atomic_write(self.directory / "manifest.json", json.dumps(data, indent=1))
+        live = {entry["output"] for entry in self.entries.values()}
+        for path in (self.directory / "objects").glob(f"*/*{SUFFIX}"):
+            if path.stem not in live:
+                path.unlink(missing_ok=True)
@@ -0,0 +1,90 @@
+"""Byte-level pre-scan that tells which converters a file can need.
+
+Every conversion is triggered by an ASCII marker (three backticks for fences,
+``[`` for links, ``|`` for tables, ``#`` for headings and a backtick for
+inline code).  ASCII bytes never occur inside multi-byte UTF-8 sequences, so
+searching the raw bytes is enough to rule a converter out without decoding
+the file, and a file with no marker at all can be skipped outright.
+"""
+
+from __future__ import annotations
+
+import enum
+import mmap
+from pathlib import Path
+
+from sphinx_rustdoc_postprocess._symbols import declared
+
+
+class Converters(enum.IntFlag):
+    """The built-in conversions, as bits of a per-file mask."""
+
+    FENCES = enum.auto()
+    LINKS = enum.auto()
+    TABLES = enum.auto()
+    HEADINGS = enum.auto()
+    INLINE_CODE = enum.auto()
+
+
+ALL = (
+    Converters.FENCES
+    | Converters.LINKS
+    | Converters.TABLES
+    | Converters.HEADINGS
+    | Converters.INLINE_CODE
+)
+
+_MARKERS = (
+    (Converters.LINKS, b"["),
+    (Converters.TABLES, b"|"),
+    (Converters.HEADINGS, b"#"),
+    (Converters.INLINE_CODE, b"`"),
+)
+
+
+def needed(data: bytes | mmap.mmap) -> Converters:
+    """Return the converters that may change *data*.
+
+    Parameters
+    ----------
+    data : bytes or mmap
+        The UTF-8 encoded file content.
+
+    Returns
+    -------
+    Converters
+        The converters whose marker occurs in *data*, plus those that act on
+        the markup another one emits: converted links contain backticks, and
+        rendered tables may contain anything.
+    """
+    found = Converters(0)
+    for flag, marker in _MARKERS:
+        if data.find(marker) != -1:
+            found |= flag
+    if found & Converters.INLINE_CODE and data.find(b"```") != -1:
+        found |= Converters.FENCES
+    if found & Converters.LINKS:
+        found |= Converters.INLINE_CODE
+    if found & Converters.TABLES:
+        found |= Converters.HEADINGS | Converters.INLINE_CODE
+    return found
+
+
+def needed_file(path: Path, items: list[tuple[str, str]] | None = None) -> Converters:
+    """Return :func:`needed` for the file at *path* without decoding it.
+
+    Files that cannot be read report every converter, leaving the error to
+    the conversion pass.  If *items* is given, the Rust items the file
+    declares (see :func:`sphinx_rustdoc_postprocess._symbols.declared`) are
+    appended to it from the same read.
+    """
+    try:
+        with open(path, "rb") as fh:
+            if not fh.seek(0, 2):
+                return Converters(0)
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if items is not None:
+                    items.extend(declared(data))
+                return needed(data)
+    except OSError:
+        return ALL
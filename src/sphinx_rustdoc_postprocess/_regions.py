@@ -0,0 +1,125 @@
+"""Block structure of RST content: the lines the converters must leave alone.
+
+The markdown conversions only make sense in prose.  The body of a literal
+directive (``.. code-block::`` and the like, including the ones made from
+markdown fences) and of a literal block introduced by a line ending in
+``::`` is code, where ``# comment`` is no heading and backticks are no
+inline code.  Directive and field lines (starting with ``..`` or ``:``) are
+RST markup.
+
+:class:`RegionTracker` classifies lines in one forward pass, a line at a
+time, so the fused engine can classify lines as they stream by.  A body ends
+at the first non-blank line indented no deeper than the line that opened it.
+:func:`runs` splits whole content into runs of protected and other lines, for
+the reference converters to apply their patterns to the others only.
+"""
+
+from __future__ import annotations
+
+import re
+
+#: A prose line: every converter applies.
+PROSE = 0
+#: A directive or field line, which no converter changes.
+MARKUP = 1
+#: A line of a literal body, which no converter changes or reads.
+PROTECTED = 2
+
+# Directives whose body is literal text.
+_LITERAL_DIRECTIVES = frozenset(
+    {"code-block", "code", "sourcecode", "raw", "math", "doctest", "testcode"}
+)
+
+# The name of a directive, at the start of a line without its indentation.
+_DIRECTIVE_RE = re.compile(r"\.\. ([\w.:+-]+?)::(?:[ ]|$)")
+
+# A markdown heading, which the headings converter turns into a line that no
+# longer ends in "::", so it never introduces a literal block.
+_HEADING_LINE_RE = re.compile(r"[ ]+#{1,6}[ ]+.+")
+
+
+def directive_name(text: str) -> str | None:
+    """Return the name of the directive opened by *text*, or None.
+
+    *text* is a line without its indentation.
+    """
+    m = _DIRECTIVE_RE.match(text)
+    return None if m is None else m.group(1)
+
+
+class RegionTracker:
+    """Classify the lines of one document in order.
+
+    Converters never change what this depends on, so the lines classified
+    before and after a conversion agree, except for the bodies made from
+    markdown fences, which are protected once they exist.
+    """
+
+    def __init__(self) -> None:
+        # Indentation of the line opening the current literal body, or -1.
+        self._body = -1
+        # Indentation of a line ending in "::" whose literal block may
+        # follow, or -1; _blank is set once the required blank line is seen.
+        self._marker = -1
+        self._blank = False
+
+    def classify(self, line: str) -> int:
+        """Return :data:`PROSE`, :data:`MARKUP` or :data:`PROTECTED` for *line*."""
+        content = line.lstrip()
+        if not content:
+            if self._body >= 0:
+                return PROTECTED
+            if self._marker >= 0:
+                self._blank = True
+            return PROSE
+        indent = len(line) - len(content)
+        if self._body >= 0:
+            if indent > self._body:
+                return PROTECTED
+            self._body = -1
+        if self._marker >= 0:
+            opens = self._blank and indent > self._marker
+            if opens:
+                self._body = self._marker
+            self._marker = -1
+            self._blank = False
+            if opens:
+                return PROTECTED
+        first = content[0]
+        if first == "." and content.startswith(".."):
+            m = _DIRECTIVE_RE.match(content)
+            if m is not None and m.group(1) in _LITERAL_DIRECTIVES:
+                self._body = indent
+            return MARKUP
+        if content.rstrip().endswith("::") and (
+            first != "#" or _HEADING_LINE_RE.fullmatch(line) is None
+        ):
+            self._marker = indent
+        return MARKUP if first == ":" else PROSE
+
+
+def runs(content: str) -> list[tuple[bool, str]]:
+    """Split *content* into maximal runs of protected and other lines.
+
+    Returns
+    -------
+    list of tuple
+        ``(protected, text)`` pairs whose texts, joined, give *content*; each
+        but the last ends with the newline after its last line.
+    """
+    if "::" not in content:
+        # Every literal body is opened by a line containing "::".
+        return [(False, content)]
+    tracker = RegionTracker()
+    result: list[tuple[bool, str]] = []
+    lines: list[str] = []
+    protected = False
+    for line in content.split("\n"):
+        flag = tracker.classify(line) == PROTECTED
+        if flag != protected and lines:
+            result.append((protected, "\n".join(lines) + "\n"))
+            lines = []
+        protected = flag
+        lines.append(line)
+    result.append((protected, "\n".join(lines)))
+    return result
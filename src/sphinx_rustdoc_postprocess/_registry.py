@@ -0,0 +1,78 @@
+"""Converter plug-ins registered through entry points.
+
+Besides the five built-in conversions, any installed distribution can
+provide a converter by declaring an entry point in the
+``sphinx_rustdoc_postprocess.converters`` group that names a
+:class:`Converter`::
+
+    [project.entry-points."sphinx_rustdoc_postprocess.converters"]
+    admonitions = "my_package.rustdoc:ADMONITIONS"
+
+Converters only run when listed in ``rustdoc_postprocess_converters``.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+
+from sphinx_rustdoc_postprocess import _logging as logging
+from sphinx_rustdoc_postprocess._prescan import Converters
+
+ENTRY_POINT_GROUP = "sphinx_rustdoc_postprocess.converters"
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Converter:
+    """A markdown-to-RST conversion applied to whole files.
+
+    Attributes
+    ----------
+    name : str
+        The name listed in ``rustdoc_postprocess_converters``.
+    convert : callable
+        Takes the content of a file and returns it converted.
+    may_match : callable
+        Takes the content of a file and returns False when *convert* would
+        certainly leave it unchanged, e.g. because a marker character is
+        missing.  It must be much cheaper than *convert*.
+    flag : Converters or None
+        The pre-scan flag of a built-in converter; None for plug-ins.
+    """
+
+    name: str
+    convert: Callable[[str], str]
+    may_match: Callable[[str], bool]
+    flag: Converters | None = None
+
+
+@functools.cache
+def plugins() -> dict[str, Converter]:
+    """Load the converters registered under :data:`ENTRY_POINT_GROUP`.
+
+    Entry points that fail to load or do not name a :class:`Converter` are
+    reported and skipped.
+    """
+    found: dict[str, Converter] = {}
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            converter = entry_point.load()
+        except Exception as exc:
+            _log.warning(
+                "[rustdoc_postprocess] Cannot load converter %s: %s",
+                entry_point.name,
+                exc,
+            )
+            continue
+        if not isinstance(converter, Converter):
+            _log.warning(
+                "[rustdoc_postprocess] Entry point %s is not a Converter",
+                entry_point.name,
+            )
+            continue
+        found[converter.name] = converter
+    return found
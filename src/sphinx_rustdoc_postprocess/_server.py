@@ -0,0 +1,222 @@
+"""Resident pandoc backend reached over pooled HTTP connections.
+
+``pandoc server`` (or the standalone ``pandoc-server`` binary) converts
+documents posted to it as JSON, so a single long-lived process can replace a
+``pandoc`` subprocess per conversion.  :class:`PandocServer` starts such a
+process on a free local port, keeps a small pool of keep-alive connections to
+it, checks its health and restarts it when it stops answering.
+"""
+
+from __future__ import annotations
+
+import atexit
+import http.client
+import json
+import os
+import queue
+import socket
+import subprocess
+import time
+import weakref
+from collections.abc import Sequence
+
+_HEALTH_TIMEOUT = 2
+_POLL_INTERVAL = 0.05
+
+_servers: weakref.WeakSet[PandocServer] = weakref.WeakSet()
+
+
+class PandocServerError(RuntimeError):
+    """The pandoc server could not be started or did not answer."""
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class PandocServer:
+    """A ``pandoc server`` process and a pool of connections to it.
+
+    Parameters
+    ----------
+    command : sequence of str
+        Command starting the server; ``--port <port>`` is appended.
+    options : dict
+        Conversion options sent with every request, e.g. ``{"from":
+        "markdown-smart", "to": "rst", "wrap": "none"}``.
+    timeout : float
+        Timeout in seconds of a single request.
+    startup_timeout : float
+        How long :meth:`start` waits for the server to answer.
+    pool_size : int
+        Number of idle connections kept open.
+    host : str
+        Interface the server listens on.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        options: dict[str, str],
+        timeout: float = 120,
+        startup_timeout: float = 5,
+        pool_size: int = 4,
+        host: str = "127.0.0.1",
+    ):
+        self.command = list(command)
+        self.options = options
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.host = host
+        self.port = 0
+        self.restarts = 0
+        self._process: subprocess.Popen | None = None
+        self._owner = os.getpid()
+        self._pool: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue(
+            pool_size
+        )
+        _servers.add(self)
+
+    def start(self) -> None:
+        """Start the server and wait until it answers health checks.
+
+        Raises
+        ------
+        PandocServerError
+            If the server exits or does not become healthy in time.
+        """
+        self.port = _free_port(self.host)
+        try:
+            self._process = subprocess.Popen(
+                [*self.command, "--port", str(self.port)],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as exc:
+            raise PandocServerError(f"cannot start {self.command[0]}: {exc}") from exc
+        atexit.register(self.stop)
+        deadline = time.monotonic() + self.startup_timeout
+        while not self.healthy():
+            if self._process.poll() is not None or time.monotonic() > deadline:
+                self.stop()
+                raise PandocServerError(
+                    f"{' '.join(self.command)} did not become healthy"
+                )
+            time.sleep(_POLL_INTERVAL)
+
+    def stop(self) -> None:
+        """Close pooled connections and terminate the server process."""
+        self._drain()
+        process, self._process = self._process, None
+        if process is None or os.getpid() != self._owner:
+            return
+        atexit.unregister(self.stop)
+        process.terminate()
+        try:
+            process.wait(timeout=_HEALTH_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def restart(self) -> None:
+        """Replace the server process with a fresh one."""
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    @property
+    def running(self) -> bool:
+        """Whether the server process is alive."""
+        return self._process is not None and self._process.poll() is None
+
+    def healthy(self) -> bool:
+        """Return True if the server answers ``GET /version``."""
+        if not self.running:
+            return False
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=_HEALTH_TIMEOUT)
+        try:
+            conn.request("GET", "/version")
+            return conn.getresponse().status == 200
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            conn.close()
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _request(self, path: str, payload: object) -> object:
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        error: Exception | None = None
+        for attempt in range(2):
+            if attempt and not self.healthy():
+                self.restart()
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = http.client.HTTPConnection(
+                    self.host, self.port, timeout=self.timeout
+                )
+            try:
+                conn.request("POST", path, body, headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException) as exc:
+                # Other idle connections are likely just as stale.
+                conn.close()
+                self._drain()
+                error = exc
+                continue
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+            if response.status != 200:
+                raise PandocServerError(
+                    f"HTTP {response.status}: {data[:200].decode('utf-8', 'replace')}"
+                )
+            try:
+                return json.loads(data)
+            except ValueError as exc:
+                raise PandocServerError(f"malformed response: {exc}") from exc
+        raise PandocServerError(f"pandoc server did not answer: {error}")
+
+    def convert(self, text: str) -> str:
+        """Convert one document with the configured options."""
+        return _output(self._request("/", {"text": text, **self.options}))
+
+    def convert_many(self, texts: Sequence[str]) -> list[str]:
+        """Convert several documents, each on its own, in one request."""
+        payload = [{"text": text, **self.options} for text in texts]
+        results = self._request("/batch", payload)
+        if not isinstance(results, list) or len(results) != len(texts):
+            raise PandocServerError("malformed batch response")
+        return [_output(result) for result in results]
+
+
+def _output(result: object) -> str:
+    """Extract the text of one conversion result, ending in a newline like the CLI."""
+    if isinstance(result, dict):
+        if result.get("error"):
+            raise PandocServerError(str(result["error"]))
+        result = result.get("output")
+    if not isinstance(result, str):
+        raise PandocServerError("malformed response")
+    return result if not result or result.endswith("\n") else result + "\n"
+
+
+def _after_fork() -> None:
+    # Connections belong to the parent; children open their own.
+    for server in list(_servers):
+        server._pool = queue.LifoQueue(server._pool.maxsize)
+
+
+os.register_at_fork(after_in_child=_after_fork)
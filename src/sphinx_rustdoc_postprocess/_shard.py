@@ -0,0 +1,122 @@
+"""Deterministic split of the generated files into shards.
+
+Several machines can post-process one tree by each converting a shard of it.
+:func:`assign` packs the files into shards of about the same number of bytes:
+largest first, each into the shard with the fewest bytes so far, with ties
+between files of the same size ordered by a hash of their name.  The result
+depends only on the names and sizes of the files, so every machine computes
+the same split of the same tree without coordinating.
+
+Each shard run leaves a fragment in its state directory: the manifest of the
+files it converted, or one per crate of a workspace, and the stats of the
+run.  :func:`merge` combines the
+fragments into one state directory, from which a final run over the whole
+tree restores every converted file without converting it again.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+from sphinx_rustdoc_postprocess._manifest import Manifest, content_hash
+from sphinx_rustdoc_postprocess._stats import Stats
+
+#: Name of the stats fragment in a shard's state directory.
+STATS_NAME = "shard-stats.json"
+
+# Bytes a file weighs on top of its size, for the work done per file however
+# small it is, so that empty files do not all land in one shard.
+_FILE_COST = 4096
+
+
+def parse(value: str) -> tuple[int, int]:
+    """Parse ``"i/n"``, the *i*-th of *n* shards counting from 1.
+
+    Returns
+    -------
+    tuple of int
+        The shard's index counting from 0, and the number of shards.
+
+    Raises
+    ------
+    ValueError
+        If *value* is not of that form with ``1 <= i <= n``.
+    """
+    index, sep, count = value.partition("/")
+    try:
+        i, n = int(index), int(count)
+    except ValueError:
+        i = n = 0
+    if not sep or not 1 <= i <= n:
+        raise ValueError(f"not a shard i/n with 1 <= i <= n: {value!r}")
+    return i - 1, n
+
+
+def assign(sizes: Mapping[str, int], count: int) -> dict[str, int]:
+    """Return the shard, from 0 to *count* - 1, of each file in *sizes*.
+
+    Parameters
+    ----------
+    sizes : mapping
+        Maps the name of each file, e.g. its POSIX path relative to the
+        directory being split, to its size in bytes.
+    count : int
+        The number of shards.
+    """
+    order = sorted(sizes, key=lambda name: (-sizes[name], content_hash(name)))
+    loads = [(0, shard) for shard in range(count)]
+    shards = {}
+    for name in order:
+        load, shard = heapq.heappop(loads)
+        shards[name] = shard
+        heapq.heappush(loads, (load + sizes[name] + _FILE_COST, shard))
+    return shards
+
+
+def merge(fragments: Iterable[Path], target: Path) -> Stats:
+    """Combine the state directories of shard runs into *target*.
+
+    Parameters
+    ----------
+    fragments : iterable of Path
+        The state directories the shards were converted with.
+    target : Path
+        The state directory receiving the merged manifest; a manifest it
+        already holds is replaced.
+
+    Returns
+    -------
+    Stats
+        The counters of all shard runs together.
+
+    Raises
+    ------
+    ValueError
+        If a fragment has no manifest, or the shards were converted with
+        different configs.
+    """
+    merged: dict[Path, Manifest] = {}
+    stats = Stats()
+    for fragment in fragments:
+        dirs = [fragment / "manifest", *sorted(fragment.glob("crates/*/manifest"))]
+        found = False
+        for directory in dirs:
+            manifest = Manifest.load(directory)
+            if manifest.fingerprint is None:
+                continue
+            found = True
+            name = directory.relative_to(fragment)
+            if name not in merged:
+                merged[name] = Manifest(target / name, manifest.fingerprint)
+            merged[name].merge(manifest)
+        if not found:
+            raise ValueError(f"no manifest in {fragment}")
+        try:
+            stats.merge(Stats.load(fragment / STATS_NAME))
+        except FileNotFoundError:
+            pass
+    for manifest in merged.values():
+        manifest.save()
+    return stats
@@ -0,0 +1,254 @@
+"""Counters and timings of one post-processing run.
+
+:class:`Stats` records, for each converter, how often it matched, how many
+bytes it replaced and produced and the time spent in it; the latency of every
+pandoc call; how many files were skipped, reused or rewritten; how many bytes
+sharing repeated directive bodies saved; and the wall time of each phase of
+the run and of each crate of a workspace.  Worker
+processes fill in their own instance, which the parent folds in with
+:meth:`Stats.merge`.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from sphinx_rustdoc_postprocess._prescan import Converters
+
+#: Converter names, in the order the summary lists them.
+CONVERTERS = tuple(flag.name.lower() for flag in Converters)
+
+#: File outcomes, in the order the summary lists them.
+FILE_COUNTERS = (
+    "found",
+    "skipped",
+    "reused",
+    "rewritten",
+    "unchanged",
+    "failed",
+    "streamed",
+    "deduplicated",
+)
+
+#: Counters of the bodies shared by includes, in the order the summary lists
+#: them.
+DEDUP_COUNTERS = ("snippets", "includes", "bytes_saved")
+
+
+def utf8_size(text: str) -> int:
+    """Return the UTF-8 size of *text* without encoding it when it is ASCII."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+@dataclass
+class ConverterStats:
+    """What one converter did.
+
+    Attributes
+    ----------
+    matches : int
+        Constructs converted (links, headings, ... or whole fences and tables).
+    bytes_in : int
+        UTF-8 size of the lines or blocks it replaced.
+    bytes_out : int
+        UTF-8 size of what it replaced them with.
+    seconds : float
+        Time spent converting, summed over workers.  The shared line walk is
+        accounted to the ``scan`` phase instead.
+    """
+
+    matches: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    seconds: float = 0.0
+
+    def record(self, before: str, after: str, matches: int = 1) -> None:
+        """Count *matches* conversions of *before* into *after*."""
+        self.matches += matches
+        self.bytes_in += utf8_size(before)
+        self.bytes_out += utf8_size(after)
+
+    def merge(self, other: ConverterStats) -> None:
+        self.matches += other.matches
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+        self.seconds += other.seconds
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a sorted, non-empty list."""
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Stats:
+    """Mergeable counters of a post-processing run.
+
+    Attributes
+    ----------
+    converters : dict
+        Maps each name in :data:`CONVERTERS`, and each plug-in converter that
+        ran, to its :class:`ConverterStats`.
+    files : dict
+        Maps each name in :data:`FILE_COUNTERS` to a number of files.
+    bytes_in, bytes_out : int
+        UTF-8 size of the converted files before and after conversion.
+    dedup : dict
+        Maps each name in :data:`DEDUP_COUNTERS` to the number of snippets
+        shared bodies were written to, of includes of them, and of bytes
+        saved, snippets included.
+    phases : dict
+        Wall time in seconds of each phase, in the order they ran.
+    crates : dict
+        Wall time in seconds of converting each crate of a workspace.
+    pandoc : list of float
+        Latency in seconds of every pandoc process or server request.
+    """
+
+    def __init__(self) -> None:
+        self.converters = {name: ConverterStats() for name in CONVERTERS}
+        self.files = dict.fromkeys(FILE_COUNTERS, 0)
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.dedup = dict.fromkeys(DEDUP_COUNTERS, 0)
+        self.phases: dict[str, float] = {}
+        self.crates: dict[str, float] = {}
+        self.pandoc: list[float] = []
+
+    def merge(self, other: Stats) -> None:
+        """Add the counters of *other*, e.g. from a worker process, to these."""
+        for name, converter in other.converters.items():
+            self.converters.setdefault(name, ConverterStats()).merge(converter)
+        for name, count in other.files.items():
+            self.files[name] += count
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+        for name, count in other.dedup.items():
+            self.dedup[name] += count
+        for name, seconds in other.phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+        for name, seconds in other.crates.items():
+            self.crates[name] = self.crates.get(name, 0.0) + seconds
+        self.pandoc.extend(other.pandoc)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the ``with`` block to phase *name*."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def crate(self, name: str) -> Iterator[None]:
+        """Add the wall time of the ``with`` block to crate *name*."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.crates[name] = self.crates.get(name, 0.0) + seconds
+
+    def pandoc_summary(self) -> dict[str, float]:
+        """Return the count, total and distribution of pandoc latencies."""
+        if not self.pandoc:
+            return {"calls": 0}
+        ordered = sorted(self.pandoc)
+        return {
+            "calls": len(ordered),
+            "total": sum(ordered),
+            "mean": sum(ordered) / len(ordered),
+            "p50": _percentile(ordered, 0.5),
+            "p90": _percentile(ordered, 0.9),
+            "p99": _percentile(ordered, 0.99),
+            "max": ordered[-1],
+        }
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the counters as JSON-serialisable data."""
+        return {
+            "files": dict(self.files),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "dedup": dict(self.dedup),
+            "phases": dict(self.phases),
+            "crates": dict(self.crates),
+            "converters": {
+                name: asdict(converter) for name, converter in self.converters.items()
+            },
+            "pandoc": self.pandoc_summary(),
+        }
+
+    def write(self, path: Path, latencies: bool = False) -> None:
+        """Write :meth:`as_dict` to *path* as JSON.
+
+        With *latencies* every pandoc latency is listed too, so that
+        :meth:`load` gets back counters that merge exactly.
+        """
+        data = self.as_dict()
+        if latencies:
+            data["latencies"] = self.pandoc
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> Stats:
+        """Read the counters :meth:`write` wrote to *path*."""
+        data = json.loads(path.read_text(encoding="utf-8"))
+        stats = cls()
+        for name, converter in data["converters"].items():
+            stats.converters[name] = ConverterStats(**converter)
+        stats.files.update(data["files"])
+        stats.bytes_in = data["bytes_in"]
+        stats.bytes_out = data["bytes_out"]
+        stats.dedup.update(data.get("dedup", {}))
+        stats.phases = dict(data["phases"])
+        stats.crates = dict(data.get("crates", {}))
+        stats.pandoc = list(data.get("latencies", []))
+        return stats
+
+    def summary(self) -> list[str]:
+        """Return the lines of a human-readable summary table."""
+        lines = [
+            f"{'converter':<12} {'matches':>8} {'bytes in':>10} "
+            f"{'bytes out':>10} {'time':>9}"
+        ]
+        for name, converter in self.converters.items():
+            lines.append(
+                f"{name:<12} {converter.matches:>8} {converter.bytes_in:>10} "
+                f"{converter.bytes_out:>10} {converter.seconds:>8.3f}s"
+            )
+        pandoc = self.pandoc_summary()
+        if pandoc["calls"]:
+            lines.append(
+                f"pandoc: {pandoc['calls']} calls, {pandoc['total']:.3f}s total, "
+                f"p50 {1000 * pandoc['p50']:.1f}ms, p90 {1000 * pandoc['p90']:.1f}ms, "
+                f"max {1000 * pandoc['max']:.1f}ms"
+            )
+        lines.append(
+            "files: " + ", ".join(f"{name} {n}" for name, n in self.files.items())
+        )
+        if self.dedup["includes"]:
+            lines.append(
+                f"dedup: {self.dedup['includes']} includes of "
+                f"{self.dedup['snippets']} snippets, "
+                f"{self.dedup['bytes_saved']} bytes saved"
+            )
+        if self.phases:
+            lines.append(
+                "phases: "
+                + ", ".join(f"{name} {s:.3f}s" for name, s in self.phases.items())
+            )
+        if self.crates:
+            slowest = sorted(self.crates.items(), key=lambda item: -item[1])
+            lines.append(
+                "crates: " + ", ".join(f"{name} {s:.3f}s" for name, s in slowest)
+            )
+        return lines
@@ -0,0 +1,173 @@
+"""Index of the Rust items declared in the generated files.
+
+sphinxcontrib-rust declares every item with a directive naming its full path,
+e.g. ``.. rust:struct:: mycrate::module::Item``.  :func:`declared` finds these
+in the raw bytes during the pre-scan, and :class:`SymbolIndex` maps every
+path suffix of an item (``Item``, ``module::Item``, ``mycrate::module::Item``)
+to it, so a rustdoc intra-doc link such as ``[`Item`]`` resolves to a
+cross-reference with one dictionary lookup.  A suffix shared by several items
+resolves to nothing, and the link keeps its literal form.
+
+The index lists the items of each file separately, so a build only needs to
+re-read the files that changed; it is saved with the incremental state.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import re
+from collections.abc import Collection
+from pathlib import Path
+
+from sphinx_rustdoc_postprocess._manifest import atomic_write, content_hash
+
+_FORMAT = 1
+
+# A directive declaring an item by its path.  Other directive arguments, such
+# as the signatures of impl blocks, are not linkable paths.
+_DIRECTIVE_RE = re.compile(
+    rb"^[ ]*\.\. rust:(?P<type>\w+):: (?P<path>\w+(?:::\w+)*)[ ]*$", re.MULTILINE
+)
+
+# Item types that cannot be the target of a link: impl blocks have no path of
+# their own, and re-exports would need to be followed.
+_UNLINKABLE = frozenset({"impl", "use"})
+
+# rustdoc's disambiguator prefixes (``struct@Item``) and the directive type of
+# the items they select, as sphinxcontrib-rust maps them.
+_DISAMBIGUATORS = {
+    "struct": "struct",
+    "union": "struct",
+    "variant": "struct",
+    "enum": "enum",
+    "trait": "trait",
+    "mod": "module",
+    "module": "module",
+    "const": "variable",
+    "constant": "variable",
+    "static": "variable",
+    "field": "variable",
+    "value": "variable",
+    "fn": "function",
+    "function": "function",
+    "method": "function",
+    "macro": "macro",
+    "derive": "macro",
+    "type": "type",
+    "prim": "type",
+    "primitive": "type",
+}
+
+
+def declared(data: bytes | mmap.mmap) -> list[tuple[str, str]]:
+    """Return the ``(path, type)`` of each linkable item declared in *data*."""
+    if data.find(b".. rust:") == -1:
+        return []
+    items = []
+    for m in _DIRECTIVE_RE.finditer(data):
+        type_ = m.group("type").decode("ascii")
+        if type_ not in _UNLINKABLE:
+            items.append((m.group("path").decode("ascii"), type_))
+    return items
+
+
+class SymbolIndex:
+    """The linkable items of every generated file.
+
+    Parameters
+    ----------
+    path : Path or None
+        The JSON file the index is saved to, or None to keep it in memory.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.files: dict[str, list[tuple[str, str]]] = {}
+        self._targets: dict[str, tuple[tuple[str, str], ...]] | None = None
+        self._digest: str | None = None
+
+    @classmethod
+    def load(cls, path: Path) -> SymbolIndex:
+        """Read the index saved at *path*, or start an empty one."""
+        index = cls(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return index
+        if data.get("format") == _FORMAT:
+            index.files = {
+                name: [tuple(item) for item in items]
+                for name, items in data.get("files", {}).items()
+            }
+        return index
+
+    def save(self) -> None:
+        """Write the index to its path, if it has one."""
+        if self.path is not None:
+            data = {"format": _FORMAT, "files": self.files}
+            atomic_write(self.path, json.dumps(data, indent=1))
+
+    def update(self, name: str, items: list[tuple[str, str]]) -> None:
+        """Set the items declared by file *name*, as found by :func:`declared`."""
+        if self.files.get(name, []) == items:
+            return
+        if items:
+            self.files[name] = items
+        else:
+            del self.files[name]
+        self._targets = self._digest = None
+
+    def retain(self, names: Collection[str]) -> None:
+        """Forget the files not in *names*, e.g. because they were deleted."""
+        gone = [name for name in self.files if name not in names]
+        for name in gone:
+            del self.files[name]
+        if gone:
+            self._targets = self._digest = None
+
+    def digest(self) -> str:
+        """Return a hash of the items, which changes whenever a link may."""
+        if self._digest is None:
+            items = sorted({item for items in self.files.values() for item in items})
+            self._digest = content_hash(json.dumps(items))
+        return self._digest
+
+    def _table(self) -> dict[str, tuple[tuple[str, str], ...]]:
+        if self._targets is None:
+            targets: dict[str, set[tuple[str, str]]] = {}
+            for items in self.files.values():
+                for path, type_ in items:
+                    parts = path.split("::")
+                    for i in range(len(parts)):
+                        suffix = "::".join(parts[i:])
+                        targets.setdefault(suffix, set()).add((type_, path))
+            self._targets = {
+                suffix: tuple(sorted(found)) for suffix, found in targets.items()
+            }
+        return self._targets
+
+    def resolve(self, name: str) -> tuple[str, str] | None:
+        """Return the ``(type, path)`` an intra-doc link to *name* points to.
+
+        Disambiguators (``fn@name``, ``name()``, ``name!``), generic arguments
+        and leading ``crate::``, ``self::`` and ``super::`` segments are
+        understood.  Returns None unless exactly one item matches.
+        """
+        kind = None
+        if "@" in name:
+            prefix, _, name = name.partition("@")
+            kind = _DISAMBIGUATORS.get(prefix)
+            if kind is None:
+                return None
+        if name.endswith("!"):
+            name, kind = name[:-1], "macro"
+        elif name.endswith("()"):
+            name, kind = name[:-2], "function"
+        name = name.split("<", 1)[0].strip()
+        while name.startswith(("crate::", "self::", "super::")):
+            name = name.partition("::")[2]
+        found = self._table().get(name, ())
+        if kind is not None:
+            found = tuple(item for item in found if item[0] == kind)
+        return found[0] if len(found) == 1 else None
@@ -0,0 +1,267 @@
+"""Pure-Python renderer for markdown pipe tables.
+
+Reproduces what ``pandoc -f markdown-smart -t rst --wrap=none`` emits for
+pipe tables whose cells contain plain text, backslash escapes and code spans:
+a simple table when the layout fits in pandoc's default 72 columns, and a grid
+table otherwise.  Cells using any other inline markdown (emphasis, links,
+raw HTML, math, ...) are outside that subset; :func:`render_table` reports
+them so callers can defer to pandoc, or renders them on a best-effort basis.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+
+# pandoc's default --columns, which drives the table layout decisions.
+_COLUMNS = 72
+
+# Characters the RST writer backslash-escapes at either end of a word.
+_RST_SPECIAL = "\\`*_|"
+
+# Characters that may touch inline markup without a "\ " separator, mirroring
+# pandoc's okBeforeComplex / okAfterComplex.
+_OK_BEFORE = "-:/'\"<([{–—"
+_OK_AFTER = "-.,:;!?\\/'\")]}>–—"
+
+_ASCII_PUNCT = "!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"
+
+# Plain-text characters that pandoc's markdown reader passes through as-is.
+_PLAIN_RE = re.compile(r"[A-Za-z0-9 .,;:!?()/+=%'\"#\[\]-]")
+
+_SEPARATOR_CELL_RE = re.compile(r":?-+:?")
+
+
+def _is_plain(ch: str) -> bool:
+    if _PLAIN_RE.fullmatch(ch):
+        return True
+    return (
+        ord(ch) > 127
+        and unicodedata.category(ch)[0] in "LN"
+        and unicodedata.east_asian_width(ch) in ("N", "Na", "H")
+    )
+
+
+def _split_row(line: str) -> list[str] | None:
+    """Split a ``| a | b |`` row on unescaped pipes outside code spans."""
+    line = line.strip()
+    if not (line.startswith("|") and line.endswith("|")) or len(line) < 2:
+        return None
+    body = line[1:-1]
+    cells, start, i = [], 0, 0
+    while i < len(body):
+        ch = body[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "`":
+            run = len(body[i:]) - len(body[i:].lstrip("`"))
+            close = body.find("`" * run, i + run)
+            while close != -1 and body[close + run : close + run + 1] == "`":
+                close = body.find("`" * run, close + run + 1)
+            i = i + run if close == -1 else close + run
+            continue
+        if ch == "|":
+            cells.append(body[start:i])
+            start = i + 1
+        i += 1
+    cells.append(body[start:])
+    return [cell.strip() for cell in cells]
+
+
+def _inlines(cell: str) -> tuple[list[tuple[str, str]], bool]:
+    """Tokenise a cell into ``("str" | "code" | "space", text)`` inlines.
+
+    Returns the inlines and whether every construct is in the exact subset.
+    """
+    inlines: list[tuple[str, str]] = []
+    exact = True
+    word: list[str] = []
+
+    def _flush() -> None:
+        if word:
+            inlines.append(("str", "".join(word)))
+            word.clear()
+
+    i = 0
+    while i < len(cell):
+        ch = cell[i]
+        if ch == " ":
+            _flush()
+            if inlines and inlines[-1][0] != "space":
+                inlines.append(("space", " "))
+            i += 1
+        elif ch == "\\":
+            nxt = cell[i + 1 : i + 2]
+            if nxt and nxt in _ASCII_PUNCT:
+                word.append(nxt)
+                i += 2
+            else:
+                exact = False
+                word.append(ch)
+                i += 1
+        elif ch == "`":
+            run = len(cell[i:]) - len(cell[i:].lstrip("`"))
+            close = cell.find("`" * run, i + run)
+            if close == -1 or cell[close + run : close + run + 1] == "`":
+                exact = False
+                word.append(cell[i : i + run])
+                i += run
+                continue
+            code = cell[i + run : close]
+            # pandoc sizes columns holding code with pipes differently.
+            if not code.strip() or code != code.strip() or "|" in code:
+                exact = False
+            _flush()
+            inlines.append(("code", code.strip()))
+            i = close + run
+        elif ch == "_" and word and cell[i + 1 : i + 2].isalnum():
+            word.append(ch)
+            i += 1
+        else:
+            if (
+                not _is_plain(ch)
+                or cell.startswith("](", i)
+                or (ch == "!" and cell[i + 1 : i + 2] == "[")
+            ):
+                exact = False
+            word.append(ch)
+            i += 1
+    _flush()
+    if inlines and inlines[-1][0] == "space":
+        inlines.pop()
+    return inlines, exact
+
+
+def _escape(text: str) -> str:
+    out = []
+    for i, ch in enumerate(text):
+        if ch in _RST_SPECIAL and (i == 0 or i == len(text) - 1):
+            out.append("\\")
+        out.append(ch)
+    return "".join(out)
+
+
+def _render_cell(cell: str) -> tuple[str, bool]:
+    """Render one cell to RST, returning the text and whether it is exact."""
+    inlines, exact = _inlines(cell)
+    out = []
+    for i, (kind, text) in enumerate(inlines):
+        if kind == "code":
+            if "`" in text:
+                exact = False
+            prev = inlines[i - 1] if i else None
+            if prev and prev[0] == "str" and prev[1][-1] not in _OK_BEFORE:
+                out.append("\\ ")
+            out.append(f"``{text}``")
+            nxt = inlines[i + 1] if i + 1 < len(inlines) else None
+            if nxt and nxt[0] == "str" and nxt[1][0] not in _OK_AFTER:
+                out.append("\\ ")
+        elif kind == "str":
+            # Best-effort cells keep their markup for docutils to interpret.
+            out.append(_escape(text) if exact else text)
+        else:
+            out.append(text)
+    return "".join(out), exact
+
+
+def _simple(header: list[str] | None, rows: list[list[str]]) -> str | None:
+    # An empty first cell right below a rule would end the table, so pandoc
+    # fills it with an escaped space.
+    body = [[rows[0][0] or "\\ ", *rows[0][1:]], *rows[1:]]
+    head = [header[0] or "\\ ", *header[1:]] if header else None
+    every = ([head] if head else []) + body
+    widths = [max(len(row[c]) for row in every) for c in range(len(every[0]))]
+    if sum(widths) + len(widths) - 1 > _COLUMNS:
+        return None
+    hline = " ".join("=" * w for w in widths if w)
+
+    def _row(cells: list[str]) -> str:
+        # Only the last cell goes unpadded; separators stay even when it is
+        # empty, as in pandoc's output.
+        padded = [c.ljust(w) for c, w in zip(cells[:-1], widths)]
+        return " ".join([*padded, cells[-1]])
+
+    lines = [hline, _row(head)] if head else []
+    lines += [hline, *(_row(row) for row in body), hline]
+    return "\n".join(lines) + "\n"
+
+
+def _grid(header: list[str] | None, rows: list[list[str]], widths: list[float]) -> str:
+    every = ([header] if header else []) + rows
+    official = [max(1, math.floor(_COLUMNS * w) - 3) for w in widths]
+    chars = [
+        max(official[c], *(len(row[c]) for row in every)) for c in range(len(widths))
+    ]
+
+    def _rule(fill: str) -> str:
+        return "+" + "+".join(fill * (w + 2) for w in chars) + "+"
+
+    def _row(cells: list[str]) -> str:
+        return "| " + " | ".join(c.ljust(w) for c, w in zip(cells, chars)) + " |"
+
+    lines = [_rule("-")]
+    if header:
+        lines += [_row(header), _rule("=")]
+    for row in rows:
+        lines += [_row(row), _rule("-")]
+    return "\n".join(lines) + "\n"
+
+
+def render_table(markdown: str, strict: bool = True) -> str | None:
+    """Render a dedented markdown pipe table as an RST table.
+
+    Parameters
+    ----------
+    markdown : str
+        A pipe table as matched by ``_TABLE_RE`` and dedented.
+    strict : bool, optional
+        When true, return None for tables outside the subset that is rendered
+        exactly like pandoc.  When false, always render, converting what is
+        understood and passing other cell text through.
+
+    Returns
+    -------
+    str or None
+        The RST table with a trailing newline, or None (strict mode only).
+    """
+    lines = [line for line in markdown.split("\n") if line.strip()]
+    parsed = [_split_row(line) for line in lines]
+    if len(parsed) < 3 or any(cells is None for cells in parsed):
+        return None
+    ncols = len(parsed[0])
+    if any(len(cells) != ncols for cells in parsed):
+        return None
+    separator = parsed[1]
+    if not all(_SEPARATOR_CELL_RE.fullmatch(cell) for cell in separator):
+        return None
+
+    exact = True
+    rendered = []
+    for cells in [parsed[0], *parsed[2:]]:
+        row = []
+        for cell in cells:
+            text, ok = _render_cell(cell)
+            exact = exact and ok
+            row.append(text)
+        rendered.append(row)
+    if strict and not exact:
+        return None
+    header = rendered[0] if any(rendered[0]) else None
+    rows = rendered[1:]
+
+    if max(len(line.rstrip()) for line in lines) > _COLUMNS:
+        total = sum(len(cell) for cell in separator)
+        return _grid(header, rows, [len(cell) / total for cell in separator])
+    if ncols > 1:
+        simple = _simple(header, rows)
+        if simple is not None:
+            return simple
+    elif max(len(row[0]) for row in rendered) <= _COLUMNS - 4:
+        return _grid(header, rows, [0.0])
+    if strict:
+        # Here pandoc lays the cells out against equal column widths, with
+        # doclayout quirks that are not worth mirroring.
+        return None
+    return _grid(header, rows, [1.0 / ncols] * ncols)
@@ -0,0 +1,109 @@
+"""Polling file watcher for the command line's ``--watch``.
+
+:class:`FileWatcher` remembers the size and modification time of every
+``.rst`` file below a directory and reports the files created or modified
+since.  It polls rather than subscribing to OS notifications, which needs no
+extra dependency and behaves the same everywhere; a ``stat`` per file is
+cheap next to reading, let alone converting, it.  :meth:`FileWatcher.wait`
+debounces, so a generator rewriting many files is seen as one change.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+
+class FileWatcher:
+    """Change detector for the ``.rst`` files below some directories.
+
+    Parameters
+    ----------
+    *roots : Path
+        The directories to watch, recursively.
+
+    Attributes
+    ----------
+    snapshot : dict
+        Maps each known file to its ``(mtime_ns, size)``.
+    """
+
+    def __init__(self, *roots: Path):
+        self.roots = roots
+        self.snapshot: dict[Path, tuple[int, int]] = {}
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        found = {}
+        for root in self.roots:
+            for path in root.rglob("*.rst"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                found[path] = (stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def changed(self) -> list[Path]:
+        """Return the files created or modified since they were last recorded.
+
+        Nothing is recorded until :meth:`update`, so before it the first call
+        returns every file.  Files that no longer exist are forgotten.
+        """
+        current = self._scan()
+        for path in self.snapshot.keys() - current.keys():
+            del self.snapshot[path]
+        return sorted(
+            path
+            for path, signature in current.items()
+            if self.snapshot.get(path) != signature
+        )
+
+    def update(self, paths: Iterable[Path]) -> None:
+        """Record the current state of *paths*, e.g. after converting them."""
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                self.snapshot.pop(path, None)
+            else:
+                self.snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+    def wait(
+        self, debounce: float = 0.5, interval: float = 0.2, timeout: float | None = None
+    ) -> list[Path]:
+        """Block until files change, then until they stay as they are.
+
+        Parameters
+        ----------
+        debounce : float
+            Seconds the set of changed files and their states must stay the
+            same for a burst of writes to be over.
+        interval : float
+            Seconds between polls.
+        timeout : float, optional
+            Give up and return an empty list after this many seconds without
+            any change.
+
+        Returns
+        -------
+        list of Path
+            What :meth:`changed` returns once the burst is over.
+        """
+        start = since = time.monotonic()
+        previous: dict[Path, tuple[int, int]] = {}
+        while True:
+            current = self._scan()
+            changed = {
+                path: signature
+                for path, signature in current.items()
+                if self.snapshot.get(path) != signature
+            }
+            now = time.monotonic()
+            if changed != previous:
+                previous, since = changed, now
+            elif changed and now - since >= debounce:
+                return sorted(changed)
+            elif not changed and timeout is not None and now - start >= timeout:
+                return []
+            time.sleep(interval)
@@ -8,6 +8,8 @@ from types import SimpleNamespace
 
 import pytest
 
+from sphinx_rustdoc_postprocess import _cache
+
 
 def pytest_configure(config):
     config.addinivalue_line(
@@ -38,8 +40,33 @@ def mock_app(tmp_srcdir):
         rustdoc_postprocess_rst_dir="crates",
         rustdoc_postprocess_toctree_target="",
         rustdoc_postprocess_toctree_rst="",
+        rustdoc_postprocess_table_engine="pandoc",
+        rustdoc_postprocess_mode="files",
+        rustdoc_postprocess_jobs=None,
+        rustdoc_postprocess_incremental=True,
+        rustdoc_postprocess_resolve_links=False,
+        rustdoc_postprocess_shard="",
+        rustdoc_postprocess_preserve_mtime=False,
+        rustdoc_postprocess_pandoc_server=None,
+        rustdoc_postprocess_pandoc_concurrency=None,
+        rustdoc_postprocess_cache_dir="",
+        rustdoc_postprocess_cache_size=64 * 1024 * 1024,
+        rustdoc_postprocess_stats_file="",
+        rustdoc_postprocess_stream_size=16 * 1024 * 1024,
+        rustdoc_postprocess_dedup=0,
+        rustdoc_postprocess_converters=[
+            "fences",
+            "links",
+            "tables",
+            "headings",
+            "inline_code",
+        ],
+    )
+    app = SimpleNamespace(
+        srcdir=str(tmp_srcdir),
+        doctreedir=str(tmp_srcdir / "_build" / "doctrees"),
+        config=config,
     )
-    app = SimpleNamespace(srcdir=str(tmp_srcdir), config=config)
     return app
 
 
@@ -54,3 +81,11 @@ def write_rst(tmp_srcdir):
         return p
 
     return _write
+
+
+@pytest.fixture(autouse=True)
+def _clear_conversion_memo():
+    """Keep the process-wide conversion memo from leaking between tests."""
+    _cache._MEMO.clear()
+    yield
+    _cache._MEMO.clear()
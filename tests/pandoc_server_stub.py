@@ -0,0 +1,67 @@
+"""Local stand-in for ``pandoc server`` used by the tests.
+
+Speaks the same JSON protocol on ``--port``.  With ``--pandoc`` it converts
+through the pandoc CLI, otherwise it tags the input so tests can tell where a
+conversion came from.
+"""
+
+import argparse
+import json
+import subprocess
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+_ARGS = None
+
+
+def _convert(options):
+    if not _ARGS.pandoc:
+        return "server: " + options["text"]
+    result = subprocess.run(
+        [
+            "pandoc",
+            "-f",
+            options["from"],
+            "-t",
+            options["to"],
+            f"--wrap={options['wrap']}",
+        ],
+        input=options["text"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Like pandoc server, drop the newline the CLI appends.
+    return result.stdout.removesuffix("\n")
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send({"version": [3, 0]})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path == "/batch":
+            self._send([{"output": _convert(r), "base64": False} for r in request])
+        else:
+            self._send({"output": _convert(request), "base64": False})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pandoc", action="store_true")
+    parser.add_argument("--port", type=int, required=True)
+    _ARGS = parser.parse_args()
+    HTTPServer(("127.0.0.1", _ARGS.port), Handler).serve_forever()
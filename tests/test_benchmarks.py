@@ -0,0 +1,61 @@
+"""Smoke tests for the benchmark suite."""
+
+from benchmarks.generate import TreeSpec, generate_tree
+from benchmarks.suite import main, regressions
+from sphinx_rustdoc_postprocess import _convert_fused
+from sphinx_rustdoc_postprocess._prescan import needed
+
+
+def test_generate_tree_is_deterministic(tmp_path):
+    spec = TreeSpec(files=4, items=3, plain=0.5, root_items=6, seed=7)
+    first = generate_tree(tmp_path / "a", spec)
+    second = generate_tree(tmp_path / "b", spec)
+    assert [p.read_bytes() for p in first] == [p.read_bytes() for p in second]
+    assert first[3] == tmp_path / "a" / "bench" / "m0" / "sub3.rst"
+    assert first[4] == tmp_path / "a" / "bench" / "lib.rst"
+
+
+def test_generated_markdown_is_converted(tmp_path):
+    spec = TreeSpec(files=3, items=4, tables=1, fences=1, plain=0, root_items=0)
+    for path in generate_tree(tmp_path, spec):
+        content = path.read_text(encoding="utf-8")
+        assert needed(content.encode("utf-8"))
+        assert _convert_fused(content) != content
+
+
+def test_plain_files_hold_no_markdown(tmp_path):
+    for path in generate_tree(tmp_path, TreeSpec(files=3, plain=1, root_items=0)):
+        assert not needed(path.read_bytes())
+
+
+def test_regressions():
+    baseline = {"links": {"mb_per_s": 10.0, "files_per_s": 100.0}}
+    assert regressions({"links": {"mb_per_s": 8.0}}, baseline, 0.25) == []
+    (found,) = regressions({"links": {"mb_per_s": 5.0}}, baseline, 0.25)
+    assert found.startswith("links mb_per_s: 5.00 < 10.00")
+    assert regressions({}, baseline, 0.25) == []
+
+
+def test_memory_regressions():
+    baseline = {"pipeline": {"peak_rss_mb": 100.0}}
+    assert regressions({"pipeline": {"peak_rss_mb": 110.0}}, baseline, 0.25) == []
+    (found,) = regressions({"pipeline": {"peak_rss_mb": 150.0}}, baseline, 0.25)
+    assert found == "pipeline peak_rss_mb: 150.00 > 100.00 (+50%)"
+
+
+def test_main_saves_and_checks_baseline(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = ["--files", "4", "--root_items", "20", "--repeat", "1", "--no-pandoc"]
+    args += ["--baseline", str(baseline)]
+    assert main([*args, "--save"]) == 0
+    assert "pipeline[native,stream]" in capsys.readouterr().out
+    assert main([*args, "--check", "--margin", "1"]) == 0
+    assert main([*args, "--check", "--files", "5"]) == 2
+
+
+def test_main_reports_missing_baseline(tmp_path, capsys):
+    missing = tmp_path / "baseline.json"
+    assert main(["--check", "--no-pandoc", "--baseline", str(missing)]) == 2
+    assert capsys.readouterr().err == (
+        f"no baseline at {missing}; record one with --save\n"
+    )
@@ -0,0 +1,122 @@
+"""Tests for the pandoc circuit breaker and adaptive timeouts."""
+
+import asyncio
+import functools
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import (
+    _pandoc,
+    _pandoc_batch,
+    _pandoc_timeout,
+    _reset_breaker,
+    postprocess_rst_files,
+)
+from sphinx_rustdoc_postprocess._breaker import CircuitBreaker
+
+TABLE = "   | A |\n   |---|\n   | *x* |\n"
+
+
+@pytest.fixture()
+def breaker(monkeypatch):
+    """Give the pandoc calls made outside a build a breaker of their own."""
+    breaker = CircuitBreaker(mod._BREAKER_THRESHOLD)
+    monkeypatch.setattr(mod, "_breaker", breaker)
+    return breaker
+
+
+def _failing_run(monkeypatch, exc):
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(kwargs["timeout"])
+        raise exc
+
+    monkeypatch.setattr(mod.subprocess, "run", run)
+    return calls
+
+
+def test_opens_after_consecutive_failures(caplog):
+    breaker = CircuitBreaker(3)
+    for _ in range(2):
+        breaker.failure("timeout")
+    breaker.success()
+    breaker.failure("timeout")
+    breaker.failure("exit status 1")
+    assert breaker.allow()
+    breaker.failure("timeout")
+    breaker.failure("timeout")
+    assert not breaker.allow()
+    assert caplog.text.count("Not calling pandoc") == 1
+    assert "3 consecutive failures (timeout 4, exit status 1 1)" in caplog.text
+
+
+def test_timeouts_stop_calling_pandoc(breaker, monkeypatch, caplog):
+    calls = _failing_run(monkeypatch, mod.subprocess.TimeoutExpired("pandoc", 5))
+    results = [_pandoc(f"x{i}") for i in range(20)]
+    assert results == [f"x{i}" for i in range(20)]
+    assert len(calls) == mod._BREAKER_THRESHOLD
+    assert caplog.text.count("Not calling pandoc") == 1
+
+
+def test_missing_pandoc_opens_at_once(breaker, monkeypatch, caplog):
+    calls = _failing_run(monkeypatch, FileNotFoundError("pandoc"))
+    assert _pandoc_batch(["a", "b", "c"]) == ["a", "b", "c"]
+    assert len(calls) == 1
+    assert "pandoc could not be run" in caplog.text
+
+
+def test_concurrent_runs_stop_at_threshold(breaker, monkeypatch):
+    calls = []
+
+    async def fake(markdown, timeout):
+        calls.append(markdown)
+        await asyncio.sleep(0)
+        raise TimeoutError("pandoc timed out")
+
+    monkeypatch.setattr(mod, "_run_pandoc_async", fake)
+    monkeypatch.setattr(mod, "_BATCH_MAX_FRAGMENTS", 1)
+    fragments = [f"f{i}" for i in range(30)]
+    assert _pandoc_batch(fragments, concurrency=2) == fragments
+    assert len(calls) <= mod._BREAKER_THRESHOLD + 1
+
+
+def test_timeout_scales_with_size():
+    small = _pandoc_timeout("| a |\n")
+    assert small == pytest.approx(mod._PANDOC_TIMEOUT, abs=0.01)
+    assert _pandoc_timeout("x" * 100_000) == pytest.approx(small + 10, abs=0.01)
+    assert _pandoc_timeout("x" * 10_000_000) == mod._BATCH_TIMEOUT
+
+
+def test_open_breaker_falls_back_to_native(mock_app, write_rst, monkeypatch):
+    mock_app.config.rustdoc_postprocess_table_engine = "pandoc"
+    _failing_run(monkeypatch, FileNotFoundError("pandoc"))
+    rst = write_rst("m.rst", ".. rust:module:: m\n\n" + TABLE)
+    postprocess_rst_files(mock_app)
+    assert mock_app.rustdoc_postprocess_breaker.open
+    assert not mod._breaker.open
+    assert "+-----+" in rst.read_text(encoding="utf-8")
+    state = mod._state_dir(mock_app)
+    assert not [path for path in (state / "pandoc").rglob("*") if path.is_file()]
+    assert not (state / "manifest" / "manifest.json").exists()
+
+
+@pytest.mark.parametrize(
+    ("engine", "opened"), [("pandoc", True), ("auto", True), ("native", False)]
+)
+def test_probe(mock_app, monkeypatch, engine, opened):
+    mock_app.config.rustdoc_postprocess_table_engine = engine
+    monkeypatch.setattr(mod.shutil, "which", lambda name: "/usr/bin/pandoc")
+    monkeypatch.setattr(mod, "_pandoc_version", functools.cache(lambda: ""))
+    _reset_breaker(mock_app)
+    assert mock_app.rustdoc_postprocess_breaker.open is opened
+
+
+def test_probe_passes_with_working_pandoc(mock_app, monkeypatch):
+    mock_app.config.rustdoc_postprocess_table_engine = "pandoc"
+    monkeypatch.setattr(mod, "_pandoc_version", functools.cache(lambda: "pandoc 3.1"))
+    mock_app.rustdoc_postprocess_breaker = CircuitBreaker(1)
+    mock_app.rustdoc_postprocess_breaker.trip("left over from an earlier build")
+    _reset_breaker(mock_app)
+    assert not mock_app.rustdoc_postprocess_breaker.open
@@ -0,0 +1,122 @@
+"""Tests for the ConversionCache and its use by postprocess_rst_files()."""
+
+import os
+from pathlib import Path
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import _cache, postprocess_rst_files
+from sphinx_rustdoc_postprocess._cache import ConversionCache
+
+TABLE = """\
+.. rust:module:: m
+
+   | A | B |
+   |---|---|
+   | 1 | 2 |
+"""
+
+
+def test_memo_hit_and_miss():
+    cache = ConversionCache(None, 0, "ns")
+    assert cache.get("x") is None
+    cache.put("x", "X")
+    assert cache.get("x") == "X"
+    assert (cache.memory_hits, cache.disk_hits, cache.misses) == (1, 0, 1)
+
+
+def test_memo_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(_cache, "MEMO_SIZE", 2)
+    cache = ConversionCache(None, 0, "ns")
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+    assert len(_cache._MEMO) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+
+
+def test_namespace_changes_key():
+    assert ConversionCache(None, 0, "a").key("x") != ConversionCache(None, 0, "b").key(
+        "x"
+    )
+
+
+def test_disk_tier_survives_memo_clear(tmp_path):
+    ConversionCache(tmp_path, 1 << 20, "ns").put("x", "X")
+    _cache._MEMO.clear()
+    cache = ConversionCache(tmp_path, 1 << 20, "ns")
+    assert cache.get("x") == "X"
+    assert cache.disk_hits == 1
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = ConversionCache(tmp_path, 1 << 20, "ns")
+    for i, text in enumerate(["old", "mid", "new"]):
+        cache.put(text, "v" * 10)
+        path = cache._path(cache.key(text))
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    cache.max_bytes = 20
+    assert cache.prune() == 1
+    _cache._MEMO.clear()
+    assert cache.get("old") is None
+    assert cache.get("new") == "v" * 10
+
+
+def test_summary_reports_hit_rate():
+    cache = ConversionCache(None, 0, "ns")
+    cache.get("x")
+    cache.put("x", "X")
+    cache.get("x")
+    assert cache.summary().startswith("1/2 hits (50%")
+
+
+def test_postprocess_reuses_cached_tables(mock_app, write_rst, monkeypatch):
+    calls = []
+
+    def fake_batch(fragments, concurrency=1):
+        calls.append(list(fragments))
+        return [f"converted {i}\n" for i, _ in enumerate(fragments)]
+
+    monkeypatch.setattr(mod, "_try_pandoc_batch", fake_batch)
+    mock_app.config.rustdoc_postprocess_table_engine = "pandoc"
+    write_rst("a.rst", TABLE)
+    write_rst("b.rst", TABLE)
+    postprocess_rst_files(mock_app)
+    assert len(calls) == 1 and len(calls[0]) == 1
+
+    # Second build with fresh inputs: served from the on-disk cache.
+    _cache._MEMO.clear()
+    rst = write_rst("a.rst", TABLE)
+    postprocess_rst_files(mock_app)
+    assert calls[-1] == []
+    assert "converted 0" in rst.read_text(encoding="utf-8")
+
+
+def test_cache_dir_in_srcdir_holds_no_documents(mock_app, write_rst, monkeypatch):
+    monkeypatch.setattr(
+        mod,
+        "_try_pandoc_batch",
+        lambda fragments, concurrency=1: ["x\n"] * len(fragments),
+    )
+    mock_app.config.rustdoc_postprocess_cache_dir = ".rustdoc_cache"
+    mock_app.config.rustdoc_postprocess_table_engine = "pandoc"
+    write_rst("a.rst", TABLE)
+    postprocess_rst_files(mock_app)
+    cache_dir = Path(mock_app.srcdir) / ".rustdoc_cache"
+    entries = [path for path in cache_dir.rglob("*") if path.is_file()]
+    assert [path.suffix for path in entries] == [".cache"]
+
+
+def test_postprocess_cache_disabled(mock_app, write_rst, tmp_srcdir, monkeypatch):
+    monkeypatch.setattr(
+        mod,
+        "_try_pandoc_batch",
+        lambda fragments, concurrency=1: ["x\n"] * len(fragments),
+    )
+    mock_app.config.rustdoc_postprocess_cache_size = 0
+    mock_app.config.rustdoc_postprocess_table_engine = "pandoc"
+    write_rst("a.rst", TABLE)
+    postprocess_rst_files(mock_app)
+    state = tmp_srcdir / "_build" / "doctrees" / "rustdoc_postprocess"
+    assert not (state / "pandoc").exists()
@@ -0,0 +1,70 @@
+"""Tests for joining fragments into one pandoc run and splitting its output."""
+
+import pytest
+
+from sphinx_rustdoc_postprocess import _pandoc, _pandoc_chunk
+from sphinx_rustdoc_postprocess._chunks import join, split
+
+
+def test_join_makes_footnote_labels_distinct():
+    document, separator = join(["a[^1]\n\n[^1]: x\n", "b[^1]\n\n[^1]: y\n", "c\n"])
+    parts = document.split(f"\n\n{separator}\n\n")
+    assert parts[0].count("[^rustdocpostprocess0-1]") == 2
+    assert parts[1].count("[^rustdocpostprocess1-1]") == 2
+    assert parts[2] == "c\n"
+
+
+def test_split_hands_notes_and_images_back():
+    separator = "rustdocpostprocessabc"
+    output = (
+        "a [1]_\n"
+        f"{separator}\n"
+        "b |alt| [2]_ [3]_\n\n"
+        ".. [1]\n   x\n\n"
+        ".. [2]\n   y\n\n"
+        ".. [3]\n   z\n\n"
+        ".. |alt| image:: p.png\n"
+        "   :width: 10\n"
+    )
+    assert split(output, separator, 2) == [
+        "a [1]_\n\n.. [1]\n   x\n",
+        "b |alt| [1]_ [2]_\n\n.. [1]\n   y\n\n.. [2]\n   z\n\n"
+        ".. |alt| image:: p.png\n   :width: 10\n",
+    ]
+
+
+def test_split_rejects_shared_and_generated_images():
+    separator = "rustdocpostprocessabc"
+    output = (
+        f"|alt|\n{separator}\n|alt|\n{separator}\n|image|\n{separator}\nplain\n\n"
+        ".. |alt| image:: p.png\n.. |image| image:: q.png\n"
+    )
+    assert split(output, separator, 4) == [None, None, None, "plain\n"]
+
+
+def test_split_rejects_wrong_part_count():
+    assert split("a\n", "rustdocpostprocessabc", 2) is None
+
+
+@pytest.mark.pandoc
+def test_chunk_keeps_footnotes_and_images_batched():
+    fragments = [
+        "A note[^1].\n\n[^1]: First.\n",
+        "Another[^1] and an inline one^[here].\n\n[^1]: Second\n    continued.\n",
+        "An image ![alt](a.png).\n",
+        "A labelled note[^n] and ![other](b.png).\n\n[^n]: Named.\n",
+        "Not a note: [^ here.\n",
+    ]
+    assert _pandoc_chunk(fragments) == [_pandoc(f) for f in fragments]
+
+
+@pytest.mark.pandoc
+def test_chunk_converts_ambiguous_images_alone():
+    fragments = [
+        f"An {image} here.\n"
+        for image in ("![alt](a.png)", "![alt](b.png)", "![](c.png)")
+    ]
+    # pandoc renames the second "alt" image, and names the third after its
+    # position in the run.
+    converted = _pandoc_chunk([*fragments, "plain\n"])
+    assert converted == [_pandoc(fragments[0]), None, None, _pandoc("plain\n")]
@@ -0,0 +1,129 @@
+"""Tests for the ``sphinx-rustdoc-postprocess`` command line interface."""
+
+import json
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from sphinx_rustdoc_postprocess import postprocess_rst_files
+from sphinx_rustdoc_postprocess._cli import main
+
+from .test_parallel import SOURCES
+
+
+@pytest.fixture()
+def tree(tmp_path):
+    root = tmp_path / "tree"
+    for name, body in SOURCES.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body, encoding="utf-8")
+    return root
+
+
+def _read(root):
+    return {
+        path.relative_to(root).as_posix(): path.read_text(encoding="utf-8")
+        for path in sorted(root.rglob("*.rst"))
+    }
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_matches_extension(tree, mock_app, write_rst, jobs):
+    assert main([str(tree), "--table-engine", "native", "--jobs", jobs]) == 0
+    mock_app.config.rustdoc_postprocess_table_engine = "native"
+    for name, body in SOURCES.items():
+        write_rst(name, body)
+    postprocess_rst_files(mock_app)
+    assert _read(tree) == _read(Path(mock_app.srcdir) / "crates")
+
+
+def test_resolve_links(tree):
+    (tree / "b" / "foo.rst").write_text(".. rust:struct:: d::Foo\n", encoding="utf-8")
+    assert main([str(tree), "-q", "--table-engine", "native", "--resolve-links"]) == 0
+    assert ":rust:struct:`Foo <d::Foo>`" in (tree / "b" / "d.rst").read_text(
+        encoding="utf-8"
+    )
+
+
+def test_check(tree, capsys):
+    before = _read(tree)
+    assert main([str(tree), "--check", "--table-engine", "native"]) == 1
+    assert _read(tree) == before
+    assert capsys.readouterr().out.splitlines() == [
+        "would convert a.rst",
+        "would convert b/c.rst",
+        "would convert b/d.rst",
+    ]
+    assert main([str(tree), "-q", "--table-engine", "native"]) == 0
+    assert main([str(tree), "--check", "--table-engine", "native"]) == 0
+
+
+def test_stats_and_state_dir(tree, tmp_path):
+    args = [str(tree), "--table-engine", "native", "--state-dir", str(tmp_path / "st")]
+    stats = tmp_path / "stats.json"
+    assert main([*args, "--stats", str(stats)]) == 0
+    assert json.loads(stats.read_text(encoding="utf-8"))["files"]["rewritten"] == 3
+    assert main([*args, "--stats", str(stats)]) == 0
+    files = json.loads(stats.read_text(encoding="utf-8"))["files"]
+    assert files["rewritten"] == 0
+    assert files["reused"] > 0
+
+
+@pytest.mark.parametrize("argv", [["--jobs", "0"], ["--jobs", "x"], ["missing"]])
+def test_bad_arguments(tmp_path, argv):
+    if argv[0].startswith("-"):
+        argv = [str(tmp_path), *argv]
+    with pytest.raises(SystemExit) as excinfo:
+        main(argv)
+    assert excinfo.value.code == 2
+
+
+def test_does_not_import_sphinx(tree):
+    code = (
+        "import sys\n"
+        "from sphinx_rustdoc_postprocess._cli import main\n"
+        f"status = main([{str(tree)!r}, '-q', '--table-engine', 'native'])\n"
+        "heavy = [m for m in sys.modules if m.split('.')[0] in ('sphinx', 'asyncio')]\n"
+        "print(status, heavy)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout == "0 []\n"
+    assert "**Examples**" in (tree / "a.rst").read_text(encoding="utf-8")
+
+
+def test_module_entry_point(tree):
+    result = subprocess.run(
+        [sys.executable, "-m", "sphinx_rustdoc_postprocess", "--check", str(tree)],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 1
+    assert "would convert a.rst" in result.stdout
+
+
+def test_watch(tree):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "sphinx_rustdoc_postprocess", "--watch", "-q"]
+        + ["--table-engine", "native", "--debounce", "0.1", str(tree)],
+    )
+    try:
+        new = tree / "new.rst"
+        deadline = time.monotonic() + 30
+        while "**Examples**" not in (tree / "a.rst").read_text(encoding="utf-8"):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        new.write_text("   ## Added\n", encoding="utf-8")
+        while new.read_text(encoding="utf-8") != "   **Added**\n":
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        assert process.poll() is None
+    finally:
+        process.send_signal(signal.SIGINT)
+        assert process.wait(timeout=10) == 0
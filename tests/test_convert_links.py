@@ -58,3 +58,15 @@ class TestConvertInlineCode:
         content = "   `text <https://url.com>`_"
         result = _convert_inline_code(content)
         assert result == content
+
+    def test_code_after_arrow(self):
+        content = "   Matches `x` =>`y`, returns ->`T`."
+        assert _convert_inline_code(content) == (
+            "   Matches ``x`` =>``y``, returns ->``T``."
+        )
+
+    def test_roles_not_mangled(self):
+        content = "   See :rust:struct:`Name <crate::Name>` and :func:`f`, not `x`."
+        assert _convert_inline_code(content) == (
+            "   See :rust:struct:`Name <crate::Name>` and :func:`f`, not ``x``."
+        )
@@ -2,7 +2,12 @@
 
 import pytest
 
-from sphinx_rustdoc_postprocess import _convert_tables
+from sphinx_rustdoc_postprocess import (
+    _convert_tables,
+    _pandoc,
+    _pandoc_batch,
+    _pandoc_chunk,
+)
 
 
 @pytest.mark.pandoc
@@ -50,3 +55,101 @@ def test_table_preserves_surrounding():
 def test_no_table_unchanged():
     content = "   Just plain RST content.\n"
     assert _convert_tables(content) == content
+
+
+_TABLES = [
+    "| Header A | Header B |\n|----------|----------|\n| cell 1   | cell 2   |\n",
+    "| Col 1 | Col 2 |\n|:------|------:|\n| a | b |\n| d | e |\n",
+    "| Module | Purpose |\n|--------|---------|\n"
+    "| ``types`` | ``#[repr(C)]`` data structures for force/energy I/O |\n",
+    "| Image | Note |\n|-------|------|\n| ![i](p.png) | x |\n",
+]
+
+
+@pytest.mark.pandoc
+def test_batch_matches_per_table():
+    assert _pandoc_chunk(_TABLES[:3]) is not None
+    assert _pandoc_batch(_TABLES) == [_pandoc(t) for t in _TABLES]
+
+
+@pytest.mark.pandoc
+def test_batch_splits_into_bounded_chunks(monkeypatch):
+    import sphinx_rustdoc_postprocess as mod
+
+    monkeypatch.setattr(mod, "_BATCH_MAX_FRAGMENTS", 2)
+    assert _pandoc_batch(_TABLES * 2) == [_pandoc(t) for t in _TABLES * 2]
+
+
+def test_batch_falls_back_to_per_fragment(monkeypatch):
+    import sphinx_rustdoc_postprocess as mod
+
+    monkeypatch.setattr(mod, "_pandoc_chunk", lambda fragments: None)
+    monkeypatch.setattr(mod, "_try_pandoc", lambda md: md.upper())
+    assert _pandoc_batch(["a", "b"]) == ["A", "B"]
+
+
+def test_batch_empty():
+    assert _pandoc_batch([]) == []
+
+
+@pytest.mark.pandoc
+def test_concurrent_batch_matches_per_table(monkeypatch):
+    import sphinx_rustdoc_postprocess as mod
+
+    monkeypatch.setattr(mod, "_BATCH_MAX_FRAGMENTS", 2)
+    expected = [_pandoc(t) for t in _TABLES * 2]
+    assert _pandoc_batch(_TABLES * 2, concurrency=3) == expected
+
+
+def _fake_pandoc(monkeypatch, fail=()):
+    """Replace the pandoc subprocess with a coroutine that tracks concurrency."""
+    import asyncio
+
+    import sphinx_rustdoc_postprocess as mod
+
+    state = {"running": 0, "peak": 0}
+
+    async def fake(markdown, timeout):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        # Later fragments finish first.
+        await asyncio.sleep(0.05 / (1 + len(markdown)))
+        state["running"] -= 1
+        if markdown in fail:
+            raise TimeoutError("pandoc timed out")
+        return 0, markdown.upper(), ""
+
+    monkeypatch.setattr(mod, "_run_pandoc_async", fake)
+    monkeypatch.setattr(mod, "_BATCH_MAX_FRAGMENTS", 1)
+    return state
+
+
+def test_concurrent_batch_bounded_and_ordered(monkeypatch):
+    state = _fake_pandoc(monkeypatch)
+    fragments = ["a" * n for n in range(1, 9)]
+    results = _pandoc_batch(fragments, concurrency=3)
+    assert results == [f.upper() for f in fragments]
+    assert state["peak"] == 3
+
+
+def test_concurrent_batch_timeout_keeps_markdown(monkeypatch, caplog):
+    _fake_pandoc(monkeypatch, fail={"b"})
+    assert _pandoc_batch(["a", "b", "c"], concurrency=2) == ["A", "b", "C"]
+    assert "pandoc timed out" in caplog.text
+
+
+def test_concurrent_batch_inside_running_loop(monkeypatch):
+    import asyncio
+
+    _fake_pandoc(monkeypatch)
+
+    async def main():
+        return _pandoc_batch(["a", "b"], concurrency=2)
+
+    assert asyncio.run(main()) == ["A", "B"]
+
+
+def test_convert_tables_custom_render():
+    content = "   | A | B |\n   |---|---|\n   | 1 | 2 |\n"
+    result = _convert_tables(content, render=lambda md: "rendered\n")
+    assert result == "   rendered\n"
@@ -0,0 +1,183 @@
+"""Tests for sharing repeated directive bodies through includes."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from sphinx_rustdoc_postprocess import postprocess_rst_files
+from sphinx_rustdoc_postprocess._cli import main
+from sphinx_rustdoc_postprocess._dedup import (
+    MIN_SIZE,
+    bodies,
+    collapse,
+    digest,
+    expand,
+)
+
+DOC = "".join(
+    f"Line {i} of a long doc comment repeated by re-exports.\n" for i in range(12)
+)
+assert len(DOC) >= MIN_SIZE
+
+
+def _indent(text, prefix):
+    return "".join(
+        prefix + line if line.strip() else line for line in text.splitlines(True)
+    )
+
+
+def _page(name, doc=DOC):
+    return (
+        f".. rust:module:: app::{name}\n"
+        "\n"
+        f".. rust:struct:: app::{name}::Socket\n"
+        "   :index: 0\n"
+        "\n"
+        f"{_indent(doc, '   ')}"
+        "\n"
+        f"   .. rust:function:: app::{name}::Socket::new\n"
+        "\n"
+        f"{_indent(doc, '      ')}"
+    )
+
+
+def test_bodies():
+    content = _page("a")
+    found = bodies(content)
+    # The struct's body declares a function, so only the function's is shared.
+    assert [body.text for body in found] == [DOC]
+    assert found[0].indent == "      "
+    lines = content.split("\n")
+    assert (
+        lines[found[0].start]
+        == "      Line 0 of a long doc comment repeated by re-exports."
+    )
+    assert found[0].end == len(lines) - 1
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        # Too short.
+        ".. rust:function:: f\n\n   Short.\n",
+        # No blank line after the directive.
+        ".. rust:function:: f\n" + _indent(DOC, "   "),
+        # Whitespace-only line.
+        ".. rust:function:: f\n\n"
+        + _indent(DOC, "   ")
+        + "   \n"
+        + _indent(DOC, "   "),
+        # A line less indented than the first.
+        ".. rust:function:: f\n\n" + _indent(DOC, "     ") + _indent(DOC, "   "),
+        # Not a rust: directive.
+        ".. note::\n\n" + _indent(DOC, "   "),
+        # In a literal block.
+        "Example::\n\n   .. rust:function:: f\n\n" + _indent(DOC, "      "),
+    ],
+)
+def test_bodies_left_alone(content):
+    assert bodies(content) == []
+
+
+def test_collapse_and_expand():
+    content = _page("a")
+    found = bodies(content)
+    name = digest(DOC)
+    collapsed = collapse(content, found, {name}, "../_shared")
+    assert collapsed.endswith(f"\n\n      .. include:: ../_shared/{name}.inc\n")
+    assert collapse(content, found, set(), "../_shared") == content
+    snippets = {name: DOC}
+    assert expand(collapsed, snippets.get, "../_shared") == content
+    assert expand(collapsed, {}.get, "../_shared") == collapsed
+    assert expand(collapsed, snippets.get, "_shared") == collapsed
+
+
+@pytest.fixture()
+def dedup_app(mock_app, write_rst):
+    mock_app.config.rustdoc_postprocess_dedup = 2
+    mock_app.config.rustdoc_postprocess_table_engine = "native"
+    mock_app.config.rustdoc_postprocess_stats_file = "stats.json"
+    for name in ("a", "b", "c"):
+        write_rst(f"{name}/lib.rst", _page(name, DOC.replace("doc", "`doc`")))
+    write_rst("d.rst", _page("d", "Other.\n"))
+    return mock_app
+
+
+def _stats(app):
+    return json.loads((Path(app.srcdir) / "stats.json").read_text(encoding="utf-8"))
+
+
+def test_repeated_bodies_are_shared(dedup_app, caplog):
+    caplog.set_level("INFO")
+    postprocess_rst_files(dedup_app)
+    crates = Path(dedup_app.srcdir) / "crates"
+    converted = DOC.replace("doc", "``doc``")
+    name = digest(converted)
+    assert [p.name for p in (crates / "_shared").iterdir()] == [f"{name}.inc"]
+    assert (crates / "_shared" / f"{name}.inc").read_text(encoding="utf-8") == converted
+    for page in ("a", "b", "c"):
+        text = (crates / page / "lib.rst").read_text(encoding="utf-8")
+        assert text.endswith(f"      .. include:: ../_shared/{name}.inc\n")
+        assert expand(text, {name: converted}.get, "../_shared") == (
+            _page(page, converted)
+        )
+
+    data = _stats(dedup_app)
+    assert data["files"]["deduplicated"] == 3
+    assert data["dedup"]["snippets"] == 1
+    assert data["dedup"]["includes"] == 3
+    assert data["dedup"]["bytes_saved"] > len(converted)
+    assert "dedup: 3 includes of 1 snippets" in caplog.text
+
+
+def test_threshold(dedup_app):
+    dedup_app.config.rustdoc_postprocess_dedup = 3
+    postprocess_rst_files(dedup_app)
+    assert not (Path(dedup_app.srcdir) / "crates" / "_shared").exists()
+    assert _stats(dedup_app)["files"]["deduplicated"] == 0
+
+
+def test_next_build_reuses_shared_files(dedup_app, write_rst):
+    dedup_app.config.rustdoc_postprocess_preserve_mtime = True
+    postprocess_rst_files(dedup_app)
+    crates = Path(dedup_app.srcdir) / "crates"
+    lib = crates / "a" / "lib.rst"
+    mtime = lib.stat().st_mtime_ns
+    shared = lib.read_text(encoding="utf-8")
+
+    # sphinxcontrib-rust regenerating the same pages.
+    for name in ("a", "b", "c"):
+        write_rst(f"{name}/lib.rst", _page(name, DOC.replace("doc", "`doc`")))
+    postprocess_rst_files(dedup_app)
+    data = _stats(dedup_app)
+    assert data["files"]["reused"] == 3
+    assert data["files"]["deduplicated"] == 0
+    assert lib.read_text(encoding="utf-8") == shared
+    assert lib.stat().st_mtime_ns == mtime
+
+
+def test_bodies_no_longer_repeated_are_restored(dedup_app, write_rst):
+    postprocess_rst_files(dedup_app)
+    crates = Path(dedup_app.srcdir) / "crates"
+    path = write_rst("c/lib.rst", _page("c", "Changed.\n"))
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+    postprocess_rst_files(dedup_app)
+    converted = DOC.replace("doc", "``doc``")
+    assert (crates / "a" / "lib.rst").read_text(encoding="utf-8") == (
+        _page("a", converted)
+    )
+    assert not (crates / "_shared").exists()
+    assert _stats(dedup_app)["files"]["deduplicated"] == 2
+
+
+def test_cli(tmp_path):
+    for name in ("a", "b", "c"):
+        path = tmp_path / name / "lib.rst"
+        path.parent.mkdir()
+        path.write_text(_page(name), encoding="utf-8")
+    assert main([str(tmp_path), "--dedup", "2", "-q"]) == 0
+    text = (tmp_path / "a" / "lib.rst").read_text(encoding="utf-8")
+    assert f".. include:: ../_shared/{digest(DOC)}.inc" in text
+    assert main([str(tmp_path), "--dedup", "2", "--check"]) == 0
@@ -0,0 +1,165 @@
+"""Tests for the docstrings converter, which converts whole doc comments."""
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import _convert_docstrings, postprocess_rst_files
+from sphinx_rustdoc_postprocess._docstrings import extract, number_notes
+
+SOURCE = """\
+Title
+=====
+
+.. rust:module:: app
+
+   Helpers for *app*.
+
+   - one
+   - two
+
+   .. rust:struct:: app::Socket
+      :index: 0
+
+      A socket.
+
+      .. toctree::
+
+         one
+
+      After.
+
+.. toctree::
+
+   plain
+"""
+
+
+def test_extract():
+    docstrings = extract(SOURCE)
+    assert [doc.markdown for doc in docstrings] == [
+        "Helpers for *app*.\n\n- one\n- two\n",
+        "A socket.\n",
+        "After.\n",
+    ]
+    assert [doc.indent for doc in docstrings] == ["   ", "      ", "      "]
+    lines = SOURCE.split("\n")
+    assert lines[docstrings[0].start] == "   Helpers for *app*."
+    assert lines[docstrings[0].end - 1] == "   - two"
+
+
+def test_extract_stops_at_literal_bodies_and_dedents():
+    content = (
+        ".. rust:function:: app::f\n"
+        "\n"
+        "   Before.\n"
+        "\n"
+        "   .. code-block:: rust\n"
+        "\n"
+        "      # hidden\n"
+        "\n"
+        "   After.\n"
+        "  Less indented.\n"
+    )
+    assert [doc.markdown for doc in extract(content)] == [
+        "Before.\n",
+        "After.\n",
+        "Less indented.\n",
+    ]
+
+
+def test_number_notes():
+    rst = "See [1]_ and [2]_, not [3]\\_.\n\n.. [1]\n   One.\n\n.. [2]\n   Two.\n"
+    assert number_notes(rst) == (
+        "See [#]_ and [#]_, not [3]\\_.\n\n.. [#]\n   One.\n\n.. [#]\n   Two.\n"
+    )
+
+
+def _upper(fragments):
+    return [f"CONVERTED {markdown.upper()}" for markdown in fragments]
+
+
+def test_convert_with_render():
+    content = (
+        ".. rust:module:: app\n"
+        "\n"
+        "   ## Usage\n"
+        "\n"
+        "   ```\n"
+        "   x\n"
+        "   ```\n"
+        "   See [`Socket`].\n"
+    )
+    assert _convert_docstrings(content, _upper) == (
+        ".. rust:module:: app\n"
+        "\n"
+        "   CONVERTED **USAGE**\n"
+        "\n"
+        "   .. code-block:: none\n"
+        "\n"
+        "      x\n"
+        "\n"
+        "   CONVERTED SEE ``SOCKET``.\n"
+    )
+
+
+def test_failed_conversion_falls_back_to_converters():
+    content = (
+        ".. rust:module:: app\n"
+        "\n"
+        "   See `x` and [`Socket`].\n"
+        "\n"
+        "   | A |\n"
+        "   |---|\n"
+        "   | 1 |\n"
+    )
+    assert _convert_docstrings(content, lambda fragments: [None] * len(fragments)) == (
+        ".. rust:module:: app\n"
+        "\n"
+        "   See ``x`` and ``Socket``.\n"
+        "\n"
+        "   +---+\n"
+        "   | A |\n"
+        "   +===+\n"
+        "   | 1 |\n"
+        "   +---+\n"
+    )
+
+
+@pytest.mark.pandoc
+def test_one_pandoc_run_per_file_then_cache(mock_app, write_rst, monkeypatch):
+    mock_app.config.rustdoc_postprocess_converters = ["docstrings"]
+    mock_app.config.rustdoc_postprocess_incremental = False
+    mock_app.config.rustdoc_postprocess_resolve_links = True
+    body = (
+        ".. rust:module:: app::{name}\n"
+        "\n"
+        "   Uses *{name}*.\n"
+        "\n"
+        "   .. rust:struct:: app::{name}::Item\n"
+        "\n"
+        "      - a [`{name}::Item`]\n"
+        "      - b\n"
+        "\n"
+        "      > quoted\n"
+    )
+    runs = []
+    monkeypatch.setattr(mod, "_record_pandoc", runs.append)
+    for _ in range(2):
+        paths = [write_rst(f"{name}.rst", body.format(name=name)) for name in "ab"]
+        postprocess_rst_files(mock_app)
+        assert paths[0].read_text(encoding="utf-8") == (
+            ".. rust:module:: app::a\n"
+            "\n"
+            "   Uses *a*.\n"
+            "\n"
+            "   .. rust:struct:: app::a::Item\n"
+            "\n"
+            "      - a :rust:struct:`a::Item <app::a::Item>`\n"
+            "      - b\n"
+            "\n"
+            "      ..\n"
+            "\n"
+            "         quoted\n"
+        )
+        # One run per file, and none once the doc comments are cached.
+        assert len(runs) == 2
@@ -0,0 +1,111 @@
+"""Equivalence tests for the fused engine against the five reference passes."""
+
+import random
+
+import pytest
+
+from sphinx_rustdoc_postprocess import (
+    _convert_fences,
+    _convert_fused,
+    _convert_headings,
+    _convert_inline_code,
+    _convert_links,
+    _convert_tables,
+)
+
+
+def _render(markdown):
+    # Multi-line output with headings and inline code, so the passes that
+    # run after _convert_tables have something to do on rendered lines.
+    return "## Table\n\n`" + markdown.replace("\n", " |\n") + "\n  # done\n"
+
+
+def _reference(content, render=_render):
+    content = _convert_fences(content)
+    content = _convert_links(content)
+    content = _convert_tables(content, render=render)
+    content = _convert_headings(content)
+    return _convert_inline_code(content)
+
+
+CASES = {
+    "empty": "",
+    "plain": "   Just prose.\n",
+    "fence": "   ```rust\n   let x = 1;\n   ```\n",
+    "fence_blank_lines": "   ```\n\n\n   fn f() {}\n\n   ```\n   after\n",
+    "fence_empty_body": "   ```rust\n   ```",
+    "fence_unclosed": "   ```rust\n   let x = `y`;\n",
+    "fence_other_indent": "   ```rust\n  ```\n   let x;\n   ```\n",
+    "fence_attrs": "   ```rust,ignore\n   x\n   ```\n   ```rust\n   y\n   ```\n",
+    "fence_links": "   ```\n   [`Foo`] and `bar`\n   ```\n",
+    "table": "   | a | b |\n   |---|---|\n   | 1 | 2 |\n",
+    "table_at_eof": "   | a | b |\n   |---|---|\n   | 1 | 2 |",
+    "table_no_rows": "   | a | b |\n   |---|---|\n   text\n",
+    "table_separator_as_header": "   | a |\n   |---|\n   |---|\n   | 1 |\n",
+    "table_indent_change": "   | a |\n   |---|\n   | 1 |\n    | 2 |\n",
+    "table_in_fence": "   ```\n   | a |\n   |---|\n   | 1 |\n   ```\n",
+    "tables_adjacent": "   | a |\n   |---|\n   | 1 |\n  | b |\n  |---|\n  | 2 |\n",
+    "headings": "   ## Title\n   ####### seven\n   ##  \n   ## \n# top\n",
+    "inline_code": "   `a`b and ``c`` and `d <e>`\n   .. rust:fn:: `f`\n   :x: `y`\n",
+    "links": "   [text](https://example.com) and [``Bar``] and [`Baz`](x)\n",
+    "code_block": (
+        "   .. code-block:: rust\n\n      # fn main() {}\n      `a`\n   ## after\n"
+    ),
+    "literal_block": (
+        "   Example::\n\n      # hidden `x`\n      | a |\n      |---|\n\n   `a`\n"
+    ),
+    "fence_in_literal": "   Example::\n\n      ```\n      # x\n      ```\n",
+    "carriage_returns": "   ```\r\n   x\r\n   ```\r\n   | a |\r\n   |---|\r\n",
+}
+
+
+@pytest.mark.parametrize("content", CASES.values(), ids=CASES.keys())
+def test_matches_reference(content):
+    assert _convert_fused(content, _render) == _reference(content)
+
+
+PIECES = [
+    "   ```rust",
+    "   ```",
+    "  ```",
+    "   ```text  ",
+    "      ```",
+    "   | a | b |",
+    "   |---|---|",
+    "   | `c` | d |",
+    "  | x |",
+    "   |:-:|",
+    "   | # h |",
+    "   ## Head",
+    "   ## ",
+    "   # `code` here",
+    "   see [`Foo`] and [t](https://x.y)",
+    "   .. rust:fn:: f",
+    "   :param x: `y`",
+    "   `a`b `c`",
+    "   .. code-block:: rust",
+    "   Example::",
+    "      # fn main() {}",
+    "",
+    "   \t",
+    "text",
+]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_reference_on_random_documents(seed):
+    rnd = random.Random(seed)
+    for _ in range(50):
+        lines = [rnd.choice(PIECES) for _ in range(rnd.randint(0, 30))]
+        content = "\n".join(lines) + rnd.choice(["", "\n"])
+        assert _convert_fused(content, _render) == _reference(content), content
+
+
+@pytest.mark.pandoc
+def test_matches_reference_with_pandoc():
+    content = (
+        "   ## Example\n\n"
+        "   | Name | Value |\n   |------|-------|\n   | `a` | 1 |\n\n"
+        "   ```rust\n   let x = 1;\n   ```\n"
+    )
+    assert _convert_fused(content) == _reference(content, render=None)
@@ -0,0 +1,225 @@
+"""Tests for the incremental manifest."""
+
+import os
+import time
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import postprocess_rst_files
+from sphinx_rustdoc_postprocess._manifest import Manifest, content_hash
+
+RAW = ".. rust:module:: m\n\n   Use `bar` here.\n"
+CONVERTED = ".. rust:module:: m\n\n   Use ``bar`` here.\n"
+
+
+def _no_conversion(monkeypatch):
+    def fail(content, *args):
+        raise AssertionError("converter ran")
+
+    monkeypatch.setattr(mod, "_prepare", fail)
+
+
+def test_lookup_restores_known_input(tmp_path):
+    manifest = Manifest(tmp_path, "fp")
+    manifest.record("m.rst", content_hash(RAW), CONVERTED)
+    manifest.save()
+    loaded = Manifest.load(tmp_path, "fp")
+    assert loaded.lookup("m.rst", RAW) == CONVERTED
+    assert loaded.lookup("m.rst", CONVERTED) == CONVERTED
+    assert loaded.lookup("m.rst", RAW + "changed") is None
+    assert loaded.reused == 2
+
+
+def test_fingerprint_change_discards_entries(tmp_path):
+    manifest = Manifest(tmp_path, "fp")
+    manifest.record("m.rst", content_hash(RAW), CONVERTED)
+    manifest.save()
+    assert Manifest.load(tmp_path, "other").lookup("m.rst", RAW) is None
+
+
+def test_changed_link_target_discards_entry(tmp_path):
+    targets = {"Socket": "struct app::Socket", "Other": None}
+    manifest = Manifest(tmp_path, "fp")
+    manifest.record("m.rst", content_hash(RAW), CONVERTED, dict(targets))
+    manifest.record("n.rst", content_hash(RAW), CONVERTED)
+    manifest.save()
+    loaded = Manifest.load(tmp_path, "fp", targets.get)
+    assert loaded.lookup("m.rst", RAW) == CONVERTED
+    targets["Other"] = "struct app::Other"
+    assert loaded.lookup("m.rst", RAW) is None
+    assert not loaded.written("m.rst", content_hash(RAW))
+    assert loaded.lookup("n.rst", RAW) == CONVERTED
+
+
+def test_save_drops_unseen_files_and_objects(tmp_path):
+    manifest = Manifest(tmp_path, "fp")
+    manifest.record("gone.rst", content_hash(RAW), CONVERTED)
+    manifest.save()
+    Manifest.load(tmp_path, "fp").save()
+    assert Manifest.load(tmp_path, "fp").entries == {}
+    assert not [p for p in (tmp_path / "objects").rglob("*") if p.is_file()]
+
+
+def test_regenerated_file_restored_without_converting(mock_app, write_rst, monkeypatch):
+    rst = write_rst("m.rst", RAW)
+    postprocess_rst_files(mock_app)
+    assert rst.read_text(encoding="utf-8") == CONVERTED
+
+    write_rst("m.rst", RAW)
+    _no_conversion(monkeypatch)
+    postprocess_rst_files(mock_app)
+    assert rst.read_text(encoding="utf-8") == CONVERTED
+
+
+def test_doctrees_in_output_dir_hold_no_documents(mock_app, write_rst, tmp_srcdir):
+    # sphinx-build -b html . _build/html keeps doctrees in _build/html/.doctrees,
+    # which Sphinx reads source files from like the rest of srcdir.
+    mock_app.doctreedir = str(tmp_srcdir / "_build" / "html" / ".doctrees")
+    rst = write_rst("m.rst", RAW)
+    for _ in range(2):
+        postprocess_rst_files(mock_app)
+        write_rst("m.rst", RAW)
+    postprocess_rst_files(mock_app)
+    assert rst.read_text(encoding="utf-8") == CONVERTED
+    assert sorted(tmp_srcdir.rglob("*.rst")) == [rst]
+
+
+def test_untouched_file_skipped(mock_app, write_rst, monkeypatch):
+    rst = write_rst("m.rst", RAW)
+    postprocess_rst_files(mock_app)
+    mtime = rst.stat().st_mtime_ns
+    _no_conversion(monkeypatch)
+    postprocess_rst_files(mock_app)
+    assert rst.stat().st_mtime_ns == mtime
+
+
+def test_changed_input_is_reconverted(mock_app, write_rst):
+    rst = write_rst("m.rst", RAW)
+    postprocess_rst_files(mock_app)
+    write_rst("m.rst", RAW + "\n   And `baz`.\n")
+    postprocess_rst_files(mock_app)
+    assert "``baz``" in rst.read_text(encoding="utf-8")
+
+
+def test_config_change_invalidates(mock_app, write_rst, monkeypatch):
+    write_rst("m.rst", RAW)
+    postprocess_rst_files(mock_app)
+    write_rst("m.rst", RAW)
+    mock_app.config.rustdoc_postprocess_table_engine = "native"
+    calls = []
+    real = mod._prepare
+    monkeypatch.setattr(
+        mod, "_prepare", lambda c, *args: calls.append(c) or real(c, *args)
+    )
+    postprocess_rst_files(mock_app)
+    assert calls == [RAW]
+
+
+def test_parallel_mode_records_manifest(mock_app, write_rst, monkeypatch):
+    mock_app.config.rustdoc_postprocess_jobs = 2
+    a = write_rst("a.rst", RAW)
+    write_rst("b.rst", RAW.replace("bar", "baz"))
+    postprocess_rst_files(mock_app)
+    write_rst("a.rst", RAW)
+    _no_conversion(monkeypatch)
+    postprocess_rst_files(mock_app)
+    assert a.read_text(encoding="utf-8") == CONVERTED
+
+
+def test_incremental_disabled(mock_app, write_rst, tmp_srcdir):
+    mock_app.config.rustdoc_postprocess_incremental = False
+    write_rst("m.rst", RAW)
+    postprocess_rst_files(mock_app)
+    assert not (
+        tmp_srcdir / "_build" / "doctrees" / "rustdoc_postprocess" / "manifest"
+    ).exists()
+
+
+def _regenerate(write_rst, name, content):
+    """Rewrite *name* as a later build of sphinxcontrib-rust would."""
+    path = write_rst(name, content)
+    later = path.stat().st_mtime_ns + 10**9
+    os.utime(path, ns=(later, later))
+    return path
+
+
+def test_unchanged_output_keeps_mtime(mock_app, write_rst):
+    mock_app.config.rustdoc_postprocess_preserve_mtime = True
+    rst = write_rst("m.rst", RAW)
+    plain = write_rst("plain.rst", ".. rust:module:: p\n")
+    postprocess_rst_files(mock_app)
+    mtimes = [rst.stat().st_mtime_ns, plain.stat().st_mtime_ns]
+
+    _regenerate(write_rst, "m.rst", RAW)
+    _regenerate(write_rst, "plain.rst", ".. rust:module:: p\n")
+    postprocess_rst_files(mock_app)
+    assert rst.read_text(encoding="utf-8") == CONVERTED
+    assert [rst.stat().st_mtime_ns, plain.stat().st_mtime_ns] == mtimes
+
+
+def test_changed_output_gets_new_mtime(mock_app, write_rst):
+    mock_app.config.rustdoc_postprocess_preserve_mtime = True
+    rst = write_rst("m.rst", RAW)
+    postprocess_rst_files(mock_app)
+    mtime = rst.stat().st_mtime_ns
+
+    _regenerate(write_rst, "m.rst", RAW.replace("bar", "baz"))
+    postprocess_rst_files(mock_app)
+    changed = rst.stat().st_mtime_ns
+    assert changed > mtime
+
+    # The new output's time is the one kept from now on.
+    _regenerate(write_rst, "m.rst", RAW.replace("bar", "baz"))
+    postprocess_rst_files(mock_app)
+    assert rst.stat().st_mtime_ns == changed
+
+
+def test_preserve_mtime_off_by_default(mock_app, write_rst):
+    rst = write_rst("m.rst", RAW)
+    postprocess_rst_files(mock_app)
+    mtime = rst.stat().st_mtime_ns
+    _regenerate(write_rst, "m.rst", RAW)
+    postprocess_rst_files(mock_app)
+    assert rst.stat().st_mtime_ns > mtime
+
+
+def test_sphinx_rereads_only_changed_pages(tmp_path):
+    from sphinx.application import Sphinx
+
+    src = tmp_path / "src"
+    (src / "crates").mkdir(parents=True)
+    (src / "conf.py").write_text(
+        'extensions = ["sphinx_rustdoc_postprocess"]\n'
+        'rustdoc_postprocess_table_engine = "native"\n'
+        "rustdoc_postprocess_preserve_mtime = True\n",
+        encoding="utf-8",
+    )
+    pages = {f"p{i}": f"P{i}\n==\n\n.. note::\n\n   Use `x{i}`.\n" for i in range(3)}
+    (src / "index.rst").write_text(
+        "Index\n=====\n\n.. toctree::\n\n"
+        + "".join(f"   crates/{name}\n" for name in pages),
+        encoding="utf-8",
+    )
+
+    def build():
+        for name, body in pages.items():
+            path = src / "crates" / f"{name}.rst"
+            path.write_text(body, encoding="utf-8")
+            later = time.time_ns() + 10**9
+            os.utime(path, ns=(later, later))
+        read = []
+        app = Sphinx(
+            str(src),
+            str(src),
+            str(tmp_path / "out"),
+            str(tmp_path / "doctrees"),
+            "pseudoxml",
+            status=None,
+            warning=None,
+        )
+        app.connect("source-read", lambda app, docname, source: read.append(docname))
+        app.build()
+        return read
+
+    assert len(build()) == 4
+    pages["p1"] = pages["p1"].replace("x1", "y1")
+    assert build() == ["crates/p1"]
@@ -0,0 +1,66 @@
+"""Tests for the process-pool mode of postprocess_rst_files()."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sphinx_rustdoc_postprocess import (
+    _map_files,
+    _postprocess_jobs,
+    postprocess_rst_files,
+)
+
+SOURCES = {
+    "a.rst": ".. rust:module:: a\n\n   ## Examples\n\n   ```rust\n   let x = 1;\n"
+    "   ```\n",
+    "b/c.rst": ".. rust:module:: c\n\n   | A | B |\n   |---|---|\n   | `x` | 2 |\n",
+    "b/d.rst": ".. rust:module:: d\n\n   See [`Foo`] and [docs](https://e.com).\n",
+    "clean.rst": ".. rust:module:: clean\n\n   Already RST.\n",
+}
+
+
+def _build(mock_app, write_rst, jobs):
+    mock_app.config.rustdoc_postprocess_jobs = jobs
+    paths = {name: write_rst(name, body) for name, body in SOURCES.items()}
+    postprocess_rst_files(mock_app)
+    return {name: p.read_text(encoding="utf-8") for name, p in paths.items()}
+
+
+def test_parallel_matches_serial(mock_app, write_rst):
+    serial = _build(mock_app, write_rst, 1)
+    assert _build(mock_app, write_rst, 3) == serial
+
+
+def test_parallel_isolates_failing_file(mock_app, write_rst, tmp_srcdir, caplog):
+    bad = tmp_srcdir / "crates" / "bad.rst"
+    bad.write_bytes(b"\xff\xfe not `utf-8`")
+    result = _build(mock_app, write_rst, 2)
+    assert "**Examples**" in result["a.rst"]
+    assert bad.read_bytes() == b"\xff\xfe not `utf-8`"
+    assert "Failed to convert" in caplog.text
+    assert "bad.rst" in caplog.text
+
+
+def test_map_files_isolates_deleted_file(tmp_path):
+    kept, gone = tmp_path / "kept.rst", tmp_path / "gone.rst"
+    kept.write_text("x\n", encoding="utf-8")
+    with ThreadPoolExecutor(2) as pool:
+        results = _map_files(pool, lambda path: path.name, [gone, kept])
+    assert results[kept] == "kept.rst"
+    assert isinstance(results[gone], FileNotFoundError)
+
+
+def test_parallel_logs_in_path_order(mock_app, write_rst, caplog):
+    caplog.set_level("INFO")
+    _build(mock_app, write_rst, 2)
+    converted = [r.args[0].name for r in caplog.records if "Converted" in r.msg]
+    assert converted == ["a.rst", "c.rst", "d.rst"]
+
+
+@pytest.mark.parametrize(
+    ("configured", "parallel", "expected"), [(None, 0, 1), (None, 8, 8), (2, 8, 2)]
+)
+def test_jobs_default_to_sphinx_parallel(mock_app, configured, parallel, expected):
+    mock_app.config.rustdoc_postprocess_jobs = configured
+    mock_app.parallel = parallel
+    assert _postprocess_jobs(mock_app) == expected
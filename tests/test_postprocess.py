@@ -1,6 +1,16 @@
 """Integration tests for postprocess_rst_files() and inject_rust_toctree()."""
 
-from sphinx_rustdoc_postprocess import inject_rust_toctree, postprocess_rst_files
+import pytest
+
+from sphinx_rustdoc_postprocess import (
+    _convert_fences,
+    _convert_headings,
+    _convert_inline_code,
+    _convert_links,
+    _convert_tables,
+    inject_rust_toctree,
+    postprocess_rst_files,
+)
 
 
 def test_postprocess_converts_fences(mock_app, write_rst):
@@ -121,3 +131,27 @@ def test_inject_toctree_idempotent(mock_app, tmp_srcdir):
     inject_rust_toctree(mock_app)
     result = target.read_text(encoding="utf-8")
     assert result.count("crates/lib") == 1
+
+
+@pytest.mark.pandoc
+def test_postprocess_batched_tables_match_per_table(mock_app, write_rst):
+    table = """\
+   | Module | Purpose |
+   |--------|---------|
+   | [`types`] | `#[repr(C)]` data structures |
+"""
+    other = """\
+   | A | B |
+   |:--|--:|
+   | x | y |
+"""
+    sources = {
+        "a.rst": ".. rust:module:: a\n\n" + table + "\n" + other,
+        "sub/b.rst": ".. rust:module:: b\n\n" + other + "\n   Text.\n",
+    }
+    paths = {name: write_rst(name, body) for name, body in sources.items()}
+    postprocess_rst_files(mock_app)
+    for name, body in sources.items():
+        expected = _convert_links(_convert_fences(body))
+        expected = _convert_inline_code(_convert_headings(_convert_tables(expected)))
+        assert paths[name].read_text(encoding="utf-8") == expected
@@ -0,0 +1,72 @@
+"""Tests for the byte-level pre-scan."""
+
+import random
+
+import pytest
+
+from sphinx_rustdoc_postprocess import _FusedConverter, postprocess_rst_files
+from sphinx_rustdoc_postprocess._prescan import ALL, Converters, needed, needed_file
+
+from .test_fused import PIECES, _reference, _render
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        (b"plain prose\n", Converters(0)),
+        (b"   ## Title\n", Converters.HEADINGS),
+        (b"   `code`\n", Converters.INLINE_CODE),
+        (b"   ```rust\n   ```\n", Converters.FENCES | Converters.INLINE_CODE),
+        (b"   [`Foo`]\n", Converters.LINKS | Converters.INLINE_CODE),
+        (
+            b"   | a |\n",
+            Converters.TABLES | Converters.HEADINGS | Converters.INLINE_CODE,
+        ),
+        (
+            "   ## Überschrift ünd `€`\n".encode(),
+            Converters.HEADINGS | Converters.INLINE_CODE,
+        ),
+    ],
+)
+def test_needed(data, expected):
+    assert needed(data) == expected
+
+
+def test_needed_file(tmp_path):
+    empty = tmp_path / "empty.rst"
+    empty.write_bytes(b"")
+    assert needed_file(empty) == Converters(0)
+    headed = tmp_path / "headed.rst"
+    headed.write_bytes(b"   ## Title\n")
+    assert needed_file(headed) == Converters.HEADINGS
+    assert needed_file(tmp_path / "missing.rst") == ALL
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_needed_converters_match_reference(seed):
+    rnd = random.Random(seed)
+    for _ in range(50):
+        content = "\n".join(rnd.choice(PIECES) for _ in range(rnd.randint(0, 12)))
+        converter = _FusedConverter(needed(content.encode("utf-8")))
+        converted = converter.join(converter.scan(content), _render)
+        assert converted == _reference(content), content
+
+
+def test_touched():
+    converter = _FusedConverter()
+    converter.scan("   ## Title\n\n   Use `x`.\n")
+    assert converter.touched == Converters.HEADINGS | Converters.INLINE_CODE
+
+
+def test_clean_files_are_skipped(mock_app, write_rst, caplog):
+    caplog.set_level("INFO")
+    clean = write_rst("clean.rst", ".. rust:module:: m\n\n   Nothing to do.\n")
+    before = clean.stat().st_mtime_ns
+    write_rst("dirty.rst", ".. rust:module:: d\n\n   ## Title\n\n   Use `x`.\n")
+    postprocess_rst_files(mock_app)
+    assert clean.stat().st_mtime_ns == before
+    assert "Skipped 1 files without markdown" in caplog.text
+    assert (
+        "Files touched per converter: fences 0, links 0, tables 0, headings 1, "
+        "inline_code 1" in caplog.text
+    )
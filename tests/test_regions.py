@@ -0,0 +1,146 @@
+"""Tests for the block structure that keeps converters out of literal bodies."""
+
+import pytest
+
+from sphinx_rustdoc_postprocess import (
+    _convert_fences,
+    _convert_fused,
+    _convert_headings,
+    _convert_inline_code,
+    _convert_links,
+)
+from sphinx_rustdoc_postprocess._regions import (
+    MARKUP,
+    PROSE,
+    PROTECTED,
+    RegionTracker,
+    directive_name,
+    runs,
+)
+
+
+def _classify(content):
+    tracker = RegionTracker()
+    return [tracker.classify(line) for line in content.split("\n")]
+
+
+def test_directive_body():
+    content = (
+        "   .. code-block:: rust\n      :linenos:\n\n      # fn main() {}\n   after\n"
+    )
+    assert _classify(content) == [
+        MARKUP,
+        PROTECTED,
+        PROTECTED,
+        PROTECTED,
+        PROSE,
+        PROSE,
+    ]
+
+
+def test_other_directives_are_not_literal():
+    content = "   .. note::\n\n      # heading\n"
+    assert _classify(content) == [MARKUP, PROSE, PROSE, PROSE]
+
+
+@pytest.mark.parametrize(
+    ("text", "name"),
+    [
+        (".. rust:struct:: crate::Name", "rust:struct"),
+        (".. note::", "note"),
+        (".. [1] note", None),
+        ("..  note::", None),
+        (":param x: y", None),
+    ],
+)
+def test_directive_name(text, name):
+    assert directive_name(text) == name
+
+
+def test_literal_block():
+    content = "   Example::\n\n      # hidden\n\n      `x`\n   after\n"
+    assert _classify(content) == [
+        PROSE,
+        PROSE,
+        PROTECTED,
+        PROTECTED,
+        PROTECTED,
+        PROSE,
+        PROSE,
+    ]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        # No blank line after the marker.
+        "   Example::\n      # not literal\n",
+        # Not indented deeper than the marker.
+        "   Example::\n\n   # not literal\n",
+        # A heading loses its "::" when converted.
+        "   ## Example::\n\n      # not literal\n",
+    ],
+)
+def test_no_literal_block(content):
+    assert PROTECTED not in _classify(content)
+
+
+def test_runs():
+    content = "   a::\n\n      b\n      c\n   d\n"
+    assert runs(content) == [
+        (False, "   a::\n\n"),
+        (True, "      b\n      c\n"),
+        (False, "   d\n"),
+    ]
+    assert "".join(text for _, text in runs(content)) == content
+    assert runs("   plain\n") == [(False, "   plain\n")]
+
+
+def _reference(content):
+    content = _convert_fences(content)
+    content = _convert_links(content)
+    content = _convert_headings(content)
+    return _convert_inline_code(content)
+
+
+DOCUMENT = (
+    "   ## Usage\n"
+    "\n"
+    "   ```rust\n"
+    "   # use app::Socket;\n"
+    "   let s = `x`;\n"
+    "   ```\n"
+    "   .. code-block:: text\n"
+    "\n"
+    "      # [`Socket`] `y`\n"
+    "\n"
+    "   Shell::\n"
+    "\n"
+    "      ## not a heading\n"
+    "\n"
+    "   See `s`.\n"
+)
+
+EXPECTED = (
+    "   **Usage**\n"
+    "\n"
+    "   .. code-block:: rust\n"
+    "\n"
+    "      # use app::Socket;\n"
+    "      let s = `x`;\n"
+    "\n"
+    "   .. code-block:: text\n"
+    "\n"
+    "      # [`Socket`] `y`\n"
+    "\n"
+    "   Shell::\n"
+    "\n"
+    "      ## not a heading\n"
+    "\n"
+    "   See ``s``.\n"
+)
+
+
+@pytest.mark.parametrize("convert", [_reference, _convert_fused])
+def test_converters_skip_literal_bodies(convert):
+    assert convert(DOCUMENT) == EXPECTED
@@ -0,0 +1,135 @@
+"""Tests for the converter registry and ``rustdoc_postprocess_converters``."""
+
+import itertools
+import random
+from importlib.metadata import EntryPoint
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import (
+    _BUILTIN_CONVERTERS,
+    Converter,
+    _convert_sequence,
+    _fused_mask,
+    _FusedConverter,
+    _registry,
+    _resolve_converters,
+    postprocess_rst_files,
+)
+from sphinx_rustdoc_postprocess._prescan import Converters
+
+from .test_fused import PIECES, _render
+
+SHOUT = Converter(
+    "shout", lambda c: c.replace("TODO", "**TODO**"), lambda c: "TODO" in c
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    _registry.plugins.cache_clear()
+    _resolve_converters.cache_clear()
+    yield
+    _resolve_converters.cache_clear()
+
+
+def _run(mock_app, write_rst, body, converters):
+    mock_app.config.rustdoc_postprocess_table_engine = "native"
+    mock_app.config.rustdoc_postprocess_converters = converters
+    rst = write_rst("m.rst", body)
+    postprocess_rst_files(mock_app)
+    return rst.read_text(encoding="utf-8")
+
+
+def test_disabled_converter_never_runs(mock_app, write_rst, monkeypatch):
+    monkeypatch.setattr(mod, "_convert_headings", None)
+    body = ".. rust:module:: m\n\n   ## Title\n\n   Use `x`.\n"
+    result = _run(mock_app, write_rst, body, ["inline_code"])
+    assert result == ".. rust:module:: m\n\n   ## Title\n\n   Use ``x``.\n"
+
+
+def test_custom_order(mock_app, write_rst):
+    body = ".. rust:module:: m\n\n   See [`Foo`].\n"
+    # Inline code first leaves ``Foo`` alone, so links sees [``Foo``].
+    assert _run(mock_app, write_rst, body, ["inline_code", "links"]) == (
+        ".. rust:module:: m\n\n   See ``Foo``.\n"
+    )
+    assert _fused_mask(_resolve_converters(("inline_code", "links"))) is None
+
+
+def test_plugin_runs_in_listed_position(mock_app, write_rst, monkeypatch):
+    monkeypatch.setattr(_registry, "plugins", lambda: {"shout": SHOUT})
+    body = ".. rust:module:: m\n\n   TODO: `x`\n"
+    result = _run(mock_app, write_rst, body, ["shout", "inline_code"])
+    assert result == ".. rust:module:: m\n\n   **TODO**: ``x``\n"
+
+
+def test_plugin_runs_on_files_without_markdown(mock_app, write_rst, monkeypatch):
+    monkeypatch.setattr(_registry, "plugins", lambda: {"shout": SHOUT})
+    body = ".. rust:module:: m\n\n   TODO\n"
+    result = _run(mock_app, write_rst, body, [*mod._DEFAULT_CONVERTERS, "shout"])
+    assert result == ".. rust:module:: m\n\n   **TODO**\n"
+
+
+def test_plugin_stats():
+    stats = mod.Stats()
+    content, touched = _convert_sequence(None, "TODO `x`", [SHOUT], stats)
+    assert content == "**TODO** `x`"
+    assert touched == Converters(0)
+    assert stats.converters["shout"].matches == 1
+    other = mod.Stats()
+    other.merge(stats)
+    assert other.converters["shout"].bytes_out == 12
+
+
+def test_entry_points_are_loaded(monkeypatch, caplog):
+    found = [
+        EntryPoint("shout", "tests.test_registry:SHOUT", _registry.ENTRY_POINT_GROUP),
+        EntryPoint("broken", "tests.missing:X", _registry.ENTRY_POINT_GROUP),
+        EntryPoint("other", "tests.test_registry:PIECES", _registry.ENTRY_POINT_GROUP),
+    ]
+    monkeypatch.setattr(_registry, "entry_points", lambda group: found)
+    assert _registry.plugins() == {"shout": SHOUT}
+    assert "Cannot load converter broken" in caplog.text
+    assert "Entry point other is not a Converter" in caplog.text
+
+
+def test_converter_is_public():
+    assert "Converter" in mod.__all__
+    assert mod.Converter is _registry.Converter
+
+
+def test_unknown_converter_is_reported(caplog):
+    converters = _resolve_converters(("links", "nope", "links"))
+    assert converters == (_BUILTIN_CONVERTERS["links"],)
+    assert "Unknown converter 'nope'" in caplog.text
+
+
+def test_source_read_uses_converter_list(mock_app):
+    mock_app.config.rustdoc_postprocess_mode = "source-read"
+    mock_app.config.rustdoc_postprocess_converters = ["headings"]
+    source = ["   ## Title\n\n   `x`\n"]
+    mod._on_source_read(mock_app, "crates/m", source)
+    assert source == ["   **Title**\n\n   `x`\n"]
+
+
+@pytest.mark.parametrize("size", range(1, 5))
+def test_fused_subset_matches_sequential_passes(size):
+    rnd = random.Random(size)
+    docs = [
+        "\n".join(rnd.choice(PIECES) for _ in range(rnd.randint(0, 25)))
+        for _ in range(100)
+    ]
+    for names in itertools.combinations(mod._DEFAULT_CONVERTERS, size):
+        converters = _resolve_converters(names)
+        mask = _fused_mask(converters)
+        for content in docs:
+            expected = content
+            for converter in converters:
+                if converter.name == "tables":
+                    expected = mod._convert_tables(expected, _render)
+                else:
+                    expected = converter.convert(expected)
+            fused = _FusedConverter(mask)
+            assert fused.join(fused.scan(content), _render) == expected, names
@@ -0,0 +1,99 @@
+"""Tests for the resident pandoc server backend."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import postprocess_rst_files
+from sphinx_rustdoc_postprocess._server import PandocServer, PandocServerError
+
+STUB = [sys.executable, str(Path(__file__).with_name("pandoc_server_stub.py"))]
+
+
+@pytest.fixture()
+def server():
+    server = PandocServer(STUB, mod._PANDOC_SERVER_OPTIONS)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture()
+def server_app(mock_app):
+    mock_app.config.rustdoc_postprocess_pandoc_server = STUB
+    mod.start_pandoc_server(mock_app)
+    yield mock_app
+    mod.stop_pandoc_server(mock_app)
+
+
+def test_convert(server):
+    assert server.healthy()
+    assert server.convert("a") == "server: a\n"
+    assert server.convert_many(["b", "c"]) == ["server: b\n", "server: c\n"]
+
+
+def test_connections_are_pooled(server):
+    for _ in range(3):
+        server.convert("a")
+    assert server._pool.qsize() == 1
+
+
+def test_restarts_dead_server(server):
+    server.convert("a")
+    server._process.kill()
+    server._process.wait()
+    assert server.convert("b") == "server: b\n"
+    assert server.restarts == 1
+
+
+def test_stop(server):
+    process = server._process
+    server.stop()
+    assert process.poll() is not None
+    assert not server.healthy()
+
+
+@pytest.mark.parametrize(
+    "command", [["false"], ["sphinx-rustdoc-postprocess-no-such-binary"]]
+)
+def test_start_failure(command):
+    server = PandocServer(command, {}, startup_timeout=1)
+    with pytest.raises(PandocServerError):
+        server.start()
+
+
+def test_pandoc_uses_server(server_app):
+    assert mod._pandoc("a") == "server: a\n"
+    assert mod._pandoc_batch(["b", "c"]) == ["server: b\n", "server: c\n"]
+
+
+def test_build_finished_stops_server(server_app):
+    process = mod._server._process
+    mod.stop_pandoc_server(server_app, None)
+    assert mod._server is None
+    assert process.poll() is not None
+
+
+def test_unavailable_server_falls_back(mock_app, caplog):
+    mock_app.config.rustdoc_postprocess_pandoc_server = ["false"]
+    mod.start_pandoc_server(mock_app)
+    assert mod._server is None
+    assert "pandoc server unavailable" in caplog.text
+
+
+@pytest.mark.pandoc
+def test_server_output_matches_subprocess(mock_app, write_rst):
+    table = "   | Name | Value |\n   |------|-------|\n   | *a* | 1 |\n"
+    mock_app.config.rustdoc_postprocess_table_engine = "pandoc"
+    expected = mod._convert_tables(table)
+    mock_app.config.rustdoc_postprocess_pandoc_server = [*STUB, "--pandoc"]
+    mod.start_pandoc_server(mock_app)
+    try:
+        assert mod._server is not None
+        rst = write_rst("m.rst", table)
+        postprocess_rst_files(mock_app)
+    finally:
+        mod.stop_pandoc_server(mock_app)
+    assert rst.read_text(encoding="utf-8") == expected
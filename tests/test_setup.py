@@ -1,6 +1,17 @@
 """Tests for the setup() entry point."""
 
-from sphinx_rustdoc_postprocess import setup
+import pytest
+from sphinx.config import ENUM
+
+from sphinx_rustdoc_postprocess import (
+    _CONFIG_VALUES,
+    _on_builder_inited,
+    _on_source_read,
+    _prune_caches,
+    setup,
+    stage_generated_files,
+    stop_pandoc_server,
+)
 
 
 class FakeApp:
@@ -10,8 +21,8 @@ class FakeApp:
         self.config_values = {}
         self.connections = []
 
-    def add_config_value(self, name, default, rebuild):
-        self.config_values[name] = (default, rebuild)
+    def add_config_value(self, name, default, rebuild, types=()):
+        self.config_values[name] = (default, rebuild, types)
 
     def connect(self, event, callback, priority=500):
         self.connections.append((event, callback, priority))
@@ -26,21 +37,38 @@ def test_setup_returns_metadata():
     assert result["parallel_write_safe"] is True
 
 
-def test_setup_registers_config_values():
+@pytest.mark.parametrize(
+    ("name", "default", "rebuild", "types"),
+    _CONFIG_VALUES,
+    ids=[name for name, *_ in _CONFIG_VALUES],
+)
+def test_setup_registers_config_value(mock_app, name, default, rebuild, types):
     app = FakeApp()
     setup(app)
-    assert "rustdoc_postprocess_rst_dir" in app.config_values
-    assert app.config_values["rustdoc_postprocess_rst_dir"][0] == "crates"
-    assert "rustdoc_postprocess_toctree_target" in app.config_values
-    assert app.config_values["rustdoc_postprocess_toctree_target"][0] == ""
-    assert "rustdoc_postprocess_toctree_rst" in app.config_values
-    assert app.config_values["rustdoc_postprocess_toctree_rst"][0] == ""
+    registered_default, registered_rebuild, registered_types = app.config_values[name]
+    assert (registered_default, registered_rebuild) == (default, rebuild)
+    if types and isinstance(types[0], str):
+        assert isinstance(registered_types, ENUM)
+        assert all(registered_types.match(choice) for choice in types)
+        assert not registered_types.match("unknown")
+    else:
+        assert registered_types == types
+    # The tests' stand-in app starts from the same defaults.
+    assert getattr(mock_app.config, name) == default
 
 
-def test_setup_connects_builder_inited():
+@pytest.mark.parametrize(
+    "connection",
+    [
+        ("builder-inited", _on_builder_inited, 600),
+        # Before sphinxcontrib-rust's own handler, at the default priority.
+        ("builder-inited", stage_generated_files, 400),
+        ("source-read", _on_source_read, 500),
+        ("build-finished", stop_pandoc_server, 500),
+        ("build-finished", _prune_caches, 500),
+    ],
+)
+def test_setup_connects(connection):
     app = FakeApp()
     setup(app)
-    events = [e for e, _, _ in app.connections]
-    assert "builder-inited" in events
-    priorities = [p for e, _, p in app.connections if e == "builder-inited"]
-    assert priorities[0] == 600
+    assert connection in app.connections
@@ -0,0 +1,136 @@
+"""Tests for splitting the post-processing across shards and merging them."""
+
+import json
+import random
+import shutil
+from pathlib import Path
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import postprocess_rst_files
+from sphinx_rustdoc_postprocess._cli import main
+from sphinx_rustdoc_postprocess._shard import assign, parse
+
+from .test_cli import _read
+from .test_parallel import SOURCES
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"), [("1/1", (0, 1)), ("2/4", (1, 4)), ("4/4", (3, 4))]
+)
+def test_parse(value, expected):
+    assert parse(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "1", "0/2", "3/2", "a/b", "1/2/3"])
+def test_parse_rejects(value):
+    with pytest.raises(ValueError, match="not a shard"):
+        parse(value)
+
+
+def test_assign_is_deterministic_and_balanced():
+    rng = random.Random(0)
+    sizes = {
+        f"crate{i}/mod{j}.rst": rng.randrange(100_000)
+        for i in range(40)
+        for j in range(10)
+    }
+    shards = assign(sizes, 4)
+    assert sorted(set(shards.values())) == [0, 1, 2, 3]
+    shuffled = list(sizes.items())
+    rng.shuffle(shuffled)
+    assert assign(dict(shuffled), 4) == shards
+
+    loads = [0] * 4
+    for name, shard in shards.items():
+        loads[shard] += sizes[name]
+    assert max(loads) - min(loads) <= max(sizes.values())
+
+
+def test_empty_files_are_spread():
+    shards = assign(dict.fromkeys(["a.rst", "b.rst", "c.rst", "d.rst"], 0), 2)
+    assert sorted(shards.values()) == [0, 0, 1, 1]
+
+
+def test_config_converts_one_shard(mock_app, write_rst):
+    mock_app.config.rustdoc_postprocess_table_engine = "native"
+    mock_app.config.rustdoc_postprocess_shard = "1/2"
+    for name, body in SOURCES.items():
+        write_rst(name, body)
+    postprocess_rst_files(mock_app)
+
+    crates = Path(mock_app.srcdir) / "crates"
+    shards = assign({name: len(body) for name, body in SOURCES.items()}, 2)
+    for name, body in SOURCES.items():
+        converted = (crates / name).read_text(encoding="utf-8") != body
+        assert converted == (shards[name] == 0 and name != "clean.rst")
+
+    state = Path(mock_app.doctreedir) / "rustdoc_postprocess" / "shard-stats.json"
+    data = json.loads(state.read_text(encoding="utf-8"))
+    assert data["files"]["found"] == list(shards.values()).count(0)
+
+
+def test_invalid_config_converts_everything(mock_app, write_rst, caplog):
+    mock_app.config.rustdoc_postprocess_shard = "3/2"
+    rst = write_rst("m.rst", "   ## Title\n")
+    postprocess_rst_files(mock_app)
+    assert rst.read_text(encoding="utf-8") == "   **Title**\n"
+    assert "Ignoring rustdoc_postprocess_shard" in caplog.text
+
+
+def test_shards_merge_into_full_conversion(tmp_path, monkeypatch):
+    raw = tmp_path / "raw"
+    for name, body in SOURCES.items():
+        path = raw / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body, encoding="utf-8")
+    args = ["--table-engine", "native", "-q"]
+
+    full = tmp_path / "full"
+    shutil.copytree(raw, full)
+    assert main([str(full), *args]) == 0
+
+    for i in (1, 2):
+        shard = tmp_path / f"shard{i}"
+        shutil.copytree(raw, shard)
+        state = ["--state-dir", str(tmp_path / f"state{i}")]
+        assert main([str(shard), "--shard", f"{i}/2", *state, *args]) == 0
+
+    def fail(content, *args):
+        raise AssertionError("converter ran")
+
+    monkeypatch.setattr(mod, "_prepare", fail)
+    final = tmp_path / "final"
+    shutil.copytree(raw, final)
+    merge = ["--merge", str(tmp_path / "state1"), "--merge", str(tmp_path / "state2")]
+    stats = tmp_path / "stats.json"
+    state = ["--state-dir", str(tmp_path / "state"), "--stats", str(stats)]
+    assert main([str(final), *merge, *state, *args]) == 0
+    assert _read(final) == _read(full)
+    data = json.loads(stats.read_text(encoding="utf-8"))
+    assert data["files"]["found"] == len(SOURCES)
+
+
+def test_merge_rejects_other_config(tmp_path, capsys):
+    tree = tmp_path / "tree"
+    tree.mkdir()
+    (tree / "m.rst").write_text("   ## Title\n", encoding="utf-8")
+    for i, engine in ((1, "native"), (2, "pandoc")):
+        args = ["--shard", f"{i}/2", "--table-engine", engine]
+        assert main([str(tree), *args, "--state-dir", str(tmp_path / f"state{i}")]) == 0
+    merge = ["--merge", str(tmp_path / "state1"), "--merge", str(tmp_path / "state2")]
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(tree), *merge, "--state-dir", str(tmp_path / "state")])
+    assert excinfo.value.code == 2
+    assert "another config" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [["--shard", "1/2", "--watch"], ["--merge", "x"], ["--shard", "0/2"]],
+)
+def test_bad_shard_arguments(tmp_path, argv):
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(tmp_path), *argv])
+    assert excinfo.value.code == 2
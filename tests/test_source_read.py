@@ -0,0 +1,111 @@
+"""Tests for converting documents through the source-read event."""
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import _on_builder_inited, _on_source_read
+from sphinx_rustdoc_postprocess._cache import ConversionCache
+
+RAW = ".. rust:module:: m\n\n   ## Title\n\n   Use `bar` here.\n"
+CONVERTED = ".. rust:module:: m\n\n   **Title**\n\n   Use ``bar`` here.\n"
+
+
+@pytest.fixture()
+def source_read_app(mock_app):
+    mock_app.config.rustdoc_postprocess_mode = "source-read"
+    return mock_app
+
+
+def test_converts_documents_under_rst_dir(source_read_app):
+    source = [RAW]
+    _on_source_read(source_read_app, "crates/m/lib", source)
+    assert source == [CONVERTED]
+
+
+def test_ignores_other_documents(source_read_app):
+    source = [RAW]
+    _on_source_read(source_read_app, "cratesx/lib", source)
+    _on_source_read(source_read_app, "index", source)
+    assert source == [RAW]
+
+
+def test_whole_srcdir(source_read_app):
+    source_read_app.config.rustdoc_postprocess_rst_dir = "."
+    source = [RAW]
+    _on_source_read(source_read_app, "index", source)
+    assert source == [CONVERTED]
+
+
+def test_files_mode_ignores_source_read(mock_app):
+    source = [RAW]
+    _on_source_read(mock_app, "crates/m/lib", source)
+    assert source == [RAW]
+
+
+def test_source_read_mode_leaves_files_alone(source_read_app, write_rst):
+    rst = write_rst("m.rst", RAW)
+    _on_builder_inited(source_read_app)
+    assert rst.read_text(encoding="utf-8") == RAW
+    assert not (rst.parents[1] / "_build").exists()
+
+
+def test_one_cache_per_build(source_read_app, monkeypatch):
+    source_read_app.config.rustdoc_postprocess_table_engine = "pandoc"
+    monkeypatch.setattr(
+        mod,
+        "_try_pandoc_batch",
+        lambda fragments, concurrency=1: ["x\n"] * len(fragments),
+    )
+    pruned = []
+    monkeypatch.setattr(ConversionCache, "prune", lambda self: pruned.append(self))
+    for i in range(3):
+        source = [f".. rust:module:: m\n\n   | A |\n   |---|\n   | {i} |\n"]
+        _on_source_read(source_read_app, f"crates/m/t{i}", source)
+        assert source == [".. rust:module:: m\n\n   x\n"]
+    assert len(mod._caches) == 1
+    assert pruned == []
+
+    mod._prune_caches(source_read_app, None)
+    assert len(pruned) == 1
+    assert mod._caches == {}
+
+
+def test_documents_without_tables_skip_the_cache(source_read_app, monkeypatch):
+    monkeypatch.setattr(mod, "_render_tables", pytest.fail)
+    source = [RAW]
+    _on_source_read(source_read_app, "crates/m/lib", source)
+    assert source == [CONVERTED]
+    assert mod._caches == {}
+
+
+def test_sphinx_build(tmp_path):
+    from sphinx.application import Sphinx
+
+    src = tmp_path / "src"
+    (src / "crates").mkdir(parents=True)
+    (src / "conf.py").write_text(
+        'extensions = ["sphinx_rustdoc_postprocess"]\n'
+        'rustdoc_postprocess_mode = "source-read"\n',
+        encoding="utf-8",
+    )
+    (src / "index.rst").write_text(
+        "Index\n=====\n\n.. toctree::\n\n   crates/lib\n", encoding="utf-8"
+    )
+    page = ".. note::\n\n   ## Title\n\n   ```rust\n   let x = 1;\n   ```\n"
+    lib = src / "crates" / "lib.rst"
+    lib.write_text("Lib\n===\n\n" + page, encoding="utf-8")
+    app = Sphinx(
+        str(src),
+        str(src),
+        str(tmp_path / "out"),
+        str(tmp_path / "doctrees"),
+        "pseudoxml",
+        status=None,
+        warning=None,
+    )
+    app.build()
+    output = (tmp_path / "out" / "crates" / "lib.pseudoxml").read_text("utf-8")
+    assert "<strong>" in output
+    assert "let x = 1;" in output
+    assert "```" not in output
+    assert "```" in lib.read_text(encoding="utf-8")
@@ -0,0 +1,107 @@
+"""Tests for the per-converter statistics report."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import _FusedConverter, postprocess_rst_files
+from sphinx_rustdoc_postprocess._stats import Stats
+
+from .test_parallel import SOURCES
+
+
+def _report(mock_app, write_rst, jobs):
+    mock_app.config.rustdoc_postprocess_jobs = jobs
+    mock_app.config.rustdoc_postprocess_table_engine = "native"
+    mock_app.config.rustdoc_postprocess_stats_file = f"stats-{jobs}.json"
+    for name, body in SOURCES.items():
+        write_rst(name, body)
+    postprocess_rst_files(mock_app)
+    path = Path(mock_app.srcdir) / f"stats-{jobs}.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_converter_counts():
+    converter = _FusedConverter()
+    converter.scan("   ## Title\n\n   Use `x` and `y`, see [`Z`].\n")
+    counters = converter.stats.converters
+    assert counters["headings"].matches == 1
+    assert counters["links"].matches == 1
+    assert counters["inline_code"].matches == 2
+    assert counters["fences"].matches == 0
+    heading = counters["headings"]
+    assert (heading.bytes_in, heading.bytes_out) == (11, 12)
+
+
+def test_merge():
+    a, b = Stats(), Stats()
+    a.converters["links"].record("[a](http://x)", "`a <http://x>`_")
+    b.converters["links"].record("[`é`]", "``é``")
+    a.files["rewritten"], b.files["rewritten"] = 1, 2
+    a.pandoc, b.pandoc = [0.1], [0.3, 0.2]
+    a.merge(b)
+    assert a.converters["links"].matches == 2
+    assert a.converters["links"].bytes_in == 13 + 6
+    assert a.files["rewritten"] == 3
+    assert a.pandoc_summary()["calls"] == 3
+    assert a.pandoc_summary()["p50"] == 0.2
+    assert a.pandoc_summary()["max"] == 0.3
+
+
+def test_crate_times():
+    a, b = Stats(), Stats()
+    with a.crate("net"):
+        pass
+    b.crates = {"net": 0.5, "app": 2.0}
+    a.merge(b)
+    assert a.crates["net"] >= 0.5
+    assert a.summary()[-1].startswith("crates: app 2.000s, net ")
+
+
+def test_summary_is_logged(mock_app, write_rst, caplog):
+    caplog.set_level("INFO")
+    write_rst("m.rst", ".. rust:module:: m\n\n   ## Title\n")
+    write_rst("clean.rst", ".. rust:module:: c\n")
+    postprocess_rst_files(mock_app)
+    assert "headings            1" in caplog.text
+    assert "files: found 2, skipped 1, reused 0, rewritten 1" in caplog.text
+
+
+def test_parallel_report_matches_serial(mock_app, write_rst):
+    serial = _report(mock_app, write_rst, 1)
+    mock_app.config.rustdoc_postprocess_incremental = False
+    parallel = _report(mock_app, write_rst, 2)
+    for report in (serial, parallel):
+        for counters in report["converters"].values():
+            counters.pop("seconds")
+    assert parallel["converters"] == serial["converters"]
+    assert parallel["files"] == serial["files"]
+    assert serial["files"]["rewritten"] == 3
+    assert serial["converters"]["tables"]["matches"] == 1
+    assert serial["bytes_out"] > serial["bytes_in"]
+
+
+def test_pandoc_latencies_recorded(monkeypatch):
+    stats = Stats()
+    monkeypatch.setattr(mod, "_run_stats", stats)
+    monkeypatch.setattr(
+        mod.subprocess,
+        "run",
+        lambda *a, **k: mod.subprocess.CompletedProcess(a, 0, "out\n", ""),
+    )
+    mod._pandoc("x")
+    mod._pandoc("y")
+    assert stats.pandoc_summary()["calls"] == 2
+
+
+@pytest.mark.pandoc
+def test_pandoc_calls_reported(mock_app, write_rst):
+    mock_app.config.rustdoc_postprocess_table_engine = "pandoc"
+    mock_app.config.rustdoc_postprocess_stats_file = "stats.json"
+    write_rst("m.rst", ".. rust:module:: m\n\n   | A |\n   |---|\n   | *x* |\n")
+    postprocess_rst_files(mock_app)
+    report = json.loads((Path(mock_app.srcdir) / "stats.json").read_text("utf-8"))
+    assert report["pandoc"]["calls"] == 1
+    assert report["converters"]["tables"]["matches"] == 1
@@ -0,0 +1,132 @@
+"""Tests for converting large files line by line."""
+
+import random
+import tracemalloc
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import (
+    _convert_file,
+    _scan_file,
+    _split_lines,
+    postprocess_rst_files,
+)
+from sphinx_rustdoc_postprocess._prescan import ALL
+
+from .test_fused import CASES, PIECES, _render
+from .test_parallel import SOURCES
+
+
+def _convert(path, stream):
+    tables = {md: _render(md) for md in _scan_file(path, ALL, stream)}
+    return _convert_file(path, tables, ALL, stream)
+
+
+@pytest.mark.parametrize("text", ["", "a", "a\n", "a\nb", "a\n\nb\n\n", "\n"])
+def test_split_lines(tmp_path, text):
+    path = tmp_path / "f.txt"
+    path.write_text(text, encoding="utf-8")
+    with open(path, encoding="utf-8") as fh:
+        assert list(_split_lines(fh)) == text.split("\n")
+
+
+@pytest.mark.parametrize("content", CASES.values(), ids=CASES.keys())
+def test_stream_matches_whole_file(tmp_path, content):
+    whole, streamed = tmp_path / "whole.rst", tmp_path / "streamed.rst"
+    for path in (whole, streamed):
+        path.write_bytes(content.encode("utf-8"))
+    expected = _convert(whole, False)
+    result = _convert(streamed, True)
+    assert streamed.read_bytes() == whole.read_bytes()
+    assert result[0] == expected[0]
+    assert (result[1] is None) == (expected[1] is None)
+    assert result[2] == expected[2]
+    matches = [
+        {k: c.matches for k, c in r[3].converters.items()} for r in (result, expected)
+    ]
+    assert matches[0] == matches[1]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["streamed.rst", "whole.rst"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_stream_matches_whole_file_on_random_documents(tmp_path, seed):
+    rnd = random.Random(seed)
+    for _ in range(20):
+        lines = [rnd.choice(PIECES) for _ in range(rnd.randint(0, 30))]
+        content = "\n".join(lines) + rnd.choice(["", "\n"])
+        whole, streamed = tmp_path / "whole.rst", tmp_path / "streamed.rst"
+        for path in (whole, streamed):
+            path.write_text(content, encoding="utf-8")
+        _convert(whole, False)
+        _convert(streamed, True)
+        assert streamed.read_text("utf-8") == whole.read_text("utf-8"), content
+
+
+def test_failed_stream_leaves_file_alone(tmp_path):
+    path = tmp_path / "m.rst"
+    content = "   ## Title\n\n   | a |\n   |---|\n   | 1 |\n"
+    path.write_text(content, encoding="utf-8")
+    with pytest.raises(KeyError):
+        _convert_file(path, {}, ALL, True)
+    assert path.read_text(encoding="utf-8") == content
+    assert [p.name for p in tmp_path.iterdir()] == ["m.rst"]
+
+
+def test_keeps_file_mode(tmp_path):
+    path = tmp_path / "m.rst"
+    path.write_text("   ## Title\n", encoding="utf-8")
+    path.chmod(0o644)
+    _convert(path, True)
+    assert path.stat().st_mode & 0o777 == 0o644
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_pipeline_streams_large_files(mock_app, write_rst, jobs):
+    mock_app.config.rustdoc_postprocess_jobs = jobs
+    mock_app.config.rustdoc_postprocess_table_engine = "native"
+    paths = {name: write_rst(name, body) for name, body in SOURCES.items()}
+    postprocess_rst_files(mock_app)
+    expected = {name: p.read_text(encoding="utf-8") for name, p in paths.items()}
+
+    mock_app.config.rustdoc_postprocess_incremental = False
+    mock_app.config.rustdoc_postprocess_stream_size = 1
+    paths = {name: write_rst(name, body) for name, body in SOURCES.items()}
+    postprocess_rst_files(mock_app)
+    result = {name: p.read_text(encoding="utf-8") for name, p in paths.items()}
+    assert result == expected
+
+
+def test_manifest_restores_streamed_file(mock_app, write_rst, monkeypatch):
+    mock_app.config.rustdoc_postprocess_stream_size = 1
+    raw = ".. rust:module:: m\n\n   ## Title\n"
+    rst = write_rst("m.rst", raw)
+    postprocess_rst_files(mock_app)
+    converted = rst.read_text(encoding="utf-8")
+    assert converted != raw
+
+    monkeypatch.setattr(mod, "_stream_file", None)
+    write_rst("m.rst", raw)
+    postprocess_rst_files(mock_app)
+    assert rst.read_text(encoding="utf-8") == converted
+
+
+def _peak_memory(path, items):
+    item = "   ## Item\n\n   Returns `x`, see [`Foo`].\n\n   ```rust\n   f();\n   ```\n"
+    path.write_text(item * items, encoding="utf-8")
+    tracemalloc.start()
+    try:
+        _convert_file(path, {}, ALL, True)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_memory_does_not_grow_with_file_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(mod, "_STREAM_BLOCK", 4096)
+    path = tmp_path / "big.rst"
+    small = _peak_memory(path, 2000)
+    large = _peak_memory(path, 8000)
+    assert "**Item**" in path.read_text(encoding="utf-8")
+    assert large < 1.5 * small
+    assert large < path.stat().st_size / 2
@@ -0,0 +1,176 @@
+"""Tests for the symbol index that resolves intra-doc links."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import postprocess_rst_files
+from sphinx_rustdoc_postprocess._symbols import SymbolIndex, declared
+
+ITEMS = (
+    ".. rust:module:: app::net\n"
+    "\n"
+    ".. rust:struct:: app::net::Socket\n"
+    "\n"
+    "   .. rust:function:: app::net::Socket::connect\n"
+    "\n"
+    ".. rust:impl:: app::net::Socket\n"
+    "\n"
+    ".. rust:function:: app::net::connect\n"
+    "\n"
+    ".. rust:macro:: app::ready\n"
+)
+
+
+@pytest.fixture()
+def mock_app(mock_app):
+    mock_app.config.rustdoc_postprocess_resolve_links = True
+    return mock_app
+
+
+def _index():
+    index = SymbolIndex()
+    index.update("net.rst", declared(ITEMS.encode()))
+    return index
+
+
+def test_declared():
+    assert declared(ITEMS.encode()) == [
+        ("app::net", "module"),
+        ("app::net::Socket", "struct"),
+        ("app::net::Socket::connect", "function"),
+        ("app::net::connect", "function"),
+        ("app::ready", "macro"),
+    ]
+    assert declared(b"   No items.\n") == []
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("Socket", ("struct", "app::net::Socket")),
+        ("net::Socket", ("struct", "app::net::Socket")),
+        ("crate::net::Socket", ("struct", "app::net::Socket")),
+        ("Socket<T>", ("struct", "app::net::Socket")),
+        ("struct@Socket", ("struct", "app::net::Socket")),
+        ("Socket::connect", ("function", "app::net::Socket::connect")),
+        ("net::connect()", ("function", "app::net::connect")),
+        ("ready!", ("macro", "app::ready")),
+        ("mod@net", ("module", "app::net")),
+        # Two functions are called connect.
+        ("connect", None),
+        ("enum@Socket", None),
+        ("foo@Socket", None),
+        ("Missing", None),
+    ],
+)
+def test_resolve(name, expected):
+    assert _index().resolve(name) == expected
+
+
+def test_update_retain_and_digest():
+    index = _index()
+    digest = index.digest()
+    index.update("other.rst", [("app::Other", "enum")])
+    assert index.resolve("Other") == ("enum", "app::Other")
+    assert index.digest() != digest
+    index.retain(["net.rst"])
+    assert index.resolve("Other") is None
+    assert index.digest() == digest
+    index.update("net.rst", [])
+    assert index.files == {}
+
+
+def test_save_and_load(tmp_path):
+    index = _index()
+    index.path = tmp_path / "symbols.json"
+    index.save()
+    loaded = SymbolIndex.load(tmp_path / "symbols.json")
+    assert loaded.files == index.files
+    assert loaded.resolve("Socket") == ("struct", "app::net::Socket")
+    assert SymbolIndex.load(tmp_path / "missing.json").files == {}
+
+
+def test_links_become_cross_references(mock_app, write_rst):
+    write_rst("net.rst", ITEMS)
+    page = write_rst(
+        "page.rst",
+        ".. rust:module:: app::page\n"
+        "\n"
+        "   See [`Socket`] `x`, [`fn@net::connect`] and [`connect`].\n",
+    )
+    postprocess_rst_files(mock_app)
+    assert page.read_text(encoding="utf-8") == (
+        ".. rust:module:: app::page\n"
+        "\n"
+        "   See :rust:struct:`Socket <app::net::Socket>` ``x``, "
+        ":rust:function:`net::connect <app::net::connect>` and ``connect``.\n"
+    )
+
+
+def test_resolve_links_off(mock_app, write_rst):
+    mock_app.config.rustdoc_postprocess_resolve_links = False
+    write_rst("net.rst", ITEMS)
+    page = write_rst("page.rst", "   See [`Socket`].\n")
+    postprocess_rst_files(mock_app)
+    assert page.read_text(encoding="utf-8") == "   See ``Socket``.\n"
+
+
+def test_new_item_reconverts_unchanged_page(mock_app, write_rst):
+    page = write_rst("page.rst", "   See [`Socket`].\n")
+    postprocess_rst_files(mock_app)
+    assert page.read_text(encoding="utf-8") == "   See ``Socket``.\n"
+
+    write_rst("page.rst", "   See [`Socket`].\n")
+    write_rst("net.rst", ITEMS)
+    postprocess_rst_files(mock_app)
+    assert page.read_text(encoding="utf-8") == (
+        "   See :rust:struct:`Socket <app::net::Socket>`.\n"
+    )
+
+    state = Path(mock_app.doctreedir) / "rustdoc_postprocess" / "symbols.json"
+    assert SymbolIndex.load(state).files == {
+        "crates/net.rst": _index().files["net.rst"]
+    }
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_new_item_only_reconverts_pages_linking_to_it(mock_app, write_rst, jobs):
+    mock_app.config.rustdoc_postprocess_jobs = jobs
+    mock_app.config.rustdoc_postprocess_stats_file = "stats.json"
+    pages = {f"page{i}.rst": "   See [`Socket`] and `x`.\n" for i in range(20)}
+    pages["thing.rst"] = "   See [`Thing`].\n"
+    write_rst("net.rst", ITEMS)
+    for name, text in pages.items():
+        write_rst(name, text)
+    postprocess_rst_files(mock_app)
+
+    # sphinxcontrib-rust regenerating every page, one of them with a new item.
+    for name, text in pages.items():
+        write_rst(name, text)
+    write_rst("other.rst", ".. rust:struct:: app::other::Thing\n")
+    postprocess_rst_files(mock_app)
+    stats = json.loads((Path(mock_app.srcdir) / "stats.json").read_text("utf-8"))
+    assert stats["files"]["reused"] == 20
+    page = Path(mock_app.srcdir) / "crates" / "page0.rst"
+    assert page.read_text(encoding="utf-8") == (
+        "   See :rust:struct:`Socket <app::net::Socket>` and ``x``.\n"
+    )
+    thing = Path(mock_app.srcdir) / "crates" / "thing.rst"
+    assert thing.read_text(encoding="utf-8") == (
+        "   See :rust:struct:`Thing <app::other::Thing>`.\n"
+    )
+
+
+def test_source_read_mode(mock_app, write_rst):
+    mock_app.config.rustdoc_postprocess_mode = "source-read"
+    write_rst("net.rst", ITEMS)
+    mod._index_sources(mock_app)
+    source = ["   See [`Socket`].\n"]
+    mod._on_source_read(mock_app, "crates/page", source)
+    assert source == ["   See :rust:struct:`Socket <app::net::Socket>`.\n"]
+    # The index stays with the build that made it.
+    assert mod._symbol_index is None
+    assert mock_app.rustdoc_postprocess_symbols is not None
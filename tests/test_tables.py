@@ -0,0 +1,114 @@
+"""Tests for the native pipe-table renderer in _tables."""
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import _pandoc, postprocess_rst_files
+from sphinx_rustdoc_postprocess._tables import render_table
+
+# Tables the native renderer must reproduce byte-for-byte.
+CORPUS = [
+    "| Header A | Header B |\n|----------|----------|\n| cell 1   | cell 2   |\n",
+    "| Col 1 | Col 2 | Col 3 |\n|:------|:-----:|------:|\n| a | b | c |\n"
+    "| d | e | f |\n",
+    "| Module | Purpose |\n|--------|---------|\n"
+    "| ``types`` | ``#[repr(C)]`` data structures for force/energy I/O |\n"
+    "| ``tensor`` | DLPack tensor helpers |\n",
+    "| Flag | Meaning |\n|---|---|\n| `a`s | x\\|y and \\| alone |\n"
+    "| (`x`), | \\* \\_x k_v |\n",
+    "| | b |\n|---|---|\n| | y |\n| | z |\n",
+    "| | |\n|---|---|\n| x | y |\n",
+    "| a | | c |\n|---|---|---|\n| x | | z |\n",
+    "| h |\n|---|\n| x |\n",
+    "| Name | Description |\n|------|-------------|\n"
+    "| `rgpot_potential_calculate` | Evaluates energy and forces for the input "
+    "configuration |\n",
+    "| a | b | c |\n|:--------:|---|--------------------:|\n"
+    "| first | second | " + "x" * 60 + " |\n",
+]
+
+
+@pytest.mark.pandoc
+@pytest.mark.parametrize("table", CORPUS)
+def test_matches_pandoc(table):
+    assert render_table(table) == _pandoc(table)
+
+
+def test_simple_table():
+    table = "| a | b |\n|---|---|\n| x | long cell |\n"
+    assert render_table(table) == (
+        "= =========\na b\n= =========\nx long cell\n= =========\n"
+    )
+
+
+def test_grid_table_for_long_lines():
+    table = "| h | k |\n|---|---|\n| x | " + "a" * 70 + " |\n"
+    lines = render_table(table).split("\n")
+    assert lines[0] == "+" + "-" * 35 + "+" + "-" * 72 + "+"
+    assert lines[2].startswith("+===")
+
+
+def test_code_spans_and_escapes():
+    table = "| a | b |\n|---|---|\n| `x`y | \\| |\n"
+    assert "``x``\\ y" in render_table(table)
+    assert "\\|" in render_table(table)
+
+
+@pytest.mark.parametrize(
+    "cell",
+    ["*em*", "[link](https://x)", "<br>", "$x$", "@cite", "`a|b`", "![i](p)"],
+)
+def test_strict_rejects_unsupported_cells(cell):
+    table = f"| a | b |\n|---|---|\n| x | {cell} |\n"
+    assert render_table(table) is None
+    assert cell.split("(")[0] in render_table(table, strict=False)
+
+
+def test_rejects_malformed_tables():
+    assert render_table("| a | b |\n|---|---|\n| x |\n", strict=False) is None
+    assert render_table("| a | b |\n| x | y |\n| z | w |\n", strict=False) is None
+
+
+def test_native_engine_never_calls_pandoc(mock_app, write_rst, monkeypatch):
+    def fail(fragments):
+        raise AssertionError("pandoc called")
+
+    monkeypatch.setattr(mod, "_try_pandoc_batch", fail)
+    mock_app.config.rustdoc_postprocess_table_engine = "native"
+    rst = write_rst(
+        "m.rst",
+        ".. rust:module:: m\n\n   | A | B |\n   |---|---|\n   | *x* | 2 |\n",
+    )
+    postprocess_rst_files(mock_app)
+    assert "   === =\n   A   B\n" in rst.read_text(encoding="utf-8")
+
+
+def test_auto_engine_defers_unsupported_tables(mock_app, write_rst, monkeypatch):
+    mock_app.config.rustdoc_postprocess_table_engine = "auto"
+    seen = []
+
+    def fake_batch(fragments, concurrency=1):
+        seen.extend(fragments)
+        return ["pandoc\n"] * len(fragments)
+
+    monkeypatch.setattr(mod, "_try_pandoc_batch", fake_batch)
+    monkeypatch.setattr(mod.shutil, "which", lambda name: "/usr/bin/pandoc")
+    write_rst(
+        "m.rst",
+        ".. rust:module:: m\n\n"
+        "   | A | B |\n   |---|---|\n   | x | 2 |\n\n"
+        "   | C | D |\n   |---|---|\n   | *x* | 2 |\n",
+    )
+    postprocess_rst_files(mock_app)
+    assert seen == ["| C | D |\n|---|---|\n| *x* | 2 |\n"]
+
+
+def test_auto_engine_without_pandoc(mock_app, write_rst, monkeypatch):
+    mock_app.config.rustdoc_postprocess_table_engine = "auto"
+    monkeypatch.setattr(mod.shutil, "which", lambda name: None)
+    rst = write_rst(
+        "m.rst",
+        ".. rust:module:: m\n\n   | A | B |\n   |---|---|\n   | *x* | 2 |\n",
+    )
+    postprocess_rst_files(mock_app)
+    assert "|---|" not in rst.read_text(encoding="utf-8")
@@ -0,0 +1,114 @@
+"""Tests for watch mode and the polling file watcher."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import _prescan, postprocess_rst_files
+from sphinx_rustdoc_postprocess._watch import FileWatcher
+
+from .test_parallel import SOURCES
+
+
+def _touch_later(path, text):
+    """Rewrite *path* so that its modification time visibly changes."""
+    mtime = path.stat().st_mtime_ns
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+def test_watcher_reports_changes_until_recorded(tmp_path):
+    a = tmp_path / "a.rst"
+    a.write_text("a\n", encoding="utf-8")
+    (tmp_path / "notes.md").write_text("x\n", encoding="utf-8")
+    watcher = FileWatcher(tmp_path)
+    assert watcher.changed() == [a]
+    assert watcher.changed() == [a]
+    watcher.update([a])
+    assert watcher.changed() == []
+
+    b = tmp_path / "sub" / "b.rst"
+    b.parent.mkdir()
+    b.write_text("b\n", encoding="utf-8")
+    _touch_later(a, "aa\n")
+    assert watcher.changed() == [a, b]
+    watcher.update([a, b])
+    a.unlink()
+    assert watcher.changed() == []
+    assert list(watcher.snapshot) == [b]
+
+
+def test_watcher_waits_for_a_burst_to_settle(tmp_path):
+    watcher = FileWatcher(tmp_path)
+    assert watcher.wait(debounce=0.01, interval=0.01, timeout=0.05) == []
+    a = tmp_path / "a.rst"
+    a.write_text("a\n", encoding="utf-8")
+    assert watcher.wait(debounce=0.05, interval=0.01) == [a]
+
+
+@pytest.fixture()
+def watch_app(mock_app, write_rst):
+    mock_app.rustdoc_postprocess_watch = mod._Watch(Path(mock_app.srcdir))
+    mock_app.config.rustdoc_postprocess_table_engine = "native"
+    mock_app.config.rustdoc_postprocess_resolve_links = True
+    mock_app.config.rustdoc_postprocess_preserve_mtime = True
+    mock_app.config.rustdoc_postprocess_stats_file = "stats.json"
+    for name, body in SOURCES.items():
+        write_rst(name, body)
+    yield mock_app
+    mock_app.rustdoc_postprocess_watch.close()
+
+
+def _found(app):
+    stats = Path(app.srcdir) / "stats.json"
+    return json.loads(stats.read_text(encoding="utf-8"))["files"]["found"]
+
+
+def test_only_rewritten_files_are_read(watch_app, monkeypatch):
+    postprocess_rst_files(watch_app)
+    assert _found(watch_app) == len(SOURCES)
+
+    read = []
+    needed_file = _prescan.needed_file
+    monkeypatch.setattr(
+        _prescan,
+        "needed_file",
+        lambda path, *args: read.append(path) or needed_file(path, *args),
+    )
+    postprocess_rst_files(watch_app)
+    assert read == []
+
+    # sphinxcontrib-rust regenerating one page.
+    crates = Path(watch_app.srcdir) / "crates"
+    _touch_later(crates / "b" / "d.rst", SOURCES["b/d.rst"].replace("Foo", "Bar"))
+    postprocess_rst_files(watch_app)
+    assert read == [crates / "b" / "d.rst"]
+    assert "``Bar``" in (crates / "b" / "d.rst").read_text(encoding="utf-8")
+    assert _found(watch_app) == 1
+
+    manifest = Path(watch_app.doctreedir) / "rustdoc_postprocess" / "manifest"
+    data = json.loads((manifest / "manifest.json").read_text(encoding="utf-8"))
+    assert sorted(data["files"]) == sorted(f"crates/{name}" for name in SOURCES)
+
+
+def test_pool_is_kept_between_builds(watch_app):
+    watch_app.config.rustdoc_postprocess_jobs = 2
+    watch = watch_app.rustdoc_postprocess_watch
+    postprocess_rst_files(watch_app)
+    pool = watch.pool
+    assert pool is not None
+    crates = Path(watch_app.srcdir) / "crates"
+    _touch_later(crates / "a.rst", SOURCES["a.rst"].replace("1", "2"))
+    _touch_later(crates / "clean.rst", SOURCES["clean.rst"] + "\n   ## More\n")
+    postprocess_rst_files(watch_app)
+    assert watch.pool is pool
+    assert _found(watch_app) == 2
+
+    # The workers hold the symbol index they were started with.
+    _touch_later(crates / "a.rst", SOURCES["a.rst"].replace("module:: a", "module:: e"))
+    _touch_later(crates / "clean.rst", SOURCES["clean.rst"] + "\n   ## Other\n")
+    postprocess_rst_files(watch_app)
+    assert watch.pool is not pool
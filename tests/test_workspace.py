@@ -0,0 +1,219 @@
+"""Tests for workspaces: several crate directories with their own settings."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import (
+    _on_builder_inited,
+    postprocess_rst_files,
+    stage_generated_files,
+)
+from sphinx_rustdoc_postprocess._shard import merge
+
+NET = ".. rust:struct:: net::Socket\n\n   Uses `x`.\n\n   ## Usage\n"
+APP = ".. rust:module:: app\n\n   See [`net::Socket`] and `y`.\n"
+
+
+def _write(app, name, text):
+    path = Path(app.srcdir) / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+    return path
+
+
+@pytest.fixture()
+def workspace_app(mock_app):
+    mock_app.config.rustdoc_postprocess_rst_dir = {
+        "crates/net": None,
+        "crates/app": {"converters": ["links"]},
+    }
+    mock_app.config.rustdoc_postprocess_resolve_links = True
+    mock_app.config.rustdoc_postprocess_stats_file = "stats.json"
+    _write(mock_app, "crates/net/lib.rst", NET)
+    _write(mock_app, "crates/app/lib.rst", APP)
+    return mock_app
+
+
+def _stats(app):
+    return json.loads((Path(app.srcdir) / "stats.json").read_text(encoding="utf-8"))
+
+
+def test_crates_have_their_own_settings(workspace_app):
+    postprocess_rst_files(workspace_app)
+    crates = Path(workspace_app.srcdir) / "crates"
+    assert (crates / "net" / "lib.rst").read_text(encoding="utf-8") == (
+        ".. rust:struct:: net::Socket\n\n   Uses ``x``.\n\n   **Usage**\n"
+    )
+    # Only links are converted in app, to an item of the other crate.
+    assert (crates / "app" / "lib.rst").read_text(encoding="utf-8") == (
+        ".. rust:module:: app\n\n"
+        "   See :rust:struct:`net::Socket <net::Socket>` and `y`.\n"
+    )
+
+
+def test_crates_have_their_own_manifest(workspace_app):
+    postprocess_rst_files(workspace_app)
+    state = Path(workspace_app.doctreedir) / "rustdoc_postprocess"
+    assert not (state / "manifest").exists()
+    for crate, name in (("crates-net", "crates/net"), ("crates-app", "crates/app")):
+        path = state / "crates" / crate / "manifest" / "manifest.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert list(data["files"]) == [f"{name}/lib.rst"]
+
+    # Changing one crate's settings converts that crate only.
+    workspace_app.config.rustdoc_postprocess_rst_dir["crates/app"] = None
+    _write(workspace_app, "crates/net/lib.rst", NET)
+    _write(workspace_app, "crates/app/lib.rst", APP)
+    postprocess_rst_files(workspace_app)
+    assert _stats(workspace_app)["files"]["reused"] == 1
+
+
+def test_crate_times_are_reported(workspace_app, caplog):
+    caplog.set_level("INFO")
+    workspace_app.config.rustdoc_postprocess_jobs = 2
+    postprocess_rst_files(workspace_app)
+    assert sorted(_stats(workspace_app)["crates"]) == ["crates/app", "crates/net"]
+    assert "crates: crates/" in caplog.text
+
+
+def test_single_directory_reports_no_crates(mock_app, write_rst):
+    mock_app.config.rustdoc_postprocess_stats_file = "stats.json"
+    write_rst("lib.rst", NET)
+    postprocess_rst_files(mock_app)
+    assert _stats(mock_app)["crates"] == {}
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_crate_without_link_resolution(workspace_app, jobs):
+    workspace_app.config.rustdoc_postprocess_jobs = jobs
+    workspace_app.config.rustdoc_postprocess_rst_dir["crates/app"] = {
+        "resolve_links": False
+    }
+    _write(workspace_app, "crates/app/other.rst", APP)
+    postprocess_rst_files(workspace_app)
+    crates = Path(workspace_app.srcdir) / "crates"
+    for name in ("lib.rst", "other.rst"):
+        assert (crates / "app" / name).read_text(encoding="utf-8") == (
+            ".. rust:module:: app\n\n   See ``net::Socket`` and ``y``.\n"
+        )
+
+
+def test_crate_with_link_resolution(workspace_app):
+    workspace_app.config.rustdoc_postprocess_resolve_links = False
+    workspace_app.config.rustdoc_postprocess_rst_dir["crates/app"] = {
+        "resolve_links": True
+    }
+    postprocess_rst_files(workspace_app)
+    app = Path(workspace_app.srcdir) / "crates" / "app" / "lib.rst"
+    assert app.read_text(encoding="utf-8") == (
+        ".. rust:module:: app\n\n"
+        "   See :rust:struct:`net::Socket <net::Socket>` and ``y``.\n"
+    )
+
+
+def test_list_of_directories(workspace_app):
+    workspace_app.config.rustdoc_postprocess_rst_dir = ["crates/net", "crates/app"]
+    postprocess_rst_files(workspace_app)
+    app = Path(workspace_app.srcdir) / "crates" / "app" / "lib.rst"
+    assert "``y``" in app.read_text(encoding="utf-8")
+
+
+def test_unknown_setting_is_ignored(workspace_app, caplog):
+    workspace_app.config.rustdoc_postprocess_rst_dir["crates/net"] = {"jobs": 4}
+    postprocess_rst_files(workspace_app)
+    assert "Ignoring setting 'jobs' of crate crates/net" in caplog.text
+
+
+def test_watch_mode_across_crates(workspace_app):
+    workspace_app.rustdoc_postprocess_watch = mod._Watch(
+        Path(workspace_app.srcdir) / "crates"
+    )
+    postprocess_rst_files(workspace_app)
+    assert _stats(workspace_app)["files"]["found"] == 2
+    path = _write(workspace_app, "crates/app/lib.rst", APP.replace("y", "z"))
+    postprocess_rst_files(workspace_app)
+    assert _stats(workspace_app)["files"]["found"] == 1
+    assert "`z`" in path.read_text(encoding="utf-8")
+
+
+def test_source_read_uses_crate_settings(workspace_app):
+    workspace_app.config.rustdoc_postprocess_mode = "source-read"
+    mod._index_sources(workspace_app)
+    source = [APP]
+    mod._on_source_read(workspace_app, "crates/app/lib", source)
+    assert source == [
+        ".. rust:module:: app\n\n"
+        "   See :rust:struct:`net::Socket <net::Socket>` and `y`.\n"
+    ]
+    source = ["   `x`\n"]
+    mod._on_source_read(workspace_app, "crates/net/lib", source)
+    assert source == ["   ``x``\n"]
+    source = ["   `x`\n"]
+    mod._on_source_read(workspace_app, "crates/other/lib", source)
+    assert source == ["   `x`\n"]
+
+    workspace_app.config.rustdoc_postprocess_rst_dir["crates/app"] = {
+        "converters": ["links"],
+        "resolve_links": False,
+    }
+    source = [APP]
+    mod._on_source_read(workspace_app, "crates/app/lib", source)
+    assert source == [".. rust:module:: app\n\n   See ``net::Socket`` and `y`.\n"]
+
+
+def test_writer_mode(workspace_app):
+    config = workspace_app.config
+    config.rustdoc_postprocess_mode = "writer"
+    config.rust_doc_dir = str(Path(workspace_app.srcdir) / "crates")
+    config.rust_generate_mode = "changed"
+    stage_generated_files(workspace_app)
+    staged = Path(config.rust_doc_dir)
+    for crate, text in (("net", NET), ("app", APP)):
+        (staged / crate).mkdir()
+        (staged / crate / "lib.rst").write_text(text, encoding="utf-8")
+    _on_builder_inited(workspace_app)
+    path = Path(workspace_app.srcdir) / "crates" / "app" / "lib.rst"
+    assert path.read_text(encoding="utf-8") == (
+        ".. rust:module:: app\n\n"
+        "   See :rust:struct:`net::Socket <net::Socket>` and `y`.\n"
+    )
+    state = Path(workspace_app.doctreedir) / "rustdoc_postprocess" / "crates"
+    assert (state / "crates-app" / "manifest" / "manifest.json").exists()
+
+
+def test_writer_mode_without_link_resolution(workspace_app):
+    config = workspace_app.config
+    config.rustdoc_postprocess_mode = "writer"
+    config.rustdoc_postprocess_rst_dir["crates/app"] = {"resolve_links": False}
+    config.rust_doc_dir = str(Path(workspace_app.srcdir) / "crates")
+    config.rust_generate_mode = "changed"
+    stage_generated_files(workspace_app)
+    staged = Path(config.rust_doc_dir)
+    for crate, text in (("net", NET), ("app", APP)):
+        (staged / crate).mkdir()
+        (staged / crate / "lib.rst").write_text(text, encoding="utf-8")
+    _on_builder_inited(workspace_app)
+    path = Path(workspace_app.srcdir) / "crates" / "app" / "lib.rst"
+    assert path.read_text(encoding="utf-8") == (
+        ".. rust:module:: app\n\n   See ``net::Socket`` and ``y``.\n"
+    )
+
+
+def test_shards_merge_per_crate(workspace_app, tmp_path):
+    fragments = []
+    for i in (1, 2):
+        workspace_app.config.rustdoc_postprocess_shard = f"{i}/2"
+        workspace_app.doctreedir = str(tmp_path / f"doctrees{i}")
+        postprocess_rst_files(workspace_app)
+        fragments.append(tmp_path / f"doctrees{i}" / "rustdoc_postprocess")
+        _write(workspace_app, "crates/net/lib.rst", NET)
+        _write(workspace_app, "crates/app/lib.rst", APP)
+    merge(fragments, tmp_path / "state")
+    for crate in ("crates-net", "crates-app"):
+        path = tmp_path / "state" / "crates" / crate / "manifest" / "manifest.json"
+        assert len(json.loads(path.read_text(encoding="utf-8"))["files"]) == 1
@@ -0,0 +1,157 @@
+"""Tests for converting files as sphinxcontrib-rust generates them."""
+
+from pathlib import Path
+
+import pytest
+
+import sphinx_rustdoc_postprocess as mod
+from sphinx_rustdoc_postprocess import (
+    _on_builder_inited,
+    postprocess_rst_files,
+    stage_generated_files,
+)
+
+from .test_parallel import SOURCES
+
+
+@pytest.fixture()
+def writer_app(mock_app):
+    mock_app.config.rustdoc_postprocess_mode = "writer"
+    mock_app.config.rustdoc_postprocess_table_engine = "native"
+    mock_app.config.rust_doc_dir = str(Path(mock_app.srcdir) / "crates")
+    mock_app.config.rust_generate_mode = "changed"
+    return mock_app
+
+
+def _build(app, files, crate="mycrate"):
+    """Run a build in which sphinxcontrib-rust generates *files* for *crate*."""
+    stage_generated_files(app)
+    doc_dir = app.config.rust_doc_dir
+    if isinstance(doc_dir, dict):
+        doc_dir = doc_dir[crate]
+    for name, body in files.items():
+        path = Path(doc_dir) / crate / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body, encoding="utf-8")
+    _on_builder_inited(app)
+
+
+def _tree(app):
+    root = Path(app.srcdir) / "crates"
+    return {
+        path.relative_to(root).as_posix(): path.read_text(encoding="utf-8")
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+def test_matches_files_mode(writer_app, write_rst):
+    _build(writer_app, SOURCES)
+    converted = _tree(writer_app)
+    assert writer_app.config.rust_doc_dir == str(Path(writer_app.srcdir) / "crates")
+    assert writer_app.rustdoc_postprocess_staging is None
+
+    writer_app.config.rustdoc_postprocess_mode = "files"
+    writer_app.config.rustdoc_postprocess_incremental = False
+    for name, body in SOURCES.items():
+        write_rst(f"mycrate/{name}", body)
+    postprocess_rst_files(writer_app)
+    assert _tree(writer_app) == converted
+    assert converted != {f"mycrate/{name}": body for name, body in SOURCES.items()}
+
+
+def test_raw_output_never_reaches_doc_dir(writer_app, monkeypatch):
+    writes = []
+    write_text = Path.write_text
+
+    def _record(path, *args, **kwargs):
+        writes.append(path)
+        return write_text(path, *args, **kwargs)
+
+    stage_generated_files(writer_app)
+    staged = Path(writer_app.config.rust_doc_dir)
+    (staged / "mycrate").mkdir()
+    (staged / "mycrate" / "lib.rst").write_text(
+        ".. rust:module:: m\n\n   ## Title\n", encoding="utf-8"
+    )
+    monkeypatch.setattr(Path, "write_text", _record)
+    _on_builder_inited(writer_app)
+    lib = Path(writer_app.srcdir) / "crates" / "mycrate" / "lib.rst"
+    assert writes == [lib]
+    assert lib.read_text(encoding="utf-8") == ".. rust:module:: m\n\n   **Title**\n"
+    assert not staged.exists()
+
+
+def test_unchanged_input_is_not_rewritten(writer_app):
+    files = {"lib.rst": ".. rust:module:: m\n\n   ## Title\n", "plain.rst": "x\n"}
+    _build(writer_app, files)
+    lib = Path(writer_app.srcdir) / "crates" / "mycrate" / "lib.rst"
+    before = lib.stat().st_mtime_ns
+    lib.touch()
+    mtime = lib.stat().st_mtime_ns
+    _build(writer_app, files)
+    assert lib.stat().st_mtime_ns == mtime >= before
+    assert lib.read_text(encoding="utf-8") == ".. rust:module:: m\n\n   **Title**\n"
+
+    lib.unlink()
+    _build(writer_app, files)
+    assert lib.read_text(encoding="utf-8") == ".. rust:module:: m\n\n   **Title**\n"
+
+
+def test_per_crate_doc_dirs(writer_app, tmp_path):
+    outside = tmp_path / "elsewhere"
+    writer_app.config.rust_doc_dir = {
+        "mycrate": str(Path(writer_app.srcdir) / "crates"),
+        "other": str(outside),
+    }
+    _build(writer_app, {"lib.rst": "   ## A\n", "notes.md": "## B\n"})
+    _build(writer_app, {"lib.rst": "   ## C\n"}, crate="other")
+    crates = Path(writer_app.srcdir) / "crates" / "mycrate"
+    assert (crates / "lib.rst").read_text(encoding="utf-8") == "   **A**\n"
+    assert (crates / "notes.md").read_text(encoding="utf-8") == "## B\n"
+    # Outside rustdoc_postprocess_rst_dir: copied, not converted.
+    assert (outside / "other" / "lib.rst").read_text(encoding="utf-8") == "   ## C\n"
+    assert isinstance(writer_app.config.rust_doc_dir, dict)
+
+
+def test_falls_back_to_walk_without_sphinxcontrib_rust(mock_app, write_rst):
+    mock_app.config.rustdoc_postprocess_mode = "writer"
+    rst = write_rst("m.rst", ".. rust:module:: m\n\n   ## Title\n")
+    stage_generated_files(mock_app)
+    assert mock_app.rustdoc_postprocess_staging is None
+    _on_builder_inited(mock_app)
+    assert rst.read_text(encoding="utf-8") == ".. rust:module:: m\n\n   **Title**\n"
+
+
+def test_skip_generate_mode_falls_back_to_walk(writer_app, write_rst):
+    writer_app.config.rust_generate_mode = "skip"
+    rst = write_rst("m.rst", "   ## Title\n")
+    stage_generated_files(writer_app)
+    assert writer_app.config.rust_doc_dir == str(Path(writer_app.srcdir) / "crates")
+    _on_builder_inited(writer_app)
+    assert rst.read_text(encoding="utf-8") == "   **Title**\n"
+
+
+def test_failed_build_discards_staging(writer_app, monkeypatch):
+    def fail(app):
+        raise RuntimeError("boom")
+
+    stage_generated_files(writer_app)
+    staged = Path(writer_app.config.rust_doc_dir)
+    monkeypatch.setattr(mod, "_reset_breaker", fail)
+    with pytest.raises(RuntimeError):
+        _on_builder_inited(writer_app)
+    assert writer_app.rustdoc_postprocess_staging is None
+    assert writer_app.config.rust_doc_dir == str(Path(writer_app.srcdir) / "crates")
+    assert not staged.exists()
+
+
+def test_restages_after_build_that_never_wrote(writer_app):
+    # sphinxcontrib-rust failed, so _on_builder_inited never ran.
+    stage_generated_files(writer_app)
+    stale = Path(writer_app.config.rust_doc_dir)
+    _build(writer_app, {"lib.rst": "   ## Title\n"})
+    assert not stale.exists()
+    assert writer_app.config.rust_doc_dir == str(Path(writer_app.srcdir) / "crates")
+    lib = Path(writer_app.srcdir) / "crates" / "mycrate" / "lib.rst"
+    assert lib.read_text(encoding="utf-8") == "   **Title**\n"